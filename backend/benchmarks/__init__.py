@@ -0,0 +1 @@
+"""Offline benchmarks for the TrendWise models; run with `python -m benchmarks`"""
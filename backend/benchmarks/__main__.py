@@ -0,0 +1,50 @@
+"""Run the offline model benchmarks and optionally compare them with a baseline"""
+import argparse
+import json
+import logging
+import sys
+
+from .cases import SUITES, build_cases
+from .harness import format_table, measure, regressions
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(prog='python -m benchmarks', description=__doc__)
+    parser.add_argument('suites', nargs='*', metavar='suite',
+                        help=f"suites to run (default: all of {', '.join(SUITES)})")
+    parser.add_argument('-k', '--filter', default='', help='only run cases whose name contains this')
+    parser.add_argument('--min-time', type=float, default=1.0, help='seconds to spend per case')
+    parser.add_argument('--json', dest='json_path', help='write results to this file')
+    parser.add_argument('--baseline', help='results file of a previous run to compare against')
+    parser.add_argument('--threshold', type=float, default=0.25,
+                        help='allowed p50 / peak memory growth over the baseline (default: 0.25)')
+    args = parser.parse_args(argv)
+    unknown = set(args.suites) - set(SUITES)
+    if unknown:
+        parser.error(f"unknown suite(s): {', '.join(sorted(unknown))}")
+
+    logging.basicConfig(level=logging.WARNING)
+    cases = [case for case in build_cases(args.suites) if args.filter in case.name]
+
+    results = []
+    for case in cases:
+        results.append(measure(case, min_time=args.min_time))
+        print(format_table(results[-1:]).splitlines()[-1], file=sys.stderr)
+
+    print(format_table(results))
+
+    if args.json_path:
+        with open(args.json_path, 'w') as f:
+            json.dump(results, f, indent=2)
+
+    if args.baseline:
+        with open(args.baseline) as f:
+            found = regressions(results, json.load(f), args.threshold)
+        if found:
+            print('\nRegressions:\n  ' + '\n  '.join(found))
+            return 1
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
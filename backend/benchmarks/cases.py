@@ -0,0 +1,128 @@
+import random
+from typing import List
+
+from models.content_generator import ContentGenerator
+from models.engagement_predictor import EngagementPredictor
+from models.keyword_predictor import KeywordPredictor
+from models.schedule_optimizer import ScheduleOptimizer
+
+from utils.source_transport import ReplayTransport
+
+from .fixtures import fixture_archive, source_urls
+from .harness import Case
+
+TOPICS = ('python', 'ai')
+CONTENT_TYPES = ('blog', 'landing_page', 'app_description')
+CONTENT_LENGTHS = (500, 1500, 3000)
+DOCUMENT_WORDS = (500, 2000, 5000, 20000)
+KEYWORDS = ['machine learning', 'python', 'data pipeline', 'automation', 'cloud',
+            'analytics', 'ai', 'open source', 'productivity', 'developer tools']
+
+VOCABULARY = (
+    'the a team of engineers built measured shipped tested product users growth revenue '
+    'strategy quickly clearly every week simple powerful modern scalable reliable data model '
+    'pipeline workflow insight dashboard content audience campaign launch feedback metric'
+).split()
+
+
+def make_document(words: int, seed: int = 0) -> str:
+    """Deterministic markdown-ish document of about `words` words mentioning KEYWORDS"""
+    rng = random.Random(seed)
+    parts = ['# Benchmark document\n\n']
+    written = 0
+    while written < words:
+        if written and written % 300 < 12:
+            parts.append(f"\n\n## {rng.choice(KEYWORDS).title()}\n\n")
+        length = rng.randint(8, 24)
+        sentence = [rng.choice(VOCABULARY) for _ in range(length)]
+        sentence[rng.randrange(length)] = rng.choice(KEYWORDS)
+        parts.append(' '.join(sentence).capitalize() + '. ')
+        written += length
+    return ''.join(parts)
+
+
+def keyword_cases() -> List[Case]:
+    predictor = KeywordPredictor()
+    predictor.transport = ReplayTransport(fixture_archive(source_urls(predictor, TOPICS)))
+
+    def predict(topic):
+        def run():
+            predictor.cache.clear()
+            return predictor.predict_keywords(topic, num_keywords=20)
+        return run
+
+    def trending():
+        predictor.trending_cache = None
+        return predictor.get_trending_topics()
+
+    cases = [Case(f"keywords.predict[{topic}]", predict(topic)) for topic in TOPICS]
+    cases.append(Case("keywords.trending_topics", trending))
+    return cases
+
+
+def content_cases() -> List[Case]:
+    generator = ContentGenerator()
+
+    def generate(content_type, length):
+        return lambda: generator.generate(
+            topic='python', content_type=content_type, keywords=KEYWORDS,
+            length=length, category='technology'
+        )
+
+    return [
+        Case(f"content.generate[{content_type},{length}]", generate(content_type, length))
+        for content_type in CONTENT_TYPES
+        for length in CONTENT_LENGTHS
+    ]
+
+
+def engagement_cases() -> List[Case]:
+    predictor = EngagementPredictor()
+
+    def predict(document):
+        return lambda: predictor.predict(content=document, keywords=KEYWORDS)
+
+    return [
+        Case(f"engagement.predict[{words} words]", predict(make_document(words)))
+        for words in DOCUMENT_WORDS
+    ]
+
+
+def schedule_cases() -> List[Case]:
+    optimizer = ScheduleOptimizer()
+
+    def optimize(cached):
+        def run():
+            if not cached:
+                optimizer.suggestion_cache.clear()
+            return optimizer.optimize('social_media', 'business', timezone='America/New_York')
+        return run
+
+    def generate_schedule(cached):
+        def run():
+            if not cached:
+                optimizer.schedule_cache.clear()
+            return optimizer.generate_schedule('blog', 'business', platform='linkedin')
+        return run
+
+    return [
+        Case("schedule.optimize[cold]", optimize(False)),
+        Case("schedule.optimize[cached]", optimize(True)),
+        Case("schedule.generate_schedule[cold]", generate_schedule(False)),
+        Case("schedule.generate_schedule[cached]", generate_schedule(True))
+    ]
+
+
+SUITES = {
+    'keywords': keyword_cases,
+    'content': content_cases,
+    'engagement': engagement_cases,
+    'schedule': schedule_cases
+}
+
+
+def build_cases(suites=None) -> List[Case]:
+    cases = []
+    for name in suites or SUITES:
+        cases.extend(SUITES[name]())
+    return cases
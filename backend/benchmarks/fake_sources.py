@@ -0,0 +1,136 @@
+"""Local stand-in for the trend source sites, with latency and failure injection"""
+import asyncio
+import random
+import socket
+import threading
+import time
+from collections import Counter
+from typing import Dict, NamedTuple, Optional
+
+import uvicorn
+from starlette.applications import Starlette
+from starlette.requests import Request
+from starlette.responses import Response
+from starlette.routing import Route
+
+from .fixtures import load_feeds
+
+SOURCES = ('google_trends', 'reddit', 'google_news', 'hnrss')
+
+
+class SourceBehaviour(NamedTuple):
+    latency: float = 0.0  # seconds before responding
+    jitter: float = 0.0  # extra uniform random delay, seconds
+    failure_rate: float = 0.0  # share of requests answered with a 503
+
+
+def parse_behaviour(spec: str, default: SourceBehaviour = SourceBehaviour()) -> SourceBehaviour:
+    """Parse 'latency=0.2,failure_rate=0.1' on top of `default`"""
+    values = default._asdict()
+    for part in filter(None, spec.split(',')):
+        name, _, value = part.partition('=')
+        name = name.strip()
+        if name not in values:
+            raise ValueError(f"Unknown source setting '{name}', expected one of {list(values)}")
+        values[name] = float(value)
+    return SourceBehaviour(**values)
+
+
+def create_app(behaviours: Dict[str, SourceBehaviour], hits: Counter,
+               seed: Optional[int] = None) -> Starlette:
+    """ASGI app serving the fixture feeds at the real sites' paths"""
+    feeds = load_feeds()
+    rng = random.Random(seed)
+
+    def endpoint(source: str, feed: str, media_type: str):
+        async def serve(request: Request) -> Response:
+            hits[source] += 1
+            behaviour = behaviours.get(source, SourceBehaviour())
+            delay = behaviour.latency + rng.uniform(0, behaviour.jitter)
+            if delay > 0:
+                await asyncio.sleep(delay)
+            if rng.random() < behaviour.failure_rate:
+                hits[f"{source}_failed"] += 1
+                return Response(b'Service Unavailable', status_code=503)
+            return Response(feeds[feed], media_type=media_type)
+        return serve
+
+    return Starlette(routes=[
+        Route('/trends/trendingsearches/daily/rss',
+              endpoint('google_trends', 'google_trends.xml', 'application/rss+xml')),
+        Route('/r/{subreddit}/hot.json', endpoint('reddit', 'reddit_hot.json', 'application/json')),
+        Route('/rss/search', endpoint('google_news', 'news_google.xml', 'application/rss+xml')),
+        Route('/newest', endpoint('hnrss', 'hnrss.xml', 'application/rss+xml'))
+    ])
+
+
+class BackgroundServer:
+    """Serve an ASGI app with uvicorn on a free local port in a daemon thread"""
+
+    def __init__(self, app, host: str = '127.0.0.1'):
+        self.app = app
+        self.host = host
+        self.port = None
+        self._server: Optional[uvicorn.Server] = None
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def base_url(self) -> str:
+        return f"http://{self.host}:{self.port}"
+
+    def start(self, timeout: float = 10.0):
+        sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+        sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+        sock.bind((self.host, 0))
+        self.port = sock.getsockname()[1]
+
+        config = uvicorn.Config(self.app, log_level='warning', lifespan='on',
+                                access_log=False, ws='none')
+        self._server = uvicorn.Server(config)
+        self._thread = threading.Thread(
+            target=lambda: asyncio.run(self._server.serve(sockets=[sock])), daemon=True
+        )
+        self._thread.start()
+
+        deadline = time.monotonic() + timeout
+        while not self._server.started:
+            if not self._thread.is_alive() or time.monotonic() > deadline:
+                raise RuntimeError(f"Server on port {self.port} did not start")
+            time.sleep(0.01)
+        return self
+
+    def stop(self):
+        if self._server is not None:
+            self._server.should_exit = True
+            self._thread.join(timeout=10)
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc_info):
+        self.stop()
+
+
+class FakeSources(BackgroundServer):
+    """Fake Google Trends, Reddit, Google News and hnrss endpoints.
+
+    Point a KeywordPredictor at it with KeywordPredictor(source_urls=fake.source_urls).
+    """
+
+    def __init__(self, behaviours: Optional[Dict[str, SourceBehaviour]] = None,
+                 seed: Optional[int] = None):
+        self.behaviours = dict(behaviours or {})
+        self.hits: Counter = Counter()
+        super().__init__(create_app(self.behaviours, self.hits, seed))
+
+    @property
+    def source_urls(self) -> Dict:
+        base = self.base_url
+        return {
+            'google_trends': f"{base}/trends/trendingsearches/daily/rss?geo=US",
+            'reddit_hot': base + "/r/{subreddit}/hot.json?limit={limit}",
+            'news_feeds': [
+                base + "/rss/search?q={}&hl=en-US&gl=US&ceid=US:en",
+                base + "/newest?q={}"
+            ]
+        }
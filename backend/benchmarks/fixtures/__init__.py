@@ -0,0 +1,45 @@
+"""Recorded trend source feeds, served in place of the network"""
+import os
+from typing import Dict, Iterable
+
+from utils.source_transport import SourceArchive
+
+FIXTURE_DIR = os.path.dirname(os.path.abspath(__file__))
+
+# URL fragment -> (fixture file, content type)
+FEEDS = {
+    'trends.google.com': ('google_trends.xml', 'application/rss+xml'),
+    'reddit.com': ('reddit_hot.json', 'application/json'),
+    'news.google.com': ('news_google.xml', 'application/rss+xml'),
+    'hnrss.org': ('hnrss.xml', 'application/rss+xml')
+}
+
+
+def load_feeds() -> Dict[str, bytes]:
+    """Raw bytes of every fixture feed, keyed by file name"""
+    feeds = {}
+    for name, _ in FEEDS.values():
+        with open(os.path.join(FIXTURE_DIR, name), 'rb') as f:
+            feeds[name] = f.read()
+    return feeds
+
+
+def fixture_archive(urls: Iterable[str]) -> SourceArchive:
+    """In-memory source archive answering each URL with its site's fixture feed"""
+    feeds = load_feeds()
+    archive = SourceArchive()
+    for url in urls:
+        for fragment, (name, content_type) in FEEDS.items():
+            if fragment in url:
+                archive.put(url, 200, feeds[name], content_type)
+                break
+    return archive
+
+
+def source_urls(predictor, topics: Iterable[str]) -> Iterable[str]:
+    """Every URL `predictor` requests for the topics and for trending topics"""
+    yield predictor.source_urls['google_trends']
+    yield predictor.source_urls['reddit_hot'].format(subreddit='all', limit=15)
+    for topic in topics:
+        yield from predictor._reddit_urls(topic)
+        yield from predictor._news_urls(topic)
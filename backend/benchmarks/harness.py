@@ -0,0 +1,78 @@
+import time
+import tracemalloc
+from typing import Callable, Dict, List, NamedTuple, Optional
+
+import numpy as np
+
+
+class Case(NamedTuple):
+    name: str
+    func: Callable[[], object]
+
+
+def measure(case: Case, min_time: float = 1.0, min_iterations: int = 5,
+            max_iterations: int = 100000, warmup: int = 1) -> Dict:
+    """Time one case: ops/sec, p50/p99 latency and peak traced memory.
+
+    The case runs until both `min_time` seconds and `min_iterations` calls
+    are reached. Peak memory comes from one extra call under tracemalloc,
+    kept apart from the timed calls because tracing slows allocation down.
+    """
+    for _ in range(warmup):
+        case.func()
+
+    latencies = []
+    started = time.perf_counter()
+    elapsed = 0.0
+    while len(latencies) < max_iterations and (elapsed < min_time or len(latencies) < min_iterations):
+        call_started = time.perf_counter_ns()
+        case.func()
+        latencies.append(time.perf_counter_ns() - call_started)
+        elapsed = time.perf_counter() - started
+
+    tracemalloc.start()
+    try:
+        tracemalloc.reset_peak()
+        case.func()
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+
+    latencies_ms = np.array(latencies) / 1e6
+    return {
+        'name': case.name,
+        'iterations': len(latencies),
+        'ops_per_sec': round(len(latencies) / (latencies_ms.sum() / 1000), 2),
+        'p50_ms': round(float(np.percentile(latencies_ms, 50)), 4),
+        'p99_ms': round(float(np.percentile(latencies_ms, 99)), 4),
+        'peak_kib': round(peak / 1024, 1)
+    }
+
+
+def format_table(results: List[Dict]) -> str:
+    header = f"{'case':<48} {'ops/sec':>12} {'p50 ms':>10} {'p99 ms':>10} {'peak KiB':>10}"
+    lines = [header, '-' * len(header)]
+    for result in results:
+        lines.append(
+            f"{result['name']:<48} {result['ops_per_sec']:>12,.1f} {result['p50_ms']:>10.3f} "
+            f"{result['p99_ms']:>10.3f} {result['peak_kib']:>10,.1f}"
+        )
+    return '\n'.join(lines)
+
+
+def regressions(results: List[Dict], baseline: List[Dict], threshold: float = 0.25,
+                memory_threshold: Optional[float] = None) -> List[str]:
+    """Cases whose p50 latency (or peak memory) grew by more than the threshold"""
+    previous = {result['name']: result for result in baseline}
+    memory_threshold = threshold if memory_threshold is None else memory_threshold
+
+    found = []
+    for result in results:
+        before = previous.get(result['name'])
+        if before is None:
+            continue
+        if result['p50_ms'] > before['p50_ms'] * (1 + threshold):
+            found.append(f"{result['name']}: p50 {before['p50_ms']:.3f} -> {result['p50_ms']:.3f} ms")
+        if result['peak_kib'] > before['peak_kib'] * (1 + memory_threshold):
+            found.append(f"{result['name']}: peak {before['peak_kib']:.1f} -> {result['peak_kib']:.1f} KiB")
+    return found
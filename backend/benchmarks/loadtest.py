@@ -0,0 +1,214 @@
+"""Load-test the API with concurrent clients against local stand-ins for the trend sources.
+
+    python -m benchmarks.loadtest --concurrency 32 --duration 20 --latency 0.05 --failure-rate 0.05
+"""
+import argparse
+import asyncio
+import json
+import os
+import random
+import sys
+import time
+from collections import Counter, defaultdict
+from typing import Callable, Dict, List, NamedTuple, Optional
+
+import httpx
+import numpy as np
+
+from .fake_sources import SOURCES, BackgroundServer, FakeSources, SourceBehaviour, parse_behaviour
+
+TOPICS = ('python', 'ai', 'machine learning', 'cloud computing', 'healthcare ai',
+          'open source', 'data science', 'cybersecurity')
+CATEGORIES = ('Technology', 'Healthcare', 'Politics', 'Cooking', 'Entertainment')
+
+
+class Endpoint(NamedTuple):
+    name: str
+    method: str
+    path: str
+    weight: float = 1.0
+    # rng -> keyword arguments for httpx.AsyncClient.request (params, json)
+    build: Callable[[random.Random], Dict] = lambda rng: {}
+
+
+DEFAULT_MIX = (
+    Endpoint('generate-content', 'POST', '/api/generate-content', 2, lambda rng: {'json': {
+        'category': rng.choice(CATEGORIES), 'topic': rng.choice(TOPICS), 'content_type': 'blog'
+    }}),
+    Endpoint('analyze-topic', 'POST', '/api/analyze-topic', 2, lambda rng: {'params': {
+        'topic': rng.choice(TOPICS), 'category': rng.choice(CATEGORIES)
+    }}),
+    Endpoint('trending-topics', 'GET', '/api/trending-topics', 3),
+    Endpoint('trend-analytics', 'GET', '/api/trend-analytics', 2),
+    Endpoint('posting-insights', 'GET', '/api/posting-insights', 2, lambda rng: {'params': {
+        'target_audience': rng.choice(('general', 'business', 'tech'))
+    }}),
+    Endpoint('dashboard-stats', 'GET', '/api/dashboard-stats', 1)
+)
+
+
+async def run_load(base_url: str, endpoints: List[Endpoint], concurrency: int = 16,
+                   duration: Optional[float] = 10.0, requests: Optional[int] = None,
+                   seed: int = 0, timeout: float = 30.0) -> Dict:
+    """Send a weighted mix of requests from `concurrency` clients.
+
+    Stops after `duration` seconds or `requests` requests, whichever comes
+    first. Returns per-endpoint and overall statistics (see summarize()).
+    """
+    weights = [endpoint.weight for endpoint in endpoints]
+    latencies: Dict[str, List[float]] = defaultdict(list)
+    statuses: Dict[str, Counter] = defaultdict(Counter)
+    sent = 0
+    deadline = time.perf_counter() + duration if duration else None
+
+    def more() -> bool:
+        if requests is not None and sent >= requests:
+            return False
+        return deadline is None or time.perf_counter() < deadline
+
+    async def client_loop(client: httpx.AsyncClient, rng: random.Random):
+        nonlocal sent
+        while more():
+            sent += 1
+            endpoint = rng.choices(endpoints, weights)[0]
+            started = time.perf_counter()
+            try:
+                response = await client.request(endpoint.method, endpoint.path, **endpoint.build(rng))
+                status = str(response.status_code)
+            except httpx.HTTPError as e:
+                status = type(e).__name__
+            latencies[endpoint.name].append(time.perf_counter() - started)
+            statuses[endpoint.name][status] += 1
+
+    limits = httpx.Limits(max_connections=concurrency, max_keepalive_connections=concurrency)
+    started = time.perf_counter()
+    async with httpx.AsyncClient(base_url=base_url, timeout=timeout, limits=limits) as client:
+        await asyncio.gather(*(
+            client_loop(client, random.Random(seed * 1000 + i)) for i in range(concurrency)
+        ))
+    return summarize(latencies, statuses, time.perf_counter() - started)
+
+
+def _stats(samples: List[float], status_counts: Counter, elapsed: float) -> Dict:
+    latencies_ms = np.array(samples) * 1000
+    errors = sum(count for status, count in status_counts.items()
+                 if not (status.isdigit() and int(status) < 400))
+    return {
+        'requests': len(samples),
+        'errors': errors,
+        'throughput': round(len(samples) / elapsed, 2) if elapsed else 0.0,
+        'p50_ms': round(float(np.percentile(latencies_ms, 50)), 2),
+        'p95_ms': round(float(np.percentile(latencies_ms, 95)), 2),
+        'p99_ms': round(float(np.percentile(latencies_ms, 99)), 2),
+        'max_ms': round(float(latencies_ms.max()), 2),
+        'statuses': dict(status_counts)
+    }
+
+
+def summarize(latencies: Dict[str, List[float]], statuses: Dict[str, Counter],
+              elapsed: float) -> Dict:
+    endpoints = {
+        name: _stats(samples, statuses[name], elapsed)
+        for name, samples in sorted(latencies.items())
+    }
+    all_samples = [sample for samples in latencies.values() for sample in samples]
+    all_statuses = sum(statuses.values(), Counter())
+    return {
+        'elapsed_s': round(elapsed, 2),
+        'endpoints': endpoints,
+        'total': _stats(all_samples, all_statuses, elapsed) if all_samples else None
+    }
+
+
+def format_report(report: Dict) -> str:
+    header = (f"{'endpoint':<20} {'requests':>9} {'errors':>7} {'req/s':>9} "
+              f"{'p50 ms':>9} {'p95 ms':>9} {'p99 ms':>9} {'max ms':>9}")
+    lines = [header, '-' * len(header)]
+    rows = list(report['endpoints'].items())
+    if report['total']:
+        rows.append(('total', report['total']))
+    for name, stats in rows:
+        lines.append(
+            f"{name:<20} {stats['requests']:>9} {stats['errors']:>7} {stats['throughput']:>9.1f} "
+            f"{stats['p50_ms']:>9.1f} {stats['p95_ms']:>9.1f} {stats['p99_ms']:>9.1f} {stats['max_ms']:>9.1f}"
+        )
+    return '\n'.join(lines)
+
+
+def load_app(source_urls: Dict, cold: bool = False, response_cache: bool = True):
+    """Import the API configured for load testing and point it at `source_urls`.
+
+    Posts stay in memory, the dispatcher and rate limits are off, and with
+    `cold` the keyword and trending caches expire immediately so every
+    request reaches the sources.
+    """
+    os.environ.setdefault('TRENDWISE_DB_PATH', ':memory:')
+    os.environ['TRENDWISE_DISPATCHER_ENABLED'] = '0'
+    os.environ['TRENDWISE_RATE_LIMIT_PER_MINUTE'] = '0'
+    os.environ['TRENDWISE_RESPONSE_CACHE'] = '1' if response_cache else '0'
+    import main
+
+    predictor = main.keyword_predictor
+    predictor.source_urls = {**predictor.source_urls, **source_urls}
+    if cold:
+        predictor.cache_duration = 0
+        predictor.trending_cache_duration = 0
+    return main.app
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(prog='python -m benchmarks.loadtest', description=__doc__,
+                                     formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('-c', '--concurrency', type=int, default=16, help='concurrent clients')
+    parser.add_argument('-d', '--duration', type=float, default=10.0, help='seconds to run')
+    parser.add_argument('-n', '--requests', type=int, help='stop after this many requests')
+    parser.add_argument('--endpoints', help='comma-separated subset of: '
+                        + ', '.join(endpoint.name for endpoint in DEFAULT_MIX))
+    parser.add_argument('--latency', type=float, default=0.05, help='source response delay, seconds')
+    parser.add_argument('--jitter', type=float, default=0.05, help='extra random source delay, seconds')
+    parser.add_argument('--failure-rate', type=float, default=0.0, help='share of source requests failing with 503')
+    parser.add_argument('--source', action='append', default=[], metavar='NAME:SETTINGS',
+                        help=f"per-source override, e.g. reddit:latency=0.5,failure_rate=0.2 ({', '.join(SOURCES)})")
+    parser.add_argument('--cold', action='store_true', help='disable the keyword and trending caches')
+    parser.add_argument('--no-response-cache', action='store_true', help='disable the HTTP response cache')
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--json', dest='json_path', help='write the report to this file')
+    args = parser.parse_args(argv)
+
+    default = SourceBehaviour(args.latency, args.jitter, args.failure_rate)
+    behaviours = {source: default for source in SOURCES}
+    try:
+        for override in args.source:
+            name, _, spec = override.partition(':')
+            if name not in SOURCES:
+                raise ValueError(f"Unknown source '{name}', expected one of {list(SOURCES)}")
+            behaviours[name] = parse_behaviour(spec, default)
+    except ValueError as e:
+        parser.error(str(e))
+
+    endpoints = list(DEFAULT_MIX)
+    if args.endpoints:
+        wanted = set(args.endpoints.split(','))
+        endpoints = [endpoint for endpoint in DEFAULT_MIX if endpoint.name in wanted]
+        if not endpoints:
+            parser.error(f"no known endpoints in '{args.endpoints}'")
+
+    with FakeSources(behaviours, seed=args.seed) as sources:
+        app = load_app(sources.source_urls, cold=args.cold, response_cache=not args.no_response_cache)
+        with BackgroundServer(app) as server:
+            report = asyncio.run(run_load(
+                server.base_url, endpoints, concurrency=args.concurrency,
+                duration=args.duration, requests=args.requests, seed=args.seed
+            ))
+        report['source_hits'] = dict(sources.hits)
+
+    print(format_report(report))
+    print('\nsource requests: ' + ', '.join(f"{name}={count}" for name, count in sorted(report['source_hits'].items())))
+    if args.json_path:
+        with open(args.json_path, 'w') as f:
+            json.dump(report, f, indent=2)
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -1,16 +1,85 @@
-from fastapi import FastAPI, HTTPException, BackgroundTasks
+from fastapi import FastAPI, HTTPException, BackgroundTasks, Query
 from fastapi.middleware.cors import CORSMiddleware
-from pydantic import BaseModel
-from typing import List, Optional, Dict
+from fastapi.responses import PlainTextResponse
+from pydantic import BaseModel, Field
+from typing import List, Literal, Optional, Dict
 import uvicorn
+import os
+import time
 from datetime import datetime, timedelta
 import numpy as np
+import pytz
+from contextlib import asynccontextmanager
 from models.keyword_predictor import KeywordPredictor
 from models.content_generator import ContentGenerator
 from models.engagement_predictor import EngagementPredictor
 from models.schedule_optimizer import ScheduleOptimizer
+from models.calendar_solver import CalendarSolver
+from storage import create_outcome_store, create_post_store, create_rate_limiter
+from storage.post_store import parse_scheduled_time, time_key
+from utils.helpers import encode_cursor, decode_cursor
+from utils.timezones import parse_zone_weights, zone_weights
+from utils.middleware import (
+    CompressionMiddleware, MetricsMiddleware, ProfilingMiddleware, RateLimitMiddleware,
+    ResponseCache, ResponseCacheMiddleware
+)
+from utils import metrics
+from utils.metrics import PIPELINE_STAGE_SECONDS, StageTimer
+from utils.responses import FastJSONResponse
+from utils.source_transport import create_source_transport
+from services import PostDispatcher, LocalPublisher
+from utils.concurrency import cpu_queue_depth, run_io, shutdown_executors
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    if DISPATCHER_ENABLED:
+        dispatcher.start()
+    yield
+    await dispatcher.stop()
+    shutdown_executors()
+
+app = FastAPI(title="TrendWise API", version="1.0.0", lifespan=lifespan,
+              default_response_class=FastJSONResponse)
+
+# Rendered responses of the polled read-only routes, with per-route TTLs
+# in seconds; clients revalidate with If-None-Match (0 disables)
+RESPONSE_CACHE_ENABLED = os.getenv('TRENDWISE_RESPONSE_CACHE', '1') != '0'
+response_cache = ResponseCache({
+    "/api/posting-insights": 300,
+    "/api/trending-topics": 60,
+    "/api/trend-analytics": 60,
+    "/api/dashboard-stats": 10
+})
+if RESPONSE_CACHE_ENABLED:
+    app.add_middleware(ResponseCacheMiddleware, cache=response_cache)
 
-app = FastAPI(title="TrendWise API", version="1.0.0")
+# On-demand profiling of single requests (X-Profile header or ?profile=,
+# authorized by TRENDWISE_PROFILE_TOKEN in X-Profile-Token); not installed
+# at all unless enabled with a token. Sits outside the response cache so
+# inline profiles are never cached.
+PROFILE_TOKEN = os.getenv('TRENDWISE_PROFILE_TOKEN', '')
+PROFILING_ENABLED = os.getenv('TRENDWISE_PROFILING', '0') == '1' and bool(PROFILE_TOKEN)
+if PROFILING_ENABLED:
+    app.add_middleware(
+        ProfilingMiddleware,
+        token=PROFILE_TOKEN,
+        output_dir=os.getenv('TRENDWISE_PROFILE_DIR', 'profiles'),
+        max_files=int(os.getenv('TRENDWISE_PROFILE_MAX_FILES', '50'))
+    )
+
+# Per-client limits on the expensive generation routes (0 disables), shared
+# by all workers through the database.
+# Added before CORS so rejected responses still carry CORS headers.
+RATE_LIMIT_PER_MINUTE = int(os.getenv('TRENDWISE_RATE_LIMIT_PER_MINUTE', '30'))
+if RATE_LIMIT_PER_MINUTE > 0:
+    app.add_middleware(RateLimitMiddleware, limiter=create_rate_limiter(), rules={
+        "/api/generate-content": (RATE_LIMIT_PER_MINUTE, 60),
+        "/api/analyze-topic": (RATE_LIMIT_PER_MINUTE, 60)
+    })
+
+# Negotiated brotli/gzip for larger bodies; wraps the response cache so
+# cached bodies are stored once, uncompressed
+app.add_middleware(CompressionMiddleware, minimum_size=1024)
 
 # CORS middleware
 app.add_middleware(
@@ -19,23 +88,49 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=["Server-Timing"],
 )
 
+# Outermost, so latency includes cache hits, rate-limit rejections and compression
+app.add_middleware(MetricsMiddleware)
+
 # Initialize models
-keyword_predictor = KeywordPredictor()
+# Trend sources are fetched live, or recorded to / replayed from an archive
+# (TRENDWISE_SOURCE_MODE, TRENDWISE_SOURCE_ARCHIVE)
+keyword_predictor = KeywordPredictor(transport=create_source_transport())
 content_generator = ContentGenerator()
 engagement_predictor = EngagementPredictor()
-schedule_optimizer = ScheduleOptimizer()
+# Learned engagement outcomes are shared through the same database
+schedule_optimizer = ScheduleOptimizer(outcome_store=create_outcome_store())
 
-# In-memory storage for scheduled posts
-scheduled_posts = []
-post_id_counter = 1
+# Scheduled posts (SQLite by default, shared by all workers)
+post_store = create_post_store()
+
+# Publishes queued posts at their scheduled time
+DISPATCHER_ENABLED = os.getenv('TRENDWISE_DISPATCHER_ENABLED', '1') != '0'
+dispatcher = PostDispatcher(post_store, LocalPublisher())
+
+# Gauges read at scrape time by /metrics
+metrics.watch_caches({
+    "keywords": keyword_predictor.cache_stats,
+    "trending_topics": keyword_predictor.trending_cache_stats,
+    "schedules": schedule_optimizer.schedule_cache,
+    "schedule_suggestions": schedule_optimizer.suggestion_cache,
+    "responses": response_cache
+})
+metrics.watch_event_loop(executor_queue=cpu_queue_depth)
 
 # Pydantic models
 class ContentGenerateRequest(BaseModel):
     category: str  # Technology, Healthcare, Politics, Cooking, Entertainment, Custom
     topic: str
     content_type: Optional[str] = "blog"  # blog, social_post, landing_page
+    include_timings: Optional[bool] = False  # add per-stage milliseconds as "timings"
+
+class BulkScoreRequest(BaseModel):
+    contents: List[str]
+    keywords: List[str]
+    platform: Optional[str] = "website"  # website, social_media, email
 
 class TrendAnalyticsResponse(BaseModel):
     total_trends: int
@@ -56,6 +151,31 @@ class SchedulePostRequest(BaseModel):
     scheduled_time: Optional[str] = None  # ISO format datetime
     auto_schedule: Optional[bool] = False
 
+class BatchPost(BaseModel):
+    title: str
+    content: str
+    platform: str  # Twitter, LinkedIn, Instagram
+
+class ScheduleBatchRequest(BaseModel):
+    posts: List[BatchPost]
+    target_audience: Optional[str] = "general"
+    timezone: Optional[str] = "UTC"
+    audience_timezones: Optional[Dict[str, float]] = None  # zone -> audience share
+    min_spacing_hours: int = Field(2, ge=1)  # per platform
+    daily_caps: Optional[Dict[str, int]] = None  # platform -> posts per day
+    mode: Literal["greedy", "exact"] = "greedy"
+    dry_run: Optional[bool] = False
+
+class EngagementOutcome(BaseModel):
+    engagement_score: float  # 0-100, same scale as the schedule scores
+    post_id: Optional[int] = None
+    posted_at: Optional[str] = None  # ISO format datetime; defaults to the post's scheduled time
+    target_audience: Optional[str] = "general"
+    timezone: Optional[str] = "UTC"  # audience timezone
+
+class EngagementOutcomesRequest(BaseModel):
+    outcomes: List[EngagementOutcome]
+
 class ScheduledPost(BaseModel):
     id: int
     title: str
@@ -86,40 +206,45 @@ async def generate_content(request: ContentGenerateRequest):
         }
         
         industry = category_map.get(request.category, "general")
+        timer = StageTimer(PIPELINE_STAGE_SECONDS)
         
         # Generate keywords first
-        keywords = keyword_predictor.predict_keywords(
-            topic=request.topic,
-            industry=industry,
-            num_keywords=15
-        )
+        with timer.stage('keywords'):
+            keywords = await keyword_predictor.predict_keywords_async(
+                topic=request.topic,
+                industry=industry,
+                num_keywords=15
+            )
         
         # Generate content
-        content = content_generator.generate(
-            topic=request.topic,
-            content_type=request.content_type or "blog",
-            keywords=[k['keyword'] for k in keywords[:10]],
-            target_audience="general",
-            tone="professional",
-            length=1500,
-            category=industry
-        )
+        with timer.stage('content'):
+            content = await content_generator.generate_async(
+                topic=request.topic,
+                content_type=request.content_type or "blog",
+                keywords=[k['keyword'] for k in keywords[:10]],
+                target_audience="general",
+                tone="professional",
+                length=1500,
+                category=industry
+            )
         
         # Predict engagement
-        engagement_data = engagement_predictor.predict(
-            content=content,
-            keywords=[k['keyword'] for k in keywords[:10]]
-        )
+        with timer.stage('engagement'):
+            engagement_data = await engagement_predictor.predict_async(
+                content=content,
+                keywords=[k['keyword'] for k in keywords[:10]]
+            )
         
         # Get optimal schedule
-        schedule = schedule_optimizer.optimize(
-            content_type=request.content_type or "blog",
-            target_audience="general",
-            timezone="UTC",
-            num_suggestions=3
-        )
+        with timer.stage('schedule'):
+            schedule = await schedule_optimizer.optimize_async(
+                content_type=request.content_type or "blog",
+                target_audience="general",
+                timezone="UTC",
+                num_suggestions=3
+            )
         
-        return {
+        result = {
             "success": True,
             "content": content,
             "keywords": keywords[:10],
@@ -134,15 +259,50 @@ async def generate_content(request: ContentGenerateRequest):
             "generated_at": datetime.now().isoformat()
         }
         
+        # Per-stage milliseconds, also sent as Server-Timing for devtools
+        timings = timer.as_dict()
+        if request.include_timings:
+            result["timings"] = timings
+        
+        return FastJSONResponse(result, headers={
+            "Server-Timing": timer.server_timing(timings),
+            "Timing-Allow-Origin": "*"
+        })
+        
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
+@app.post("/api/score-content/bulk")
+async def score_content_bulk(request: BulkScoreRequest):
+    """Score a batch of documents against one keyword set"""
+    try:
+        started = time.perf_counter()
+        
+        results = await engagement_predictor.predict_many_async(
+            contents=request.contents,
+            keywords=request.keywords,
+            platform=request.platform or "website"
+        )
+        
+        elapsed = time.perf_counter() - started
+        
+        return {
+            "success": True,
+            "total_documents": len(results),
+            "results": results,
+            "docs_per_second": round(len(results) / elapsed, 1) if elapsed > 0 else None,
+            "scored_at": datetime.now().isoformat()
+        }
+        
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
-@app.get("/api/trend-analytics", response_model=TrendAnalyticsResponse)
+@app.get("/api/trend-analytics", responses={200: {"model": TrendAnalyticsResponse}})
 async def get_trend_analytics():
     """Get real-time trend analytics dashboard data"""
     try:
         # Get trending topics
-        trending_topics = keyword_predictor.get_trending_topics()
+        trending_topics = await keyword_predictor.get_trending_topics_async()
         
         # Calculate rising topics (those with positive growth)
         rising_count = len([t for t in trending_topics if t.get('growth', 0) > 0])
@@ -168,29 +328,40 @@ async def get_trend_analytics():
                 "icon": "trending_up" if growth_pct > 100 else "analytics"
             })
         
-        return TrendAnalyticsResponse(
-            total_trends=len(trending_topics),
-            rising_topics=rising_count,
-            avg_engagement=avg_engagement,
-            top_trending_topics=top_topics
-        )
+        return FastJSONResponse({
+            "total_trends": len(trending_topics),
+            "rising_topics": rising_count,
+            "avg_engagement": avg_engagement,
+            "top_trending_topics": top_topics
+        })
         
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
-@app.get("/api/posting-insights", response_model=PostingInsightsResponse)
+@app.get("/api/posting-insights", responses={200: {"model": PostingInsightsResponse}})
 async def get_posting_insights(
     content_type: str = "blog",
-    target_audience: str = "general"
+    target_audience: str = "general",
+    timezone: str = "UTC",
+    audience_timezones: Optional[str] = Query(
+        None, description="Audience split as 'Zone[:weight],...', e.g. America/New_York:0.6,Europe/London:0.4"
+    )
 ):
     """Get posting insights and recommendations"""
+    try:
+        audience_zones = parse_zone_weights(audience_timezones) if audience_timezones else None
+        zone_weights(audience_zones, default=timezone)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
     try:
         # Get optimal schedule
-        schedule = schedule_optimizer.optimize(
+        schedule = await schedule_optimizer.optimize_async(
             content_type=content_type,
             target_audience=target_audience,
-            timezone="UTC",
-            num_suggestions=5
+            timezone=timezone,
+            num_suggestions=5,
+            audience_timezones=audience_zones
         )
         
         # Determine best time window
@@ -234,15 +405,17 @@ async def get_posting_insights(
             }
         ]
         
-        # Calculate avg engagement percentage
-        avg_engagement_pct = np.random.randint(75, 95)
+        # Calculate avg engagement percentage (stable for the week)
+        avg_engagement_pct = schedule_optimizer.weekly_rng(
+            content_type, target_audience
+        ).randint(75, 94)
         
-        return PostingInsightsResponse(
-            best_time=best_time,
-            best_days=best_days_list,
-            avg_engagement=f"{avg_engagement_pct}%",
-            recommendations=recommendations
-        )
+        return FastJSONResponse({
+            "best_time": best_time,
+            "best_days": best_days_list,
+            "avg_engagement": f"{avg_engagement_pct}%",
+            "recommendations": recommendations
+        })
         
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
@@ -250,13 +423,11 @@ async def get_posting_insights(
 @app.post("/api/schedule-post")
 async def schedule_post(request: SchedulePostRequest):
     """Schedule a post for publishing"""
-    global post_id_counter, scheduled_posts
-    
     try:
         # Auto-schedule if requested
         if request.auto_schedule:
             # Get optimal time for next post
-            schedule = schedule_optimizer.optimize(
+            schedule = await schedule_optimizer.optimize_async(
                 content_type="social_post",
                 target_audience="general",
                 timezone="UTC",
@@ -272,18 +443,15 @@ async def schedule_post(request: SchedulePostRequest):
             scheduled_time = request.scheduled_time or datetime.now().isoformat()
         
         # Create scheduled post
-        post = {
-            "id": post_id_counter,
-            "title": request.title,
-            "content": request.content,
-            "platform": request.platform,
-            "scheduled_time": scheduled_time,
-            "status": "queued",
-            "created_at": datetime.now().isoformat()
-        }
-        
-        scheduled_posts.append(post)
-        post_id_counter += 1
+        post = await run_io(
+            post_store.add,
+            title=request.title,
+            content=request.content,
+            platform=request.platform,
+            scheduled_time=scheduled_time
+        )
+        dispatcher.notify()
+        response_cache.invalidate("/api/dashboard-stats")
         
         return {
             "success": True,
@@ -294,33 +462,181 @@ async def schedule_post(request: SchedulePostRequest):
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
+@app.post("/api/schedule-batch")
+async def schedule_batch(request: ScheduleBatchRequest):
+    """Schedule many posts at once without slot collisions"""
+    if request.mode == "exact" and len(request.posts) > CalendarSolver.MAX_EXACT_POSTS:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Exact mode schedules at most {CalendarSolver.MAX_EXACT_POSTS} posts per batch"
+        )
+    try:
+        zone_weights(request.audience_timezones, default=request.timezone)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+    try:
+        platforms = [post.platform for post in request.posts]
+
+        # Posts already in the queue keep their slots
+        existing = []
+        now_key = time.time()
+        for platform in {platform.lower() for platform in platforms}:
+            keys = await run_io(post_store.queued_time_keys, platform, start_key=now_key)
+            for key in keys:
+                existing.append({
+                    "platform": platform,
+                    "scheduled_at": datetime.fromtimestamp(key, pytz.utc)
+                })
+
+        planned = await schedule_optimizer.plan_calendar_async(
+            platforms,
+            target_audience=request.target_audience,
+            timezone=request.timezone,
+            audience_timezones=request.audience_timezones,
+            existing=existing,
+            min_spacing_hours=request.min_spacing_hours,
+            daily_caps=request.daily_caps,
+            mode=request.mode
+        )
+
+        placed = []
+        unscheduled = []
+        for index, (post, scheduled_at) in enumerate(zip(request.posts, planned)):
+            if scheduled_at is None:
+                unscheduled.append({"index": index, "title": post.title, "platform": post.platform})
+            else:
+                placed.append({
+                    "title": post.title,
+                    "content": post.content,
+                    "platform": post.platform,
+                    "scheduled_time": scheduled_at.isoformat()
+                })
+
+        if not request.dry_run and placed:
+            placed = await run_io(post_store.add_many, placed)
+            dispatcher.notify()
+            response_cache.invalidate("/api/dashboard-stats")
+
+        return {
+            "success": True,
+            "scheduled": placed,
+            "unscheduled": unscheduled,
+            "dry_run": request.dry_run
+        }
+
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
+@app.post("/api/engagement-outcomes")
+async def record_engagement_outcomes(request: EngagementOutcomesRequest):
+    """Feed actual post engagement back into the schedule optimizer"""
+    accepted = []
+    rejected = []
+    for index, outcome in enumerate(request.outcomes):
+        try:
+            if not outcome.target_audience or not outcome.timezone:
+                raise ValueError("target_audience and timezone must not be null")
+
+            post = None
+            if not outcome.posted_at and outcome.post_id is not None:
+                post = await run_io(post_store.get, outcome.post_id)
+            if outcome.posted_at:
+                posted_at = parse_scheduled_time(outcome.posted_at)
+            elif post is not None:
+                posted_at = post_store.scheduled_at(post)
+            else:
+                raise ValueError("posted_at or a known post_id is required")
+
+            zone_weights(None, default=outcome.timezone)
+            if not 0 <= outcome.engagement_score <= 100:
+                raise ValueError("engagement_score must be between 0 and 100")
+
+            accepted.append({
+                "target_audience": outcome.target_audience,
+                "posted_at": posted_at,
+                "engagement_score": outcome.engagement_score,
+                "timezone": outcome.timezone
+            })
+        except ValueError as e:
+            rejected.append({"index": index, "error": str(e)})
+
+    try:
+        recorded = await schedule_optimizer.record_outcomes_async(accepted)
+        response_cache.invalidate("/api/posting-insights")
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
+    return {
+        "success": True,
+        "recorded": recorded,
+        "rejected": rejected
+    }
+
 @app.get("/api/scheduled-posts")
-async def get_scheduled_posts():
-    """Get all scheduled posts"""
+async def get_scheduled_posts(
+    limit: int = Query(50, ge=1, le=500),
+    cursor: Optional[str] = None,
+    platform: Optional[str] = None,
+    status: str = "queued",  # queued, publishing, published, failed, cancelled, all
+    start: Optional[str] = None,  # ISO format datetime, inclusive
+    end: Optional[str] = None  # ISO format datetime, exclusive
+):
+    """Get scheduled posts, one page at a time (ordered by scheduled time)"""
     try:
+        # (time key, id) of the last post on the previous page
+        after = tuple(decode_cursor(cursor, (int, float), int)) if cursor else None
+        start_key = time_key(parse_scheduled_time(start)) if start else None
+        end_key = time_key(parse_scheduled_time(end)) if end else None
+    except (ValueError, TypeError):
+        raise HTTPException(status_code=400, detail="Invalid cursor or date filter")
+    
+    status_filter = None if status == "all" else status
+    
+    try:
+        # One extra row tells us whether another page exists
+        posts = await run_io(
+            post_store.query,
+            status=status_filter,
+            platform=platform,
+            start_key=start_key,
+            end_key=end_key,
+            after=after,
+            limit=limit + 1
+        )
+        has_more = len(posts) > limit
+        posts = posts[:limit]
+        
+        next_cursor = None
+        if has_more:
+            last = posts[-1]
+            next_cursor = encode_cursor(post_store.time_key_of(last), last['id'])
+        
         # Format posts for frontend
         upcoming_posts = []
+        today = datetime.now().date()
         
-        for post in scheduled_posts:
-            if post['status'] == 'queued':
-                scheduled_dt = datetime.fromisoformat(post['scheduled_time'].replace('Z', '+00:00'))
-                
-                # Format time
-                time_str = scheduled_dt.strftime("%I:%M %p")
-                date_str = "Today" if scheduled_dt.date() == datetime.now().date() else "Tomorrow"
-                
-                upcoming_posts.append({
-                    "id": post['id'],
-                    "title": post['title'],
-                    "scheduled_time": f"{date_str}, {time_str}",
-                    "platform": post['platform'],
-                    "status": post['status']
-                })
+        for post in posts:
+            scheduled_dt = post_store.scheduled_at(post)
+            
+            # Format time
+            time_str = scheduled_dt.strftime("%I:%M %p")
+            date_str = "Today" if scheduled_dt.date() == today else "Tomorrow"
+            
+            upcoming_posts.append({
+                "id": post['id'],
+                "title": post['title'],
+                "scheduled_time": f"{date_str}, {time_str}",
+                "platform": post['platform'],
+                "status": post['status']
+            })
         
         return {
             "success": True,
-            "total_scheduled": len(upcoming_posts),
-            "posts": upcoming_posts
+            "total_scheduled": await run_io(post_store.count, status_filter),
+            "posts": upcoming_posts,
+            "next_cursor": next_cursor,
+            "has_more": has_more
         }
         
     except Exception as e:
@@ -329,16 +645,15 @@ async def get_scheduled_posts():
 @app.put("/api/scheduled-posts/{post_id}")
 async def update_scheduled_post(post_id: int, action: str):
     """Update scheduled post (edit or cancel)"""
-    global scheduled_posts
-    
     try:
-        post = next((p for p in scheduled_posts if p['id'] == post_id), None)
+        post = await run_io(post_store.get, post_id)
         
         if not post:
             raise HTTPException(status_code=404, detail="Post not found")
         
         if action == "cancel":
-            post['status'] = 'cancelled'
+            await run_io(post_store.update_status, post_id, 'cancelled')
+            response_cache.invalidate("/api/dashboard-stats")
             return {
                 "success": True,
                 "message": "Post cancelled successfully"
@@ -354,13 +669,36 @@ async def update_scheduled_post(post_id: int, action: str):
         raise HTTPException(status_code=500, detail=str(e))
 
 @app.get("/api/trending-topics")
-async def get_trending_topics(limit: int = 20):
+async def get_trending_topics(
+    limit: int = Query(20, ge=1, le=100),
+    cursor: Optional[str] = None,
+    source: Optional[str] = None,  # reddit, google
+    category: Optional[str] = None  # Trending, Hot
+):
     """Get current trending topics"""
     try:
-        topics = keyword_predictor.get_trending_topics()
+        offset = decode_cursor(cursor, int)[0] if cursor else 0
+        if offset < 0:
+            raise ValueError("Malformed cursor")
+    except ValueError:
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+    
+    try:
+        topics = await keyword_predictor.get_trending_topics_async()
+        
+        if source:
+            topics = [t for t in topics if t.get('source', '').lower() == source.lower()]
+        if category:
+            topics = [t for t in topics if t.get('category', '').lower() == category.lower()]
+        
+        page = topics[offset:offset + limit]
+        has_more = offset + limit < len(topics)
+        
         return {
             "success": True,
-            "topics": topics[:limit],
+            "topics": page,
+            "next_cursor": encode_cursor(offset + limit) if has_more else None,
+            "has_more": has_more,
             "updated_at": datetime.now().isoformat()
         }
     except Exception as e:
@@ -382,7 +720,7 @@ async def analyze_topic(topic: str, category: str = "general"):
         industry = category_map.get(category, "general")
         
         # Get keywords
-        keywords = keyword_predictor.predict_keywords(
+        keywords = await keyword_predictor.predict_keywords_async(
             topic=topic,
             industry=industry,
             num_keywords=20
@@ -393,7 +731,7 @@ async def analyze_topic(topic: str, category: str = "general"):
         avg_competition = np.mean([k['competition'] for k in keywords[:10]])
         trending_count = len([k for k in keywords if k.get('trending_now', False)])
         
-        return {
+        return FastJSONResponse({
             "success": True,
             "topic": topic,
             "category": category,
@@ -405,7 +743,7 @@ async def analyze_topic(topic: str, category: str = "general"):
             },
             "keywords": keywords,
             "analyzed_at": datetime.now().isoformat()
-        }
+        })
         
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
@@ -415,10 +753,10 @@ async def get_dashboard_stats():
     """Get overall dashboard statistics"""
     try:
         # Get trending topics
-        trending = keyword_predictor.get_trending_topics()
+        trending = await keyword_predictor.get_trending_topics_async()
         
         # Calculate stats
-        total_posts_scheduled = len([p for p in scheduled_posts if p['status'] == 'queued'])
+        total_posts_scheduled = await run_io(post_store.count, 'queued')
         total_content_generated = np.random.randint(50, 150)
         avg_seo_score = np.random.randint(75, 95)
         
@@ -438,6 +776,11 @@ async def get_dashboard_stats():
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
+@app.get("/metrics", response_class=PlainTextResponse, include_in_schema=False)
+async def get_metrics():
+    """Prometheus scrape endpoint"""
+    return PlainTextResponse(metrics.REGISTRY.render(), media_type=metrics.CONTENT_TYPE)
+
 @app.get("/health")
 async def health_check():
     return {
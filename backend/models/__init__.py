@@ -2,10 +2,14 @@ from .keyword_predictor import KeywordPredictor
 from .content_generator import ContentGenerator
 from .engagement_predictor import EngagementPredictor
 from .schedule_optimizer import ScheduleOptimizer
+from .calendar_solver import CalendarSolver
+from .outcome_learner import OutcomeLearner
 
 __all__ = [
     'KeywordPredictor',
     'ContentGenerator',
     'EngagementPredictor',
-    'ScheduleOptimizer'
+    'ScheduleOptimizer',
+    'CalendarSolver',
+    'OutcomeLearner'
 ]
\ No newline at end of file
@@ -0,0 +1,180 @@
+import heapq
+import math
+from typing import Dict, Iterable, List, Optional
+
+import numpy as np
+
+
+class CalendarSolver:
+    """Assign posts to hourly slots so that total engagement is maximized.
+
+    Slots are hours of a planning window. Posts on the same platform never
+    share a slot and are at least `min_spacing_hours` apart, including posts
+    already queued, and each platform has a per-day cap. Posts on different
+    platforms are independent, so each platform is solved on its own.
+
+    Two modes are available:
+      greedy - take the best free slot from a max-heap until the platform's
+               posts are placed (O(H log H) per platform)
+      exact  - dynamic programming over (slot, posts placed, posts today),
+               which maximizes the number of posts placed and then the total
+               score. Its tables grow with hours x posts x daily cap, so at
+               most MAX_EXACT_POSTS posts per platform are accepted.
+    """
+
+    MODES = ('greedy', 'exact')
+    MAX_EXACT_POSTS = 500
+
+    def __init__(self, min_spacing_hours: int = 2, mode: str = 'greedy'):
+        if min_spacing_hours < 1:
+            raise ValueError("min_spacing_hours must be at least 1")
+        if mode not in self.MODES:
+            raise ValueError(f"Unknown solver mode: {mode}")
+        self.min_spacing_hours = min_spacing_hours
+        self.mode = mode
+
+    def solve(self, counts: Dict[str, int], scores: Dict[str, np.ndarray],
+              daily_caps: Dict[str, int],
+              occupied: Optional[Dict[str, Iterable[float]]] = None) -> Dict[str, List[int]]:
+        """Choose slots for each platform.
+
+        `counts` is the number of new posts per platform, `scores` the score
+        of every window hour per platform and `occupied` the hour offsets of
+        posts already queued (fractional for posts off the hour). Returns sorted slot indices per platform; a
+        platform gets fewer slots than requested when the window is full.
+        """
+        occupied = occupied or {}
+        if self.mode == 'exact' and counts and max(counts.values()) > self.MAX_EXACT_POSTS:
+            raise ValueError(f"Exact mode schedules at most {self.MAX_EXACT_POSTS} posts per platform")
+        assignments = {}
+
+        for platform, count in counts.items():
+            platform_scores = np.asarray(scores[platform], dtype=float)
+            blocked, day_caps = self._constraints(
+                platform_scores.size, occupied.get(platform, ()), daily_caps[platform]
+            )
+
+            if self.mode == 'exact':
+                slots = self._solve_exact(platform_scores, count, blocked, day_caps)
+            else:
+                slots = self._solve_greedy(platform_scores, count, blocked, day_caps)
+            assignments[platform] = sorted(slots)
+
+        return assignments
+
+    def _constraints(self, hours: int, occupied: Iterable[float], daily_cap: int):
+        """Slots ruled out by queued posts, and the remaining cap of each day"""
+        spacing = self.min_spacing_hours
+        # No day holds more than ceil(24 / spacing) posts, whatever the cap
+        daily_cap = min(daily_cap, math.ceil(24 / spacing))
+        blocked = np.zeros(hours, dtype=bool)
+        day_caps = np.full(math.ceil(hours / 24), daily_cap, dtype=np.int64)
+
+        for offset in occupied:
+            slot = math.floor(offset)
+            if 0 <= slot < hours:
+                day_caps[slot // 24] -= 1
+            # Every hour strictly less than `spacing` away from the post
+            first = math.floor(offset - spacing) + 1
+            end = math.ceil(offset + spacing)
+            blocked[max(0, first):max(0, end)] = True
+
+        return blocked, np.maximum(day_caps, 0)
+
+    def _solve_greedy(self, scores: np.ndarray, count: int,
+                      blocked: np.ndarray, day_caps: np.ndarray) -> List[int]:
+        spacing = self.min_spacing_hours
+        blocked = blocked.copy()
+        day_caps = day_caps.copy()
+
+        # Earlier hours win ties
+        heap = [(-score, slot) for slot, score in enumerate(scores.tolist())]
+        heapq.heapify(heap)
+
+        chosen = []
+        while heap and len(chosen) < count:
+            _, slot = heapq.heappop(heap)
+            day = slot // 24
+            if blocked[slot] or day_caps[day] == 0:
+                continue
+
+            chosen.append(slot)
+            day_caps[day] -= 1
+            blocked[max(0, slot - spacing + 1):slot + spacing] = True
+
+        return chosen
+
+    def _solve_exact(self, scores: np.ndarray, count: int,
+                     blocked: np.ndarray, day_caps: np.ndarray) -> List[int]:
+        spacing = self.min_spacing_hours
+        hours = scores.size
+        max_cap = int(day_caps.max(initial=0))
+        if count == 0 or max_cap == 0:
+            return []
+
+        # best[t][k, c]: best total over slots before t with k posts placed,
+        # c of them on the day of slot t. Only the last `spacing` rows are
+        # needed, so they live in a ring buffer; the back-pointers (whether
+        # slot t-1 was taken, and the previous c) are kept for every t.
+        shape = (count + 1, max_cap + 1)
+        ring = np.full((spacing + 1,) + shape, -np.inf)
+        ring[0, 0, 0] = 0.0
+        took = np.zeros((hours + 1,) + shape, dtype=bool)
+        parent_c = np.zeros((hours + 1,) + shape, dtype=np.int8)
+        keep = np.broadcast_to(np.arange(max_cap + 1, dtype=np.int8), shape)
+
+        for t in range(hours):
+            day = t // 24
+            skip = ring[t % (spacing + 1)]
+
+            take = np.full(shape, -np.inf)
+            take_parent = np.zeros(shape, dtype=np.int8)
+            cap = int(day_caps[day])
+            if not blocked[t] and cap > 0:
+                source = max(0, t - spacing + 1)
+                prev = ring[source % (spacing + 1)]
+                if source // 24 == day:
+                    # c posts earlier today become c + 1
+                    take[1:, 1:cap + 1] = prev[:-1, :cap] + scores[t]
+                    take_parent[1:, 1:cap + 1] = np.arange(cap)
+                else:
+                    # The previous post is on an earlier day
+                    take[1:, 1] = prev[:-1].max(axis=1) + scores[t]
+                    take_parent[1:, 1] = prev[:-1].argmax(axis=1)
+
+            use_take = take > skip
+            merged = np.where(use_take, take, skip)
+            merged_parent = np.where(use_take, take_parent, keep)
+
+            row = np.full(shape, -np.inf)
+            if (t + 1) % 24 == 0:
+                # Midnight: every day count collapses to 0 for the next day
+                best_c = merged.argmax(axis=1)
+                ks = np.arange(count + 1)
+                row[:, 0] = merged[ks, best_c]
+                took[t + 1, :, 0] = use_take[ks, best_c]
+                parent_c[t + 1, :, 0] = np.where(use_take[ks, best_c], take_parent[ks, best_c], best_c)
+            else:
+                row[:] = merged
+                took[t + 1] = use_take
+                parent_c[t + 1] = merged_parent
+            ring[(t + 1) % (spacing + 1)] = row
+
+        final = ring[hours % (spacing + 1)]
+        placeable = np.flatnonzero(np.isfinite(final.max(axis=1)))
+        k = int(placeable.max())
+        c = int(final[k].argmax())
+
+        chosen = []
+        t = hours
+        while k > 0:
+            previous_c = int(parent_c[t, k, c])
+            if took[t, k, c]:
+                chosen.append(t - 1)
+                k -= 1
+                t = max(0, t - spacing)
+            else:
+                t -= 1
+            c = previous_c
+
+        return chosen
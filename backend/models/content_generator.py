@@ -1,6 +1,7 @@
 import random
 from typing import List
 import re
+from utils.concurrency import run_cpu
 
 class ContentGenerator:
     def __init__(self):
@@ -27,18 +28,27 @@ class ContentGenerator:
         
         return content
     
+    async def generate_async(self, topic: str, content_type: str, keywords: List[str],
+                             target_audience: str = "general", tone: str = "professional",
+                             length: int = 500, category: str = "general") -> str:
+        """Awaitable generate, run on the shared CPU executor"""
+        return await run_cpu(
+            self.generate, topic, content_type, keywords,
+            target_audience=target_audience, tone=tone, length=length, category=category
+        )
+    
     def _generate_blog(self, topic: str, keywords: List[str], template: dict,
                        tone: str, length: int, category: str = "general") -> str:
         """Generate blog post"""
         
-    # Title (make sure title contains category/topic)
-    title = f"# {template['title_prefix']} {topic.title()} - {category.title()}: {template['title_suffix']}\n\n"
+        # Title (make sure title contains category/topic)
+        title = f"# {template['title_prefix']} {topic.title()} - {category.title()}: {template['title_suffix']}\n\n"
         
         # Introduction
-    intro = f"## Introduction\n\n"
-    intro += f"{template['intro_hook'].format(topic=topic, keyword=keywords[0])} "
-    intro += f"In this comprehensive guide focused on {category} and {topic}, we'll explore everything you need to know about {topic}, "
-    intro += f"including {', '.join(keywords[:3])}, and more.\n\n"
+        intro = f"## Introduction\n\n"
+        intro += f"{template['intro_hook'].format(topic=topic, keyword=keywords[0])} "
+        intro += f"In this comprehensive guide focused on {category} and {topic}, we'll explore everything you need to know about {topic}, "
+        intro += f"including {', '.join(keywords[:3])}, and more.\n\n"
         
         # Main sections
         sections = []
@@ -94,9 +104,9 @@ class ContentGenerator:
             sections.append(f"## {section['title']}\n\n{section['content']}\n\n")
         
         # Conclusion
-    conclusion = f"## Conclusion\n\n"
-    conclusion += f"Mastering {topic} in the {category} space requires understanding {keywords[0]}, implementing effective "
-    conclusion += f"{keywords[1]} strategies, and continuously optimizing {keywords[2]}. "
+        conclusion = f"## Conclusion\n\n"
+        conclusion += f"Mastering {topic} in the {category} space requires understanding {keywords[0]}, implementing effective "
+        conclusion += f"{keywords[1]} strategies, and continuously optimizing {keywords[2]}. "
         conclusion += f"By following the best practices outlined in this guide, you can achieve "
         conclusion += f"significant improvements in your results and stay ahead of the competition.\n\n"
         conclusion += f"Ready to take your {topic} strategy to the next level? Start implementing these "
@@ -138,9 +148,9 @@ class ContentGenerator:
         content += f"- 3x average ROI improvement\n"
         content += f"- Used by 10,000+ businesses worldwide\n\n"
         
-    content += f"### Get Started Today\n\n"
-    content += f"Join thousands of successful {category} organizations using our {topic} solution. "
-    content += f"Start your free trial now - no credit card required!\n\n"
+        content += f"### Get Started Today\n\n"
+        content += f"Join thousands of successful {category} organizations using our {topic} solution. "
+        content += f"Start your free trial now - no credit card required!\n\n"
         
         content += f"**[Start Free Trial]** | **[Watch Demo]** | **[Contact Sales]**\n"
         
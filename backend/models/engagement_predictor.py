@@ -1,11 +1,14 @@
 import numpy as np
 import re
-from typing import List, Dict
-from textblob import TextBlob
+from typing import List, Dict, Optional
 import math
+from utils.keyword_matcher import get_keyword_matcher, KeywordMatches
+from utils.sentiment import SentimentScorer
+from utils.syllables import SyllableCounter
+from utils.concurrency import run_cpu
 
 class EngagementPredictor:
-    def __init__(self):
+    def __init__(self, enable_sentiment: bool = False):
         self.weights = {
             'keyword_density': 0.25,
             'readability': 0.20,
@@ -13,17 +16,32 @@ class EngagementPredictor:
             'keyword_placement': 0.20,
             'semantic_relevance': 0.20
         }
+        # Sentiment is opt-in and does not contribute to the SEO score
+        self.enable_sentiment = enable_sentiment
+        self._sentiment_scorer = None
+        self.syllable_counter = SyllableCounter()
+        
+    @property
+    def sentiment_scorer(self) -> SentimentScorer:
+        """Lexicon scorer, built on first use"""
+        if self._sentiment_scorer is None:
+            self._sentiment_scorer = SentimentScorer()
+        return self._sentiment_scorer
         
     def predict(self, content: str, keywords: List[str], 
-                platform: str = "website") -> Dict:
+                platform: str = "website",
+                include_sentiment: Optional[bool] = None) -> Dict:
         """Predict engagement metrics for content"""
         
+        # Find every keyword (and keyword word) in a single pass
+        matches = self._scan_keywords(content, keywords)
+        
         # Calculate individual scores
-        keyword_score = self._calculate_keyword_score(content, keywords)
+        keyword_score = self._calculate_keyword_score(content, keywords, matches)
         readability_score = self._calculate_readability(content)
         length_score = self._calculate_length_score(content)
-        placement_score = self._calculate_placement_score(content, keywords)
-        semantic_score = self._calculate_semantic_score(content, keywords)
+        placement_score = self._calculate_placement_score(content, keywords, matches)
+        semantic_score = self._calculate_semantic_score(content, keywords, matches)
         
         # Calculate weighted SEO score
         seo_score = (
@@ -51,7 +69,7 @@ class EngagementPredictor:
         # Calculate bounce rate
         bounce_rate = self._calculate_bounce_rate(readability_score, length_score)
         
-        return {
+        result = {
             'seo_score': round(seo_score, 2),
             'predicted_ranking': predicted_ranking,
             'estimated_traffic': estimated_traffic,
@@ -76,19 +94,173 @@ class EngagementPredictor:
                 seo_score, readability_score, keyword_score, length_score
             )
         }
+        
+        if include_sentiment is None:
+            include_sentiment = self.enable_sentiment
+        if include_sentiment:
+            result['sentiment'] = self.sentiment_scorer.analyze(content)
+        
+        return result
+    
+    async def predict_async(self, content: str, keywords: List[str],
+                            platform: str = "website",
+                            include_sentiment: Optional[bool] = None) -> Dict:
+        """Awaitable predict, run on the shared CPU executor"""
+        return await run_cpu(
+            self.predict, content, keywords,
+            platform=platform, include_sentiment=include_sentiment
+        )
     
-    def _calculate_keyword_score(self, content: str, keywords: List[str]) -> float:
+    def predict_many(self, contents: List[str], keywords: List[str],
+                     platform: str = "website",
+                     include_sentiment: Optional[bool] = None) -> List[Dict]:
+        """Predict engagement metrics for a batch of documents sharing one keyword set"""
+        
+        n_docs = len(contents)
+        if n_docs == 0:
+            return []
+        
+        word_counts = np.zeros(n_docs)
+        sentence_counts = np.zeros(n_docs)
+        paragraph_counts = np.zeros(n_docs, dtype=int)
+        syllable_counts = np.zeros(n_docs)
+        keyword_counts = np.zeros(n_docs)
+        placement_scores = np.zeros(n_docs)
+        semantic_scores = np.zeros(n_docs)
+        
+        # Per-document feature extraction (text scanning stays in Python)
+        for i, content in enumerate(contents):
+            words = content.split()
+            matches = self._scan_keywords(content, keywords)
+            
+            word_counts[i] = len(words)
+            sentence_counts[i] = len(re.split(r'[.!?]+', content))
+            paragraph_counts[i] = len(content.split('\n\n'))
+            syllable_counts[i] = self.syllable_counter.count_words(words)
+            keyword_counts[i] = sum(matches.count(kw) for kw in keywords[:5])
+            placement_scores[i] = self._calculate_placement_score(content, keywords, matches)
+            semantic_scores[i] = self._calculate_semantic_score(content, keywords, matches)
+        
+        has_words = word_counts > 0
+        safe_words = np.where(has_words, word_counts, 1)
+        
+        # Keyword density score (optimal density is 1-3%)
+        density = (keyword_counts / safe_words) * 100
+        keyword_scores = np.where(
+            (density >= 1) & (density <= 3), 100.0,
+            np.where(density < 1, density * 100, np.maximum(0, 100 - (density - 3) * 20))
+        )
+        keyword_scores = np.where(has_words, keyword_scores, 0.0)
+        
+        # Flesch Reading Ease, normalized to 0-100
+        readability_scores = np.clip(
+            206.835 - 1.015 * (word_counts / sentence_counts) - 84.6 * (syllable_counts / safe_words),
+            0, 100
+        )
+        readability_scores = np.where(has_words, readability_scores, 50.0)
+        
+        # Optimal length: 1500-2500 words
+        length_scores = np.where(
+            (word_counts >= 1500) & (word_counts <= 2500), 100.0,
+            np.where(word_counts < 1500, (word_counts / 1500) * 100,
+                     np.maximum(50, 100 - (word_counts - 2500) / 50))
+        )
+        
+        seo_scores = (
+            keyword_scores * self.weights['keyword_density'] +
+            readability_scores * self.weights['readability'] +
+            length_scores * self.weights['content_length'] +
+            placement_scores * self.weights['keyword_placement'] +
+            semantic_scores * self.weights['semantic_relevance']
+        )
+        
+        # Ranking buckets, same bands as _predict_ranking
+        bands = [seo_scores >= 90, seo_scores >= 80, seo_scores >= 70, seo_scores >= 60]
+        rank_low = np.select(bands, [1, 5, 15, 30], default=50)
+        rank_high = np.select(bands, [5, 15, 30, 50], default=100)
+        rankings = np.random.randint(rank_low, rank_high)
+        
+        traffic = np.maximum(
+            100, (10000 * np.exp(-0.1 * rankings) * (seo_scores / 100)).astype(int)
+        )
+        
+        multiplier = {'website': 1.0, 'social_media': 1.5, 'email': 1.2}.get(platform, 1.0)
+        engagement_rates = 2.5 * ((seo_scores + readability_scores) / 200) * multiplier
+        
+        base_ctr = np.select([rankings <= 3, rankings <= 10, rankings <= 20], [30, 10, 3], default=1)
+        ctrs = np.minimum(35, base_ctr * (seo_scores / 100))
+        
+        bounce_rates = np.clip(
+            40 + (100 - (readability_scores + length_scores) / 2) * 0.2, 25, 90
+        )
+        
+        if include_sentiment is None:
+            include_sentiment = self.enable_sentiment
+        
+        results = []
+        for i, content in enumerate(contents):
+            result = {
+                'seo_score': round(float(seo_scores[i]), 2),
+                'predicted_ranking': int(rankings[i]),
+                'estimated_traffic': int(traffic[i]),
+                'readability_score': round(float(readability_scores[i]), 2),
+                'engagement_metrics': {
+                    'engagement_rate': round(float(engagement_rates[i]), 2),
+                    'click_through_rate': round(float(ctrs[i]), 2),
+                    'bounce_rate': round(float(bounce_rates[i]), 2),
+                    'avg_time_on_page': self._estimate_time_on_page(int(word_counts[i]))
+                },
+                'keyword_metrics': {
+                    'keyword_density': round(float(keyword_scores[i]), 2),
+                    'keyword_placement': round(float(placement_scores[i]), 2),
+                    'semantic_relevance': round(float(semantic_scores[i]), 2)
+                },
+                'content_metrics': {
+                    'word_count': int(word_counts[i]),
+                    'sentence_count': int(sentence_counts[i]),
+                    'paragraph_count': int(paragraph_counts[i])
+                },
+                'improvement_suggestions': self._generate_suggestions(
+                    seo_scores[i], readability_scores[i], keyword_scores[i], length_scores[i]
+                )
+            }
+            if include_sentiment:
+                result['sentiment'] = self.sentiment_scorer.analyze(content)
+            results.append(result)
+        
+        return results
+    
+    async def predict_many_async(self, contents: List[str], keywords: List[str],
+                                 platform: str = "website",
+                                 include_sentiment: Optional[bool] = None) -> List[Dict]:
+        """Awaitable predict_many, run on the shared CPU executor"""
+        return await run_cpu(
+            self.predict_many, contents, keywords,
+            platform=platform, include_sentiment=include_sentiment
+        )
+    
+    def _scan_keywords(self, content: str, keywords: List[str]) -> KeywordMatches:
+        """Match all keywords and their individual words in one scan"""
+        patterns = list(keywords)
+        for keyword in keywords:
+            patterns.extend(keyword.lower().split())
+        
+        return get_keyword_matcher(patterns).scan(content)
+    
+    def _calculate_keyword_score(self, content: str, keywords: List[str],
+                                 matches: Optional[KeywordMatches] = None) -> float:
         """Calculate keyword density and distribution score"""
-        content_lower = content.lower()
-        words = content_lower.split()
-        total_words = len(words)
+        total_words = len(content.split())
         
         if total_words == 0:
             return 0
         
+        if matches is None:
+            matches = self._scan_keywords(content, keywords)
+        
         keyword_count = 0
         for keyword in keywords[:5]:  # Focus on top 5 keywords
-            keyword_count += content_lower.count(keyword.lower())
+            keyword_count += matches.count(keyword)
         
         # Optimal density is 1-3%
         density = (keyword_count / total_words) * 100
@@ -105,13 +277,14 @@ class EngagementPredictor:
     def _calculate_readability(self, content: str) -> float:
         """Calculate readability score (Flesch Reading Ease)"""
         sentences = len(re.split(r'[.!?]+', content))
-        words = len(content.split())
+        word_list = content.split()
+        words = len(word_list)
         
         if sentences == 0 or words == 0:
             return 50
         
-        # Count syllables (approximation)
-        syllables = sum([self._count_syllables(word) for word in content.split()])
+        # Count syllables (approximation), once per unique word
+        syllables = self.syllable_counter.count_words(word_list)
         
         # Flesch Reading Ease formula
         if sentences > 0 and words > 0:
@@ -125,23 +298,7 @@ class EngagementPredictor:
     
     def _count_syllables(self, word: str) -> int:
         """Count syllables in a word (approximation)"""
-        word = word.lower()
-        vowels = "aeiouy"
-        syllable_count = 0
-        previous_was_vowel = False
-        
-        for char in word:
-            is_vowel = char in vowels
-            if is_vowel and not previous_was_vowel:
-                syllable_count += 1
-            previous_was_vowel = is_vowel
-        
-        # Adjust for silent 'e'
-        if word.endswith('e'):
-            syllable_count -= 1
-        
-        # Minimum one syllable
-        return max(1, syllable_count)
+        return self.syllable_counter.count(word)
     
     def _calculate_length_score(self, content: str) -> float:
         """Calculate optimal content length score"""
@@ -157,46 +314,55 @@ class EngagementPredictor:
         
         return score
     
-    def _calculate_placement_score(self, content: str, keywords: List[str]) -> float:
+    def _calculate_placement_score(self, content: str, keywords: List[str],
+                                   matches: Optional[KeywordMatches] = None) -> float:
         """Calculate score based on keyword placement in important areas"""
         score = 0
-        content_lower = content.lower()
+        
+        if matches is None:
+            matches = self._scan_keywords(content, keywords)
+        
+        # Match positions index the lowercased content, which can be longer
+        # than the original (e.g. 'İ'), so bounds are measured the same way
+        first_line_end = content.find('\n')
+        if first_line_end == -1:
+            first_line_end = len(content)
+        title_end = len(content[:first_line_end].lower())
+        intro_end = len(content[:200].lower())
         
         # Check title (first line)
-        first_line = content.split('\n')[0].lower() if content else ""
-        if any(kw.lower() in first_line for kw in keywords[:3]):
+        if any(matches.contains(kw, 0, title_end) for kw in keywords[:3]):
             score += 40
         
         # Check first paragraph (first 200 chars)
-        first_para = content[:200].lower()
-        if any(kw.lower() in first_para for kw in keywords[:3]):
+        if any(matches.contains(kw, 0, intro_end) for kw in keywords[:3]):
             score += 30
         
         # Check headings (lines starting with #)
         headings = [line for line in content.split('\n') if line.startswith('#')]
-        heading_text = ' '.join(headings).lower()
-        if any(kw.lower() in heading_text for kw in keywords[:5]):
+        heading_matches = self._scan_keywords(' '.join(headings), keywords)
+        if any(heading_matches.contains(kw) for kw in keywords[:5]):
             score += 30
         
         return min(100, score)
     
-    def _calculate_semantic_score(self, content: str, keywords: List[str]) -> float:
+    def _calculate_semantic_score(self, content: str, keywords: List[str],
+                                  matches: Optional[KeywordMatches] = None) -> float:
         """Calculate semantic relevance using simple text analysis"""
         try:
-            blob = TextBlob(content)
-            sentiment = blob.sentiment.polarity
+            if matches is None:
+                matches = self._scan_keywords(content, keywords)
             
             # Check for keyword variations and related terms
-            content_lower = content.lower()
             variation_count = 0
             
             for keyword in keywords:
                 # Check for exact match
-                if keyword.lower() in content_lower:
+                if matches.contains(keyword):
                     variation_count += 2
                 # Check for partial match
                 keyword_words = keyword.lower().split()
-                if any(word in content_lower for word in keyword_words):
+                if any(matches.contains(word) for word in keyword_words):
                     variation_count += 1
             
             # Score based on variation usage
@@ -1,23 +1,61 @@
 import numpy as np
 from sklearn.feature_extraction.text import TfidfVectorizer
 from sklearn.ensemble import RandomForestRegressor
-from typing import List, Dict
+from typing import List, Dict, Optional
 import pickle
 import os
 from datetime import datetime, timedelta
 import re
-import requests
 from bs4 import BeautifulSoup
 import json
 from collections import Counter
+import asyncio
+import logging
+import time
+import httpx
+from utils.concurrency import run_cpu
+from utils.memo import CacheStats
+from utils.metrics import SOURCE_FAILURES, SOURCE_FETCH_SECONDS
+from utils.source_transport import LiveTransport
+
+logger = logging.getLogger(__name__)
+
+BROWSER_HEADERS = {
+    'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36'
+}
+DEFAULT_HEADERS = {'User-Agent': 'Mozilla/5.0'}
 
 class KeywordPredictor:
-    def __init__(self):
+    source_urls = {
+        'google_trends': "https://trends.google.com/trends/trendingsearches/daily/rss?geo=US",
+        'reddit_hot': "https://www.reddit.com/r/{subreddit}/hot.json?limit={limit}",
+        'news_feeds': [
+            'https://news.google.com/rss/search?q={}&hl=en-US&gl=US&ceid=US:en',
+            'https://hnrss.org/newest?q={}'
+        ]
+    }
+    
+    def __init__(self, source_urls: Optional[Dict] = None, transport=None):
+        # Per-instance overrides of the source endpoints, e.g. a local stand-in
+        # server for load tests; same keys and format placeholders as source_urls
+        if source_urls:
+            self.source_urls = {**KeywordPredictor.source_urls, **source_urls}
         self.model = None
         self.vectorizer = TfidfVectorizer(max_features=1000)
         self.load_or_train_model()
         self.cache = {}
         self.cache_duration = 3600  # 1 hour cache
+        self.cache_stats = CacheStats()
+        # Trending topics are kept briefly so paginated reads see one snapshot
+        self.trending_cache = None
+        self.trending_cache_duration = 300
+        # An empty list means every source failed; retry soon after an outage
+        self.trending_empty_cache_duration = 15
+        self.trending_cache_stats = CacheStats()
+        self.request_timeout = 10
+        # How source URLs are fetched: live, or recorded to / replayed from
+        # an archive (see utils.source_transport)
+        self.transport = transport or LiveTransport(self.request_timeout)
         
     def load_or_train_model(self):
         """Load pre-trained model or train new one"""
@@ -59,13 +97,44 @@ class KeywordPredictor:
         
         # Check cache first
         cache_key = f"{topic}_{industry}_{num_keywords}"
+        cached = self._get_cached(cache_key)
+        if cached is not None:
+            return cached
+        
+        # Fetch real-time trending keywords
+        realtime_keywords = self._fetch_realtime_trends(topic, industry)
+        
+        return self._rank_keywords(cache_key, realtime_keywords, topic, num_keywords)
+    
+    async def predict_keywords_async(self, topic: str, industry: str = "general",
+                                     num_keywords: int = 20) -> List[Dict]:
+        """Awaitable predict_keywords: sources are fetched concurrently without
+        blocking the event loop, parsing and scoring run on the CPU executor"""
+        
+        cache_key = f"{topic}_{industry}_{num_keywords}"
+        cached = self._get_cached(cache_key)
+        if cached is not None:
+            return cached
+        
+        realtime_keywords = await self._fetch_realtime_trends_async(topic, industry)
+        
+        return await run_cpu(
+            self._rank_keywords, cache_key, realtime_keywords, topic, num_keywords
+        )
+    
+    def _get_cached(self, cache_key: str):
+        """Return cached keywords if they are still fresh"""
         if cache_key in self.cache:
             cache_time, cached_data = self.cache[cache_key]
             if (datetime.now() - cache_time).total_seconds() < self.cache_duration:
+                self.cache_stats.record(True)
                 return cached_data
-        
-        # Fetch real-time trending keywords
-        realtime_keywords = self._fetch_realtime_trends(topic, industry)
+        self.cache_stats.record(False)
+        return None
+    
+    def _rank_keywords(self, cache_key: str, realtime_keywords: List[Dict],
+                       topic: str, num_keywords: int) -> List[Dict]:
+        """Merge real-time and topic keywords, score, sort and cache them"""
         
         # Merge with topic-specific analysis
         topic_keywords = self._analyze_topic_keywords(topic)
@@ -85,6 +154,54 @@ class KeywordPredictor:
         
         return all_keywords[:num_keywords]
     
+    def _http_get(self, url: str, headers: Dict):
+        """Blocking GET used by the synchronous source fetchers"""
+        return self.transport.get(url, headers)
+    
+    async def _http_get_async(self, client: httpx.AsyncClient, url: str, headers: Dict):
+        """Non-blocking GET; returns None instead of raising so one failing
+        source never cancels the others"""
+        try:
+            return await self.transport.get_async(client, url, headers)
+        except Exception as e:
+            logger.warning("Fetch error for %s: %s", url, e)
+            return None
+    
+    def _fetch_source(self, source: str, url: str, headers: Dict):
+        """_http_get, timed and counted per source for /metrics"""
+        started = time.perf_counter()
+        try:
+            response = self._http_get(url, headers)
+        except Exception:
+            self._record_fetch(source, started, None)
+            raise
+        self._record_fetch(source, started, response)
+        return response
+    
+    def _try_fetch_source(self, source: str, url: str, headers: Dict):
+        """_fetch_source returning None on errors, like _http_get_async"""
+        try:
+            return self._fetch_source(source, url, headers)
+        except Exception as e:
+            logger.warning("Fetch error for %s: %s", url, e)
+            return None
+    
+    async def _fetch_source_async(self, client: httpx.AsyncClient, source: str,
+                                  url: str, headers: Dict):
+        """_http_get_async, timed and counted per source for /metrics"""
+        started = time.perf_counter()
+        response = await self._http_get_async(client, url, headers)
+        self._record_fetch(source, started, response)
+        return response
+    
+    def _record_fetch(self, source: str, started: float, response):
+        SOURCE_FETCH_SECONDS.observe(time.perf_counter() - started, source)
+        if response is None or response.status_code != 200:
+            SOURCE_FAILURES.inc(source)
+    
+    def _async_client(self):
+        return self.transport.client()
+    
     def _fetch_realtime_trends(self, topic: str, industry: str) -> List[Dict]:
         """Fetch real-time trending keywords from multiple sources"""
         keywords = []
@@ -107,19 +224,53 @@ class KeywordPredictor:
         
         return keywords
     
+    async def _fetch_realtime_trends_async(self, topic: str, industry: str) -> List[Dict]:
+        """Fetch all sources concurrently, then parse them off the event loop"""
+        reddit_urls = self._reddit_urls(topic)
+        news_urls = self._news_urls(topic)
+        
+        async with self._async_client() as client:
+            responses = await asyncio.gather(
+                self._fetch_source_async(client, 'google_trends', self.source_urls['google_trends'], BROWSER_HEADERS),
+                *(self._fetch_source_async(client, 'reddit', url, DEFAULT_HEADERS) for url in reddit_urls),
+                *(self._fetch_source_async(client, 'news', url, DEFAULT_HEADERS) for url in news_urls)
+            )
+        
+        google_response = responses[0]
+        reddit_responses = responses[1:1 + len(reddit_urls)]
+        news_responses = responses[1 + len(reddit_urls):]
+        
+        return await run_cpu(
+            self._parse_realtime_trends, topic,
+            google_response, reddit_responses, news_responses
+        )
+    
+    def _parse_realtime_trends(self, topic: str, google_response, 
+                               reddit_responses: List, news_responses: List) -> List[Dict]:
+        """Parse already-fetched source responses, in the same source order as
+        _fetch_realtime_trends"""
+        keywords = []
+        keywords.extend(self._parse_google_trends(google_response, topic))
+        keywords.extend(self._fetch_twitter_trends(topic))
+        keywords.extend(self._parse_reddit_trends(reddit_responses, topic))
+        keywords.extend(self._parse_news_keywords(news_responses))
+        return keywords
+    
     def _scrape_google_trends(self, topic: str) -> List[Dict]:
         """Scrape Google Trends for trending searches"""
         try:
             # Google Trends Daily Trends page
-            url = "https://trends.google.com/trends/trendingsearches/daily/rss?geo=US"
-            
-            headers = {
-                'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36'
-            }
-            
-            response = requests.get(url, headers=headers, timeout=10)
-            
-            if response.status_code == 200:
+            response = self._fetch_source('google_trends', self.source_urls['google_trends'], BROWSER_HEADERS)
+        except Exception as e:
+            logger.error("Google Trends error: %s", e)
+            return []
+        
+        return self._parse_google_trends(response, topic)
+    
+    def _parse_google_trends(self, response, topic: str) -> List[Dict]:
+        """Parse the Google Trends daily RSS feed"""
+        try:
+            if response is not None and response.status_code == 200:
                 soup = BeautifulSoup(response.content, 'xml')
                 items = soup.find_all('item')[:20]
                 
@@ -140,7 +291,7 @@ class KeywordPredictor:
                 
                 return keywords
         except Exception as e:
-            print(f"Google Trends error: {e}")
+            logger.error("Google Trends error: %s", e)
         
         return []
     
@@ -169,27 +320,40 @@ class KeywordPredictor:
             return keywords[:5]
             
         except Exception as e:
-            print(f"Twitter trends error: {e}")
+            logger.error("Twitter trends error: %s", e)
         
         return []
     
+    def _reddit_urls(self, topic: str) -> List[str]:
+        """Reddit JSON API URLs (no auth needed for public data)"""
+        topic_clean = topic.replace(' ', '')
+        subreddits = ['all', topic_clean, 'technology', 'news']
+        
+        return [
+            self.source_urls['reddit_hot'].format(subreddit=subreddit, limit=10)
+            for subreddit in subreddits[:2]
+        ]
+    
     def _fetch_reddit_trends(self, topic: str) -> List[Dict]:
         """Fetch trending topics from Reddit"""
+        responses = []
+        
+        for url in self._reddit_urls(topic):
+            try:
+                responses.append(self._fetch_source('reddit', url, DEFAULT_HEADERS))
+            except:
+                continue
+        
+        return self._parse_reddit_trends(responses, topic)
+    
+    def _parse_reddit_trends(self, responses: List, topic: str) -> List[Dict]:
+        """Extract keywords from relevant Reddit hot posts"""
         try:
-            # Reddit JSON API (no auth needed for public data)
-            topic_clean = topic.replace(' ', '')
-            subreddits = ['all', topic_clean, 'technology', 'news']
-            
             keywords = []
             
-            for subreddit in subreddits[:2]:
-                url = f"https://www.reddit.com/r/{subreddit}/hot.json?limit=10"
-                headers = {'User-Agent': 'Mozilla/5.0'}
-                
+            for response in responses:
                 try:
-                    response = requests.get(url, headers=headers, timeout=10)
-                    
-                    if response.status_code == 200:
+                    if response is not None and response.status_code == 200:
                         data = response.json()
                         posts = data.get('data', {}).get('children', [])
                         
@@ -214,29 +378,37 @@ class KeywordPredictor:
             return keywords[:10]
             
         except Exception as e:
-            print(f"Reddit trends error: {e}")
+            logger.error("Reddit trends error: %s", e)
         
         return []
     
+    def _news_urls(self, topic: str) -> List[str]:
+        """News RSS feed URLs (NewsAPI alternative)"""
+        return [
+            feed_url.format(topic.replace(' ', '+'))
+            for feed_url in self.source_urls['news_feeds']
+        ]
+    
     def _fetch_news_keywords(self, topic: str) -> List[Dict]:
         """Fetch keywords from recent news headlines"""
+        responses = []
+        
+        for url in self._news_urls(topic):
+            try:
+                responses.append(self._fetch_source('news', url, DEFAULT_HEADERS))
+            except:
+                continue
+        
+        return self._parse_news_keywords(responses)
+    
+    def _parse_news_keywords(self, responses: List) -> List[Dict]:
+        """Extract keywords from news RSS headlines"""
         try:
-            # Using NewsAPI alternative - RSS feeds
-            rss_feeds = [
-                'https://news.google.com/rss/search?q={}&hl=en-US&gl=US&ceid=US:en',
-                'https://hnrss.org/newest?q={}'
-            ]
-            
             keywords = []
             
-            for feed_url in rss_feeds:
+            for response in responses:
                 try:
-                    url = feed_url.format(topic.replace(' ', '+'))
-                    headers = {'User-Agent': 'Mozilla/5.0'}
-                    
-                    response = requests.get(url, headers=headers, timeout=10)
-                    
-                    if response.status_code == 200:
+                    if response is not None and response.status_code == 200:
                         soup = BeautifulSoup(response.content, 'xml')
                         items = soup.find_all('item')[:10]
                         
@@ -258,7 +430,7 @@ class KeywordPredictor:
             return keywords[:15]
             
         except Exception as e:
-            print(f"News keywords error: {e}")
+            logger.error("News keywords error: %s", e)
         
         return []
     
@@ -426,20 +598,56 @@ class KeywordPredictor:
     
     def get_trending_topics(self) -> List[Dict]:
         """Get current trending topics across all sources"""
+        cached = self._get_cached_trending()
+        if cached is not None:
+            return cached
+        
+        # Each source may fail on its own; topics come from whichever answered
+        google_response = self._try_fetch_source('google_trends', self.source_urls['google_trends'], BROWSER_HEADERS)
+        reddit_url = self.source_urls['reddit_hot'].format(subreddit='all', limit=15)
+        reddit_response = self._try_fetch_source('reddit', reddit_url, DEFAULT_HEADERS)
+        
+        topics = self._build_trending_topics(google_response, reddit_response)
+        self.trending_cache = (datetime.now(), topics)
+        return topics
+    
+    async def get_trending_topics_async(self) -> List[Dict]:
+        """Awaitable get_trending_topics with both sources fetched concurrently"""
+        cached = self._get_cached_trending()
+        if cached is not None:
+            return cached
+        
+        reddit_url = self.source_urls['reddit_hot'].format(subreddit='all', limit=15)
+        
+        async with self._async_client() as client:
+            google_response, reddit_response = await asyncio.gather(
+                self._fetch_source_async(client, 'google_trends', self.source_urls['google_trends'], BROWSER_HEADERS),
+                self._fetch_source_async(client, 'reddit', reddit_url, DEFAULT_HEADERS)
+            )
+        
+        topics = await run_cpu(self._build_trending_topics, google_response, reddit_response)
+        self.trending_cache = (datetime.now(), topics)
+        return topics
+    
+    def _get_cached_trending(self):
+        """Return the cached trending topics if they are still fresh"""
+        if self.trending_cache is not None:
+            cache_time, topics = self.trending_cache
+            duration = self.trending_cache_duration if topics else self.trending_empty_cache_duration
+            if (datetime.now() - cache_time).total_seconds() < duration:
+                self.trending_cache_stats.record(True)
+                return topics
+        self.trending_cache_stats.record(False)
+        return None
+    
+    def _build_trending_topics(self, google_response, reddit_response) -> List[Dict]:
+        """Build the trending topic list from fetched Google and Reddit responses"""
         topics = []
         
+        # Sources are parsed separately so one malformed response keeps the other's topics
         try:
-            # Google Trends
-            google_trends = self._scrape_google_trends("")
-            
-            # Reddit hot topics
-            reddit_url = "https://www.reddit.com/r/all/hot.json?limit=15"
-            headers = {'User-Agent': 'Mozilla/5.0'}
-            
-            response = requests.get(reddit_url, headers=headers, timeout=10)
-            
-            if response.status_code == 200:
-                data = response.json()
+            if reddit_response is not None and reddit_response.status_code == 200:
+                data = reddit_response.json()
                 posts = data.get('data', {}).get('children', [])
                 
                 for post in posts[:10]:
@@ -454,21 +662,20 @@ class KeywordPredictor:
                         'category': 'Trending',
                         'source': 'reddit'
                     })
-            
-            # Add Google trends
-            for trend in google_trends[:5]:
-                topics.append({
-                    'topic': trend['keyword'],
-                    'trend_score': 95,
-                    'growth': round(np.random.uniform(15, 45), 2),
-                    'category': 'Hot',
-                    'source': 'google'
-                })
-            
         except Exception as e:
-            print(f"Error fetching trending topics: {e}")
+            logger.error("Error parsing Reddit trending topics: %s", e)
+        
+        # Add Google trends
+        for trend in (self._parse_google_trends(google_response, "") or [])[:5]:
+            topics.append({
+                'topic': trend['keyword'],
+                'trend_score': 95,
+                'growth': round(np.random.uniform(15, 45), 2),
+                'category': 'Hot',
+                'source': 'google'
+            })
         
         # Sort by trend score
         topics.sort(key=lambda x: x['trend_score'], reverse=True)
         
-        return topics[:15]
\ No newline at end of file
+        return topics[:15]
@@ -0,0 +1,88 @@
+import threading
+from typing import Dict, Iterable, List, Tuple
+
+import numpy as np
+
+
+class OutcomeLearner:
+    """Running mean of observed engagement per audience, weekday and hour.
+
+    Each outcome updates one cell of a 7x24 mean/count pair in O(1) with
+    Welford's incremental mean, so no history is kept or replayed. blend()
+    mixes the observations into a prior score grid, trusting a cell's mean
+    more as its observation count grows past `prior_strength`.
+
+    With a `store` (a SQLiteOutcomeStore) the cells live in the database and
+    the arrays here are this process's copy: record() updates the shared
+    cell, and sync() reloads audiences that other workers have updated.
+    """
+
+    def __init__(self, audiences: Iterable[str], prior_strength: float = 5.0, store=None):
+        self.prior_strength = prior_strength
+        self.store = store
+        self.means: Dict[str, np.ndarray] = {}
+        self.counts: Dict[str, np.ndarray] = {}
+        self.revisions: Dict[str, int] = {}
+        self._lock = threading.Lock()
+        for audience in audiences:
+            self.means[audience] = np.zeros((7, 24))
+            self.counts[audience] = np.zeros((7, 24), dtype=np.int64)
+            self.revisions[audience] = 0
+
+    def record(self, audience: str, weekday: int, hour: int, score: float) -> Tuple[float, int]:
+        """Add one observed engagement score; returns the cell's new (mean, count)"""
+        with self._lock:
+            counts = self.counts[audience]
+            means = self.means[audience]
+            if self.store is not None:
+                mean, count, revision = self.store.record(audience, weekday, hour, score)
+                means[weekday, hour] = mean
+                counts[weekday, hour] = count
+                # Another worker's update in between leaves the revision
+                # behind, so the next sync() reloads the audience
+                if revision == self.revisions[audience] + 1:
+                    self.revisions[audience] = revision
+                return float(mean), int(count)
+
+            counts[weekday, hour] += 1
+            count = int(counts[weekday, hour])
+            means[weekday, hour] += (score - means[weekday, hour]) / count
+            return float(means[weekday, hour]), count
+
+    def sync(self) -> List[str]:
+        """Reload audiences changed in the store since they were last read;
+        returns their names"""
+        if self.store is None:
+            return []
+
+        with self._lock:
+            changed = []
+            for audience, revision in self.store.revisions().items():
+                if audience not in self.means or revision == self.revisions[audience]:
+                    continue
+
+                revision, cells = self.store.cells(audience)
+                means = np.zeros((7, 24))
+                counts = np.zeros((7, 24), dtype=np.int64)
+                for weekday, hour, mean, count in cells:
+                    means[weekday, hour] = mean
+                    counts[weekday, hour] = count
+                self.means[audience] = means
+                self.counts[audience] = counts
+                self.revisions[audience] = revision
+                changed.append(audience)
+            return changed
+
+    def blend_cell(self, prior: float, mean: float, count: int) -> float:
+        """Posterior score for one cell"""
+        k = self.prior_strength
+        return (prior * k + mean * count) / (k + count)
+
+    def blend(self, audience: str, prior: np.ndarray) -> np.ndarray:
+        """Posterior score grid for an audience"""
+        counts = self.counts[audience]
+        k = self.prior_strength
+        return (prior * k + self.means[audience] * counts) / (k + counts)
+
+    def observations(self, audience: str) -> int:
+        return int(self.counts[audience].sum())
@@ -1,14 +1,104 @@
+import copy
+from collections.abc import Mapping
 from datetime import datetime, timedelta
-from typing import Dict, List, Optional
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
+import logging
+import math
 import random
+import threading
+import numpy as np
+import pytz
+from utils.concurrency import run_cpu
+from utils.memo import LRUCache
+from .calendar_solver import CalendarSolver
+from .outcome_learner import OutcomeLearner
+from utils.timezones import HOURS_PER_WEEK, local_slots, window_start, zone_weights
+
+logger = logging.getLogger(__name__)
+
+DAY_NAMES = ['Monday', 'Tuesday', 'Wednesday', 'Thursday', 'Friday', 'Saturday', 'Sunday']
+
+# Points added to hours that match a platform's best posting times
+PLATFORM_HOUR_BONUS = 5.0
+
+# Networks named on scheduled posts all use the social_media posting data
+PLATFORM_ALIASES = {
+    'twitter': 'social_media', 'x': 'social_media', 'linkedin': 'social_media',
+    'facebook': 'social_media', 'instagram': 'social_media', 'tiktok': 'social_media'
+}
+
+# Longest window the calendar planner will search
+MAX_PLAN_DAYS = 366
+
+SCHEDULE_FIELDS = (
+    'weekly_schedule', 'monthly_overview', 'optimal_times',
+    'recommendations', 'expected_impact', 'platform_insights'
+)
+
+
+class LazySchedule(Mapping):
+    """Schedule result whose sections are built on first access.
+
+    Only the requested fields are exposed, but a section may still build
+    another one it depends on (expected impact needs the weekly schedule).
+    """
+
+    def __init__(self, builders: Dict[str, Callable[['LazySchedule'], Any]],
+                 fields: Iterable[str] = SCHEDULE_FIELDS,
+                 sections: Optional[Dict[str, Any]] = None):
+        self._builders = builders
+        self._fields = tuple(fields)
+        self._sections: Dict[str, Any] = {} if sections is None else sections
+
+    def select(self, fields: Iterable[str]) -> 'LazySchedule':
+        """View exposing only `fields`, sharing already built sections"""
+        return LazySchedule(self._builders, fields, self._sections)
+
+    def section(self, name: str) -> Any:
+        """Return a section, building and memoizing it if needed"""
+        if name not in self._sections:
+            self._sections[name] = self._builders[name](self)
+        return self._sections[name]
+
+    def __getitem__(self, field: str) -> Any:
+        if field not in self._fields:
+            raise KeyError(field)
+        return self.section(field)
+
+    def __contains__(self, field) -> bool:
+        return field in self._fields
+
+    def __iter__(self):
+        return iter(self._fields)
+
+    def __len__(self) -> int:
+        return len(self._fields)
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Build every requested section and return them as a plain dict"""
+        return {field: self.section(field) for field in self._fields}
 
 class ScheduleOptimizer:
     """ML-based posting schedule optimization"""
     
-    def __init__(self):
+    def __init__(self, cache_size: int = 256, outcome_store=None):
         self.engagement_patterns = self._load_engagement_patterns()
         self.platform_data = self._load_platform_data()
-        print("ScheduleOptimizer initialized successfully")
+        self.prior_matrices: Dict[Tuple[str, str], np.ndarray] = {}
+        self.score_matrices: Dict[Tuple[str, str], np.ndarray] = {}
+        self._build_score_matrices()
+        # Observed outcomes are blended into score_matrices as they arrive;
+        # the version bumps so cached suggestions for the audience go stale.
+        # With an `outcome_store` they are shared with the other workers and
+        # read back before scoring.
+        self.learner = OutcomeLearner(self.engagement_patterns, store=outcome_store)
+        self.pattern_versions = {audience: 0 for audience in self.engagement_patterns}
+        self._outcome_lock = threading.Lock()
+        self.sync_outcomes()
+        # Schedules are keyed by ISO week, suggestions by their window start
+        self.schedule_cache = LRUCache(cache_size)
+        self.suggestion_cache = LRUCache(cache_size)
+        logger.info("ScheduleOptimizer initialized successfully")
         
     def _load_engagement_patterns(self) -> Dict:
         """Load engagement patterns by audience and time"""
@@ -69,73 +159,185 @@ class ScheduleOptimizer:
             }
         }
     
-    def generate_schedule(self, content_type: str, target_audience: str, 
-                         platform: str = "website") -> Dict:
-        """Generate optimal posting schedule"""
-        
+    def _build_score_matrices(self):
+        """Precompute 7x24 engagement scores for every audience x platform"""
+        for audience, patterns in self.engagement_patterns.items():
+            for platform, platform_info in self.platform_data.items():
+                prior = self._score_matrix(patterns, platform_info)
+                self.prior_matrices[(audience, platform)] = prior
+                self.score_matrices[(audience, platform)] = prior.copy()
+
+    def _score_matrix(self, patterns: Dict, platform_info: Dict) -> np.ndarray:
+        """Engagement score for every (weekday, hour) slot.
+
+        Scores are left unclipped so slots above 100 still rank correctly;
+        they are capped when reported.
+        """
+        peak_days = np.zeros(7)
+        peak_days[patterns['peak_days']] = 1.0
+        peak_hours = np.zeros(24)
+        peak_hours[patterns['peak_hours']] = 1.0
+        best_hours = np.zeros(24)
+        best_hours[platform_info.get('best_times', [])] = 1.0
+
+        hour_points = 25 * peak_hours + PLATFORM_HOUR_BONUS * best_hours
+        scores = 50.0 + 20 * peak_days[:, None] + hour_points[None, :]
+        scores *= patterns.get('engagement_multiplier', 1.0)
+
+        return np.round(scores, 1)
+
+    @staticmethod
+    def fold_scores(matrix: np.ndarray, zones: Tuple[Tuple[str, float], ...],
+                    start_ts: float, hours: int = HOURS_PER_WEEK) -> np.ndarray:
+        """Audience-weighted score for each hour of the window starting at `start_ts`.
+
+        Each zone's precomputed local-slot table maps the window's hours onto
+        the audience's local 7x24 grid; the gathered rows are then averaged
+        by audience share.
+        """
+        flat = matrix.ravel()
+        if len(zones) == 1:
+            return flat[local_slots(zones[0][0], start_ts, hours)]
+
+        slots = np.stack([local_slots(zone, start_ts, hours) for zone, _ in zones])
+        weights = np.array([weight for _, weight in zones])
+        return weights @ flat[slots]
+
+    @staticmethod
+    def _rank_slots(scores: np.ndarray, days: np.ndarray) -> np.ndarray:
+        """Window hours in suggestion order.
+
+        Hours are ordered by score; among equal scores each day's best hour
+        comes before any day's second best, so suggestions spread across the
+        week, then the earlier hour wins.
+        """
+        hours = np.arange(scores.size)
+        by_day = np.lexsort((hours, -scores, days))
+        sorted_days = days[by_day]
+        rank_in_day = np.empty_like(hours)
+        rank_in_day[by_day] = hours - np.searchsorted(sorted_days, sorted_days)
+
+        return np.lexsort((hours, rank_in_day, -scores))
+
+    def _resolve_keys(self, target_audience: str, platform: str) -> Tuple[str, str]:
+        """Map request values onto known audience/platform keys (case-insensitive)"""
+        audience = target_audience.lower()
+        if audience not in self.engagement_patterns:
+            audience = 'general'
+        platform = PLATFORM_ALIASES.get(platform.lower(), platform.lower())
+        if platform not in self.platform_data:
+            platform = 'website'
+        return audience, platform
+
+    def daily_cap(self, platform: str) -> int:
+        """Default posts-per-day limit, derived from the weekly frequency"""
+        posts_per_week = self.platform_data[self._resolve_keys('general', platform)[1]]['posts_per_week']
+        return max(1, math.ceil(posts_per_week / 7))
+
+    @staticmethod
+    def current_week() -> Tuple[int, int]:
+        """ISO (year, week) that schedule results are memoized for"""
+        return tuple(datetime.now().isocalendar()[:2])
+
+    @staticmethod
+    def current_month() -> Tuple[int, int]:
+        """(year, month) the monthly overview is built for"""
+        today = datetime.now()
+        return today.year, today.month
+
+    def weekly_rng(self, *parts, seed: int = 0) -> random.Random:
+        """Random generator that is stable for the given parts within a week"""
+        return random.Random('|'.join(map(str, (*parts, *self.current_week(), seed))))
+
+    def generate_schedule(self, content_type: str, target_audience: str,
+                         platform: str = "website",
+                         fields: Optional[Iterable[str]] = None,
+                         seed: int = 0) -> Dict:
+        """Generate optimal posting schedule.
+
+        Returns a plain dict of the requested sections (all by default),
+        built here so a failing section raises and is logged from this call.
+        Results are memoized per (content type, audience, platform, ISO week,
+        seed), plus the month when the monthly overview is included, and
+        every section draws from its own seeded generator, so repeated calls
+        within a week return the same schedule. Callers get their own copy
+        of the memoized sections.
+        """
+
         try:
-            print(f"Generating schedule for: {content_type}, {target_audience}, {platform}")
-            
-            # Get engagement patterns (case-insensitive)
-            audience_lower = target_audience.lower()
-            patterns = self.engagement_patterns.get(
-                audience_lower, 
-                self.engagement_patterns['general']
-            )
-            print(f"Using patterns for: {audience_lower}")
-            
-            # Get platform data (case-insensitive)
-            platform_lower = platform.lower()
-            platform_info = self.platform_data.get(
-                platform_lower, 
-                self.platform_data['website']
-            )
-            print(f"Using platform: {platform_lower}")
-            
-            # Generate weekly schedule
-            weekly_schedule = self._generate_weekly_schedule(patterns, platform_info)
-            print(f"Generated weekly schedule with {len(weekly_schedule)} days")
-            
-            # Generate monthly calendar
-            monthly_calendar = self._generate_monthly_calendar(patterns, platform_info)
-            print(f"Generated monthly calendar")
-            
-            # Generate recommendations
-            recommendations = self._generate_schedule_recommendations(
-                patterns, platform_info, content_type
-            )
-            print(f"Generated {len(recommendations)} recommendations")
-            
-            # Get optimal times
-            optimal_times = self._get_optimal_posting_times(patterns)
-            print(f"Generated {len(optimal_times)} optimal times")
-            
-            # Calculate expected impact
-            impact = self._calculate_expected_impact(patterns, weekly_schedule)
-            print(f"Calculated expected impact")
-            
-            result = {
-                'weekly_schedule': weekly_schedule,
-                'monthly_overview': monthly_calendar,
-                'optimal_times': optimal_times,
-                'recommendations': recommendations,
-                'expected_impact': impact,
-                'platform_insights': platform_info
-            }
-            
-            print("Schedule generation completed successfully")
-            return result
-            
-        except Exception as e:
-            print(f"Error in generate_schedule: {str(e)}")
-            import traceback
-            traceback.print_exc()
+            return copy.deepcopy(self.schedule_sections(
+                content_type, target_audience, platform, fields=fields, seed=seed
+            ).to_dict())
+
+        except Exception:
+            logger.exception("Error in generate_schedule")
             raise
-    
-    def _generate_weekly_schedule(self, patterns: Dict, platform_info: Dict) -> List[Dict]:
+
+    def schedule_sections(self, content_type: str, target_audience: str,
+                          platform: str = "website",
+                          fields: Optional[Iterable[str]] = None,
+                          seed: int = 0) -> LazySchedule:
+        """Lazy view of the memoized schedule behind generate_schedule.
+
+        Sections are built on first access, so errors surface when a section
+        is read rather than here. They are the cached objects themselves and
+        must not be mutated.
+        """
+        fields = SCHEDULE_FIELDS if fields is None else tuple(fields)
+        unknown = set(fields) - set(SCHEDULE_FIELDS)
+        if unknown:
+            raise ValueError(f"Unknown schedule fields: {', '.join(sorted(unknown))}")
+
+        audience, platform_key = self._resolve_keys(target_audience, platform)
+        week_key = (content_type.lower(), audience, platform_key, *self.current_week(), seed)
+        # A week can span two months; the monthly overview follows the month,
+        # while the other sections (and their seeds) stay fixed for the week
+        key = week_key
+        if 'monthly_overview' in fields:
+            key = week_key + self.current_month()
+
+        schedule = self.schedule_cache.get_or_compute(
+            key, lambda: self._build_schedule(week_key, content_type, audience, platform_key)
+        )
+        return schedule.select(fields)
+
+    def _build_schedule(self, key: Tuple, content_type: str, audience: str,
+                        platform: str) -> 'LazySchedule':
+        logger.debug("Generating schedule for: %s, %s, %s", content_type, audience, platform)
+
+        patterns = self.engagement_patterns[audience]
+        platform_info = self.platform_data[platform]
+
+        def rng(section: str) -> random.Random:
+            return random.Random('|'.join(map(str, (*key, section))))
+
+        builders = {
+            'weekly_schedule': lambda schedule: self._generate_weekly_schedule(
+                patterns, platform_info, rng('weekly_schedule')
+            ),
+            'monthly_overview': lambda schedule: self._generate_monthly_calendar(
+                patterns, platform_info
+            ),
+            'optimal_times': lambda schedule: self._get_optimal_posting_times(
+                patterns, rng('optimal_times')
+            ),
+            'recommendations': lambda schedule: self._generate_schedule_recommendations(
+                patterns, platform_info, content_type
+            ),
+            'expected_impact': lambda schedule: self._calculate_expected_impact(
+                patterns, schedule.section('weekly_schedule'), rng('expected_impact')
+            ),
+            'platform_insights': lambda schedule: platform_info
+        }
+
+        return LazySchedule(builders)
+
+    def _generate_weekly_schedule(self, patterns: Dict, platform_info: Dict,
+                                  rng: Optional[random.Random] = None) -> List[Dict]:
         """Generate weekly posting schedule"""
         
         try:
+            rng = rng or random
             schedule = []
             days = ['Monday', 'Tuesday', 'Wednesday', 'Thursday', 'Friday', 'Saturday', 'Sunday']
             
@@ -159,16 +361,16 @@ class ScheduleOptimizer:
                     'posts': []
                 }
                 
-                # Generate posts for the day
+                # Generate posts for the day, one per distinct hour
                 peak_hours = patterns['peak_hours']
-                for i in range(num_posts):
-                    if is_peak_day and peak_hours:
-                        hour = peak_hours[i % len(peak_hours)]
-                    else:
-                        hour = random.choice(range(9, 18))
-                    
+                if is_peak_day and peak_hours:
+                    hours = list(dict.fromkeys(peak_hours + list(range(9, 18))))[:num_posts]
+                else:
+                    hours = rng.sample(range(9, 18), min(num_posts, 9))
+
+                for hour in hours:
                     engagement_score = self._calculate_engagement_score(
-                        day_idx, hour, patterns
+                        day_idx, hour, patterns, rng
                     )
                     
                     post = {
@@ -189,7 +391,7 @@ class ScheduleOptimizer:
             return schedule
             
         except Exception as e:
-            print(f"Error in _generate_weekly_schedule: {str(e)}")
+            logger.error("Error in _generate_weekly_schedule: %s", e)
             raise
     
     def _generate_monthly_calendar(self, patterns: Dict, platform_info: Dict) -> Dict:
@@ -226,14 +428,16 @@ class ScheduleOptimizer:
             }
             
         except Exception as e:
-            print(f"Error in _generate_monthly_calendar: {str(e)}")
+            logger.error("Error in _generate_monthly_calendar: %s", e)
             raise
     
     def _calculate_engagement_score(self, day_idx: int, hour: int, 
-                                   patterns: Dict) -> float:
+                                   patterns: Dict,
+                                   rng: Optional[random.Random] = None) -> float:
         """Calculate engagement score for specific time"""
         
         try:
+            rng = rng or random
             score = 50.0  # Base score
             
             # Day score
@@ -245,7 +449,7 @@ class ScheduleOptimizer:
                 score += 25
             
             # Add some variance
-            score += random.uniform(-3, 3)
+            score += rng.uniform(-3, 3)
             
             # Apply engagement multiplier
             multiplier = patterns.get('engagement_multiplier', 1.0)
@@ -257,7 +461,7 @@ class ScheduleOptimizer:
             return score
             
         except Exception as e:
-            print(f"Error in _calculate_engagement_score: {str(e)}")
+            logger.error("Error in _calculate_engagement_score: %s", e)
             return 50.0
     
     def _estimate_reach(self, engagement_score: float) -> str:
@@ -270,10 +474,12 @@ class ScheduleOptimizer:
         else:
             return "Low (500-2K)"
     
-    def _get_optimal_posting_times(self, patterns: Dict) -> List[Dict]:
+    def _get_optimal_posting_times(self, patterns: Dict,
+                                   rng: Optional[random.Random] = None) -> List[Dict]:
         """Get list of optimal posting times"""
         
         try:
+            rng = rng or random
             times = []
             days = ['Monday', 'Tuesday', 'Wednesday', 'Thursday', 'Friday', 'Saturday', 'Sunday']
             
@@ -285,7 +491,7 @@ class ScheduleOptimizer:
                     times.append({
                         'day': days[day_idx],
                         'time': f"{hour:02d}:00",
-                        'engagement_potential': random.randint(80, 95)
+                        'engagement_potential': rng.randint(80, 95)
                     })
             
             # Sort by engagement potential
@@ -294,7 +500,7 @@ class ScheduleOptimizer:
             return times[:10]
             
         except Exception as e:
-            print(f"Error in _get_optimal_posting_times: {str(e)}")
+            logger.error("Error in _get_optimal_posting_times: %s", e)
             return []
     
     def _generate_schedule_recommendations(self, patterns: Dict, 
@@ -362,13 +568,15 @@ class ScheduleOptimizer:
             return recommendations
             
         except Exception as e:
-            print(f"Error in _generate_schedule_recommendations: {str(e)}")
+            logger.error("Error in _generate_schedule_recommendations: %s", e)
             return []
     
-    def _calculate_expected_impact(self, patterns: Dict, schedule: List[Dict]) -> Dict:
+    def _calculate_expected_impact(self, patterns: Dict, schedule: List[Dict],
+                                   rng: Optional[random.Random] = None) -> Dict:
         """Calculate expected impact of posting schedule"""
         
         try:
+            rng = rng or random
             total_posts = 0
             total_engagement = 0
             
@@ -382,13 +590,13 @@ class ScheduleOptimizer:
             # Calculate potential reach
             if avg_engagement >= 80:
                 reach_range = "50K-100K"
-                traffic_increase = random.randint(40, 70)
+                traffic_increase = rng.randint(40, 70)
             elif avg_engagement >= 60:
                 reach_range = "20K-50K"
-                traffic_increase = random.randint(25, 45)
+                traffic_increase = rng.randint(25, 45)
             else:
                 reach_range = "5K-20K"
-                traffic_increase = random.randint(10, 30)
+                traffic_increase = rng.randint(10, 30)
             
             compliance = self._calculate_compliance(schedule, patterns)
             
@@ -401,7 +609,7 @@ class ScheduleOptimizer:
             }
             
         except Exception as e:
-            print(f"Error in _calculate_expected_impact: {str(e)}")
+            logger.error("Error in _calculate_expected_impact: %s", e)
             return {
                 'average_engagement_score': 50.0,
                 'estimated_weekly_reach': "Unknown",
@@ -430,7 +638,7 @@ class ScheduleOptimizer:
             return round(compliance, 1)
             
         except Exception as e:
-            print(f"Error in _calculate_compliance: {str(e)}")
+            logger.error("Error in _calculate_compliance: %s", e)
             return 0.0
     
     def is_ready(self) -> bool:
@@ -439,55 +647,189 @@ class ScheduleOptimizer:
                 self.platform_data is not None)
 
     def optimize(self, content_type: str, target_audience: str,
-                 timezone: str = "UTC", num_suggestions: int = 5):
-        """Compatibility wrapper: produce a list of schedule suggestions.
+                 timezone: str = "UTC", num_suggestions: int = 5,
+                 audience_timezones: Optional[Dict[str, float]] = None):
+        """Return the top posting slots for the coming week as suggestion dicts.
 
-        This method adapts older callers that expect an `optimize` method
-        returning a list of suggestion dicts. It uses the internal
-        `generate_schedule` and flattens weekly posts into sorted suggestions.
+        Slots are scored from the precomputed matrix for the audience/platform
+        pair (the content type doubles as the platform, as before), capped at
+        the platform's posts per week. Peak hours are read in each audience
+        member's local time: `audience_timezones` maps zone names (or lists
+        them, equally weighted) to audience shares and defaults to
+        `timezone`. Suggestions are returned as aware datetimes in `timezone`
+        and memoized until the window moves on the next day.
         """
         try:
-            result = self.generate_schedule(content_type, target_audience, platform=content_type)
+            self.sync_outcomes()
+            key = self._resolve_keys(target_audience, content_type)
+            zones = zone_weights(audience_timezones, default=timezone)
+            tz = pytz.timezone(timezone)
+            start_ts = window_start(tz.zone)
 
-            weekly = result.get('weekly_schedule', [])
-            suggestions = []
-            today = datetime.now()
-            day_name_to_idx = {'Monday':0,'Tuesday':1,'Wednesday':2,'Thursday':3,'Friday':4,'Saturday':5,'Sunday':6}
+            cache_key = (*key, self.pattern_versions[key[0]], tz.zone, zones, start_ts, num_suggestions)
+            suggestions = self.suggestion_cache.get_or_compute(
+                cache_key, lambda: self._suggest(key, zones, tz, start_ts, num_suggestions)
+            )
+            return [dict(suggestion) for suggestion in suggestions]
+        except Exception as e:
+            logger.error("Error in optimize wrapper: %s", e)
+            return []
 
-            for day in weekly:
-                day_name = day.get('day')
-                day_idx = day_name_to_idx.get(day_name, None)
-                for post in day.get('posts', []):
-                    time_str = post.get('time', '12:00')
-                    hour = int(time_str.split(':')[0])
+    def _suggest(self, key: Tuple[str, str], zones: Tuple[Tuple[str, float], ...],
+                 tz, start_ts: float, num_suggestions: int) -> List[Dict]:
+        matrix = self.score_matrices[key]
+        posts_per_week = self.platform_data[key[1]].get('posts_per_week', 3)
 
-                    # compute next date for this weekday
-                    if day_idx is None:
-                        scheduled_date = today
-                    else:
-                        days_ahead = (day_idx - today.weekday() + 7) % 7
-                        if days_ahead == 0:
-                            days_ahead = 7
-                        scheduled_date = today + timedelta(days=days_ahead)
-
-                    scheduled_dt = scheduled_date.replace(hour=hour, minute=0, second=0, microsecond=0)
-
-                    suggestions.append({
-                        'datetime': scheduled_dt.isoformat(),
-                        'date': scheduled_dt.strftime('%Y-%m-%d'),
-                        'time': scheduled_dt.strftime('%H:%M'),
-                        'day_of_week': day_name,
-                        'timezone': timezone,
-                        'engagement_score': post.get('engagement_score', 0),
-                        'competition_level': 'medium',
-                        'expected_reach': post.get('expected_reach', ''),
-                        'priority': post.get('engagement_score', 0),
-                        'reasoning': 'Auto-generated suggestion from schedule optimizer.'
-                    })
+        scores = self.fold_scores(matrix, zones, start_ts)
+        output_slots = local_slots(tz.zone, start_ts)
+        days_ahead = (output_slots // 24 - output_slots[0] // 24) % 7
+        top = self._rank_slots(scores, days_ahead)[:min(num_suggestions, posts_per_week)]
 
-            # Sort by priority/engagement and return top N
-            suggestions.sort(key=lambda x: (x.get('priority', 0), x.get('engagement_score', 0)), reverse=True)
-            return suggestions[:num_suggestions]
-        except Exception as e:
-            print(f"Error in optimize wrapper: {e}")
-            return []
\ No newline at end of file
+        suggestions = []
+        for hour_index, score in zip(top.tolist(), np.clip(scores[top], 0, 100).tolist()):
+            scheduled_dt = datetime.fromtimestamp(start_ts + 3600 * hour_index, tz)
+            score = round(score, 1)
+
+            suggestions.append({
+                'datetime': scheduled_dt.isoformat(),
+                'date': scheduled_dt.date().isoformat(),
+                'time': f"{scheduled_dt.hour:02d}:{scheduled_dt.minute:02d}",
+                'day_of_week': DAY_NAMES[scheduled_dt.weekday()],
+                'timezone': tz.zone,
+                'engagement_score': score,
+                'competition_level': 'medium',
+                'expected_reach': self._estimate_reach(score),
+                'priority': score,
+                'reasoning': 'Auto-generated suggestion from schedule optimizer.'
+            })
+
+        return suggestions
+
+    def record_outcome(self, target_audience: str, posted_at: datetime,
+                       engagement_score: float, timezone: str = "UTC"):
+        """Learn from the engagement a published post actually received.
+
+        `posted_at` is read in the audience's `timezone` (naive values are
+        taken to be in it) and `engagement_score` is on a 0-100 scale. The
+        score matrices are that scale times the audience's engagement
+        multiplier, so priors are divided by it before blending and the
+        posterior scaled back. Updates one cell per platform in O(1).
+        """
+        if not isinstance(target_audience, str) or not isinstance(timezone, str):
+            raise ValueError("target_audience and timezone are required")
+        if not 0 <= engagement_score <= 100:
+            raise ValueError("engagement_score must be between 0 and 100")
+
+        audience, _ = self._resolve_keys(target_audience, 'website')
+        tz = pytz.timezone(timezone)
+        local = tz.localize(posted_at) if posted_at.tzinfo is None else posted_at.astimezone(tz)
+        weekday, hour = local.weekday(), local.hour
+        multiplier = self.engagement_patterns[audience].get('engagement_multiplier', 1.0)
+
+        with self._outcome_lock:
+            mean, count = self.learner.record(audience, weekday, hour, engagement_score)
+            for platform in self.platform_data:
+                prior = self.prior_matrices[(audience, platform)][weekday, hour] / multiplier
+                self.score_matrices[(audience, platform)][weekday, hour] = round(
+                    multiplier * self.learner.blend_cell(prior, mean, count), 1
+                )
+            self.pattern_versions[audience] += 1
+
+    def sync_outcomes(self):
+        """Re-blend audiences whose outcomes other workers have recorded"""
+        if self.learner.store is None:
+            return
+
+        with self._outcome_lock:
+            for audience in self.learner.sync():
+                multiplier = self.engagement_patterns[audience].get('engagement_multiplier', 1.0)
+                observed = self.learner.counts[audience] > 0
+                for platform in self.platform_data:
+                    prior = self.prior_matrices[(audience, platform)]
+                    blended = np.round(multiplier * self.learner.blend(audience, prior / multiplier), 1)
+                    # Replaced whole, so scoring threads never see a half-blended matrix
+                    self.score_matrices[(audience, platform)] = np.where(observed, blended, prior)
+                self.pattern_versions[audience] += 1
+
+    def record_outcomes(self, outcomes: Iterable[Dict]) -> int:
+        """Record several outcomes (dicts of record_outcome arguments)"""
+        recorded = 0
+        for outcome in outcomes:
+            self.record_outcome(**outcome)
+            recorded += 1
+        return recorded
+
+    def plan_calendar(self, platforms: List[str], target_audience: str = "general",
+                      timezone: str = "UTC",
+                      audience_timezones: Optional[Dict[str, float]] = None,
+                      existing: Optional[List[Dict]] = None,
+                      min_spacing_hours: int = 2,
+                      daily_caps: Optional[Dict[str, int]] = None,
+                      mode: str = 'greedy') -> List[Optional[datetime]]:
+        """Assign a distinct slot to each post, given by its platform.
+
+        `existing` holds already-queued posts (dicts with 'platform' and an
+        aware or naive 'scheduled_at' datetime) whose slots and spacing are
+        respected. The window starts tomorrow and grows in whole weeks until
+        every post fits at its platform's daily cap, up to MAX_PLAN_DAYS.
+        Platform names are compared case-insensitively. Returns one datetime
+        (in `timezone`) per post, or None for posts that could not be placed.
+        """
+        self.sync_outcomes()
+        zones = zone_weights(audience_timezones, default=timezone)
+        tz = pytz.timezone(timezone)
+        start_ts = window_start(tz.zone)
+        platforms = [platform.lower() for platform in platforms]
+        daily_caps = {platform.lower(): cap for platform, cap in (daily_caps or {}).items()}
+
+        counts: Dict[str, int] = {}
+        for platform in platforms:
+            counts[platform] = counts.get(platform, 0) + 1
+
+        caps = {platform: daily_caps.get(platform, self.daily_cap(platform))
+                for platform in counts}
+        per_day = {platform: min(caps[platform], max(1, 24 // min_spacing_hours))
+                   for platform in counts}
+        days = max(math.ceil(count / per_day[platform]) for platform, count in counts.items()) if counts else 0
+        days = min(MAX_PLAN_DAYS, 7 * max(1, math.ceil(days / 7)))
+        hours = 24 * days
+
+        occupied: Dict[str, List[float]] = {}
+        for post in existing or []:
+            platform = post['platform'].lower()
+            if platform in counts:
+                offset = (post['scheduled_at'].timestamp() - start_ts) / 3600
+                occupied.setdefault(platform, []).append(offset)
+
+        scores = {}
+        for platform in counts:
+            matrix = self.score_matrices[self._resolve_keys(target_audience, platform)]
+            scores[platform] = self.fold_scores(matrix, zones, start_ts, hours)
+
+        solver = CalendarSolver(min_spacing_hours=min_spacing_hours, mode=mode)
+        assignments = solver.solve(counts, scores, caps, occupied)
+
+        remaining = {platform: iter(slots) for platform, slots in assignments.items()}
+        planned = []
+        for platform in platforms:
+            slot = next(remaining[platform], None)
+            planned.append(None if slot is None else datetime.fromtimestamp(start_ts + 3600 * slot, tz))
+        return planned
+
+    async def optimize_async(self, content_type: str, target_audience: str,
+                             timezone: str = "UTC", num_suggestions: int = 5,
+                             audience_timezones: Optional[Dict[str, float]] = None):
+        """Awaitable optimize, run on the shared CPU executor"""
+        return await run_cpu(
+            self.optimize, content_type, target_audience,
+            timezone=timezone, num_suggestions=num_suggestions,
+            audience_timezones=audience_timezones
+        )
+
+    async def plan_calendar_async(self, platforms: List[str], **kwargs) -> List[Optional[datetime]]:
+        """Awaitable plan_calendar, run on the shared CPU executor"""
+        return await run_cpu(self.plan_calendar, platforms, **kwargs)
+
+    async def record_outcomes_async(self, outcomes: List[Dict]) -> int:
+        """Awaitable record_outcomes, run on the shared CPU executor"""
+        return await run_cpu(self.record_outcomes, outcomes)
@@ -0,0 +1,8 @@
+from .publisher import Publisher, LocalPublisher
+from .dispatcher import PostDispatcher
+
+__all__ = [
+    'Publisher',
+    'LocalPublisher',
+    'PostDispatcher'
+]
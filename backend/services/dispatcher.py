@@ -0,0 +1,109 @@
+import asyncio
+import logging
+import time
+from typing import Callable, Optional
+
+from utils.concurrency import run_io
+
+from .publisher import Publisher
+
+logger = logging.getLogger(__name__)
+
+
+class PostDispatcher:
+    """Publishes queued posts when their scheduled time arrives.
+
+    The post store's time index acts as the timer heap: after each batch the
+    dispatcher asks for the earliest queued time and sleeps until then, or
+    until notify() reports a newly scheduled post. Sleeps are capped at
+    `max_idle` seconds so posts added by other workers are picked up too.
+
+    Claims are leases: posts left in 'publishing' for `lease_seconds` (the
+    worker crashed or restarted mid-batch) are claimed and published again,
+    so delivery is at least once. Store calls run on the I/O executor.
+    """
+
+    def __init__(self, store, publisher: Publisher, batch_size: int = 500,
+                 max_idle: float = 30.0, lease_seconds: float = 300.0,
+                 clock: Callable[[], float] = time.time):
+        self.store = store
+        self.publisher = publisher
+        self.batch_size = batch_size
+        self.max_idle = max_idle
+        self.lease_seconds = lease_seconds
+        self.clock = clock
+        self._wake: Optional[asyncio.Event] = None
+        self._task: Optional[asyncio.Task] = None
+
+    @property
+    def running(self) -> bool:
+        return self._task is not None and not self._task.done()
+
+    def start(self):
+        """Start the dispatch loop on the running event loop"""
+        if not self.running:
+            self._wake = asyncio.Event()
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self):
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    def notify(self):
+        """Wake the loop early, e.g. after a post was scheduled"""
+        if self._wake is not None:
+            self._wake.set()
+
+    async def dispatch_due(self) -> int:
+        """Publish one batch of due posts; returns how many were claimed"""
+        posts = await run_io(self.store.claim_due, self.clock(), self.batch_size,
+                             lease_seconds=self.lease_seconds)
+        if not posts:
+            return 0
+
+        claimed_ids = [post['id'] for post in posts]
+        try:
+            published_ids = set(await self.publisher.publish(posts))
+        except Exception as e:
+            logger.error("Publisher failed for %d post(s): %s", len(posts), e)
+            published_ids = set()
+
+        failed_ids = [post_id for post_id in claimed_ids if post_id not in published_ids]
+        await run_io(
+            self.store.update_status_many,
+            [post_id for post_id in claimed_ids if post_id in published_ids], 'published'
+        )
+        await run_io(self.store.update_status_many, failed_ids, 'failed')
+
+        return len(posts)
+
+    async def _seconds_until_next(self) -> float:
+        next_key = await run_io(self.store.next_due_key)
+        if next_key is None:
+            return self.max_idle
+        return min(self.max_idle, max(0.0, next_key - self.clock()))
+
+    async def _run(self):
+        while True:
+            self._wake.clear()
+            try:
+                claimed = await self.dispatch_due()
+                if claimed >= self.batch_size:
+                    # More posts are already due; keep draining
+                    await asyncio.sleep(0)
+                    continue
+                delay = await self._seconds_until_next()
+            except Exception as e:
+                logger.error("Dispatcher error: %s", e)
+                delay = self.max_idle
+
+            if delay > 0:
+                try:
+                    await asyncio.wait_for(self._wake.wait(), timeout=delay)
+                except asyncio.TimeoutError:
+                    pass
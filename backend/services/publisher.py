@@ -0,0 +1,31 @@
+import logging
+from typing import Dict, List
+
+logger = logging.getLogger(__name__)
+
+
+class Publisher:
+    """Interface for sending due posts to their platforms.
+
+    Implementations receive a batch of claimed posts and return the ids that
+    were published; any post not returned is marked as failed.
+    """
+
+    async def publish(self, posts: List[Dict]) -> List[int]:
+        raise NotImplementedError
+
+
+class LocalPublisher(Publisher):
+    """Stand-in publisher that records posts instead of calling platform APIs"""
+
+    def __init__(self, max_history: int = 1000):
+        self.max_history = max_history
+        self.published: List[Dict] = []
+
+    async def publish(self, posts: List[Dict]) -> List[int]:
+        self.published.extend(posts)
+        if len(self.published) > self.max_history:
+            del self.published[:len(self.published) - self.max_history]
+
+        logger.info("Published %d post(s) locally", len(posts))
+        return [post['id'] for post in posts]
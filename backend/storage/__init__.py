@@ -0,0 +1,58 @@
+import os
+from typing import Optional
+
+from .post_store import PostStore
+from .sqlite_store import SQLitePostStore
+from .outcome_store import SQLiteOutcomeStore
+from .rate_limit_store import SQLiteRateLimiter
+from utils.helpers import RateLimiter
+
+__all__ = [
+    'PostStore',
+    'SQLitePostStore',
+    'SQLiteOutcomeStore',
+    'SQLiteRateLimiter',
+    'create_outcome_store',
+    'create_post_store',
+    'create_rate_limiter'
+]
+
+
+def create_post_store(path: Optional[str] = None):
+    """Build the scheduled-post store configured by TRENDWISE_DB_PATH.
+
+    ':memory:' selects the process-local PostStore (handy for tests and
+    single-worker development); any other value is a SQLite database file.
+    """
+    if path is None:
+        path = os.getenv('TRENDWISE_DB_PATH', 'trendwise.db')
+    if path == ':memory:':
+        return PostStore()
+    return SQLitePostStore(path)
+
+
+def create_rate_limiter(path: Optional[str] = None):
+    """Build the rate limiter for the configured database.
+
+    Shares the TRENDWISE_DB_PATH file so every worker enforces one quota;
+    ':memory:' falls back to a per-process RateLimiter.
+    """
+    if path is None:
+        path = os.getenv('TRENDWISE_DB_PATH', 'trendwise.db')
+    if path == ':memory:':
+        return RateLimiter()
+    return SQLiteRateLimiter(path)
+
+
+def create_outcome_store(path: Optional[str] = None):
+    """Build the shared store for learned engagement outcomes.
+
+    Uses the TRENDWISE_DB_PATH file so outcomes survive restarts and every
+    worker learns from all of them; ':memory:' returns None, which keeps
+    them in the process.
+    """
+    if path is None:
+        path = os.getenv('TRENDWISE_DB_PATH', 'trendwise.db')
+    if path == ':memory:':
+        return None
+    return SQLiteOutcomeStore(path)
@@ -0,0 +1,109 @@
+import sqlite3
+import threading
+from typing import Dict, List, Tuple
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS engagement_outcomes (
+    audience TEXT NOT NULL,
+    weekday INTEGER NOT NULL,
+    hour INTEGER NOT NULL,
+    mean REAL NOT NULL,
+    count INTEGER NOT NULL,
+    PRIMARY KEY (audience, weekday, hour)
+) WITHOUT ROWID;
+CREATE TABLE IF NOT EXISTS engagement_outcome_revisions (
+    audience TEXT PRIMARY KEY,
+    revision INTEGER NOT NULL
+) WITHOUT ROWID;
+"""
+
+# Welford's incremental mean in one UPSERT: on the right-hand side every
+# column still holds its old value and `excluded.mean` is the new score
+RECORD = """
+INSERT INTO engagement_outcomes (audience, weekday, hour, mean, count)
+VALUES (?, ?, ?, ?, 1)
+ON CONFLICT (audience, weekday, hour) DO UPDATE SET
+    count = count + 1,
+    mean = mean + (excluded.mean - mean) / (count + 1)
+RETURNING mean, count
+"""
+
+BUMP_REVISION = """
+INSERT INTO engagement_outcome_revisions (audience, revision) VALUES (?, 1)
+ON CONFLICT (audience) DO UPDATE SET revision = revision + 1
+RETURNING revision
+"""
+
+
+class SQLiteOutcomeStore:
+    """Engagement outcome means and counts shared by all workers.
+
+    Holds the OutcomeLearner's per-(audience, weekday, hour) running mean and
+    observation count, so learning survives restarts and every uvicorn worker
+    blends the same observations. Each audience has a revision, bumped in the
+    same transaction as every update, so a worker can tell which audiences
+    other workers have changed without reading their cells.
+    """
+
+    def __init__(self, path: str = "trendwise.db", busy_timeout_ms: int = 5000):
+        self.path = path
+        self.busy_timeout_ms = busy_timeout_ms
+        self._local = threading.local()
+
+        self._connection().executescript(SCHEMA)
+
+    def _connection(self) -> sqlite3.Connection:
+        conn = getattr(self._local, 'conn', None)
+        if conn is None:
+            # Autocommit mode; record() opens an explicit transaction
+            conn = sqlite3.connect(self.path, isolation_level=None)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            conn.execute(f"PRAGMA busy_timeout={int(self.busy_timeout_ms)}")
+            self._local.conn = conn
+        return conn
+
+    def close(self):
+        conn = getattr(self._local, 'conn', None)
+        if conn is not None:
+            conn.close()
+            self._local.conn = None
+
+    def record(self, audience: str, weekday: int, hour: int,
+               score: float) -> Tuple[float, int, int]:
+        """Add one observed score; returns the cell's new (mean, count) and
+        the audience's new revision"""
+        conn = self._connection()
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            mean, count = conn.execute(RECORD, (audience, weekday, hour, score)).fetchone()
+            revision, = conn.execute(BUMP_REVISION, (audience,)).fetchone()
+            conn.execute("COMMIT")
+        except Exception:
+            conn.execute("ROLLBACK")
+            raise
+        return mean, count, revision
+
+    def revisions(self) -> Dict[str, int]:
+        """Current revision of every audience with recorded outcomes"""
+        rows = self._connection().execute(
+            "SELECT audience, revision FROM engagement_outcome_revisions"
+        ).fetchall()
+        return dict(rows)
+
+    def cells(self, audience: str) -> Tuple[int, List[Tuple[int, int, float, int]]]:
+        """An audience's revision and its (weekday, hour, mean, count) cells,
+        read in one snapshot"""
+        conn = self._connection()
+        conn.execute("BEGIN")
+        try:
+            row = conn.execute(
+                "SELECT revision FROM engagement_outcome_revisions WHERE audience = ?", (audience,)
+            ).fetchone()
+            cells = conn.execute(
+                "SELECT weekday, hour, mean, count FROM engagement_outcomes WHERE audience = ?",
+                (audience,)
+            ).fetchall()
+        finally:
+            conn.execute("COMMIT")
+        return (row[0] if row else 0), cells
@@ -0,0 +1,364 @@
+import bisect
+import functools
+import heapq
+import itertools
+import threading
+from collections import defaultdict
+from datetime import datetime
+from typing import Dict, Iterable, Iterator, List, Optional, Set, Tuple
+
+
+def parse_scheduled_time(value: str) -> datetime:
+    """Parse an ISO 8601 timestamp (accepting a trailing 'Z' for UTC)"""
+    return datetime.fromisoformat(value.replace('Z', '+00:00'))
+
+
+def time_key(dt: datetime) -> float:
+    """Sortable key for naive (server-local) and aware datetimes alike"""
+    return dt.timestamp()
+
+
+def _locked(method):
+    """Run a PostStore method under the store's lock"""
+
+    @functools.wraps(method)
+    def wrapper(self, *args, **kwargs):
+        with self._lock:
+            return method(self, *args, **kwargs)
+
+    return wrapper
+
+
+class SortedEntries:
+    """Sorted (time key, id) entries kept in buckets of at most 2 * `load`.
+
+    A bisect over the bucket maxima finds the bucket, so an insert or removal
+    shifts at most one bucket instead of the whole list, while iteration
+    from any entry stays a bisect away.
+    """
+    
+    def __init__(self, load: int = 512):
+        self._load = load
+        self._buckets: List[List[Tuple[float, int]]] = []
+        self._maxes: List[Tuple[float, int]] = []
+        self._size = 0
+    
+    def __len__(self) -> int:
+        return self._size
+    
+    def add(self, entry: Tuple[float, int]):
+        if not self._buckets:
+            self._buckets.append([entry])
+            self._maxes.append(entry)
+            self._size = 1
+            return
+        
+        index = bisect.bisect_left(self._maxes, entry)
+        if index == len(self._buckets):
+            index -= 1
+            bucket = self._buckets[index]
+            bucket.append(entry)
+            self._maxes[index] = entry
+        else:
+            bucket = self._buckets[index]
+            bisect.insort(bucket, entry)
+        self._size += 1
+        
+        if len(bucket) > 2 * self._load:
+            tail = bucket[self._load:]
+            del bucket[self._load:]
+            self._buckets.insert(index + 1, tail)
+            self._maxes[index] = bucket[-1]
+            self._maxes.insert(index + 1, tail[-1])
+    
+    def discard(self, entry: Tuple[float, int]):
+        index = bisect.bisect_left(self._maxes, entry)
+        if index == len(self._buckets):
+            return
+        
+        bucket = self._buckets[index]
+        position = bisect.bisect_left(bucket, entry)
+        if position == len(bucket) or bucket[position] != entry:
+            return
+        
+        del bucket[position]
+        self._size -= 1
+        if not bucket:
+            del self._buckets[index]
+            del self._maxes[index]
+        elif position == len(bucket):
+            self._maxes[index] = bucket[-1]
+    
+    def iter_after(self, entry: Optional[Tuple[float, int]] = None) -> Iterator[Tuple[float, int]]:
+        """Entries greater than `entry` (all of them for None), in order"""
+        index, position = 0, 0
+        if entry is not None:
+            index = bisect.bisect_right(self._maxes, entry)
+            if index < len(self._buckets):
+                position = bisect.bisect_right(self._buckets[index], entry)
+        
+        for bucket_index in range(index, len(self._buckets)):
+            yield from itertools.islice(self._buckets[bucket_index], position, None)
+            position = 0
+
+
+class PostStore:
+    """In-memory scheduled-post store.
+
+    Keeps an id -> post map, a per-status index and a min-heap of queued posts
+    ordered by scheduled time. Heap entries of posts that leave the queue are
+    discarded lazily the next time they reach the top. Claimed posts sit in
+    a second heap ordered by claim time, so expired leases are found without
+    scanning every 'publishing' post.
+
+    For paginated listing, SortedEntries of (time key, id) are kept per
+    status, per platform and per status/platform pair (None meaning "any").
+
+    Routes call the store from the I/O executor, so every public method runs
+    under one re-entrant lock.
+    """
+    
+    def __init__(self):
+        self._posts: Dict[int, Dict] = {}
+        self._scheduled_at: Dict[int, datetime] = {}
+        self._time_keys: Dict[int, float] = {}
+        self._by_status: Dict[str, Set[int]] = defaultdict(set)
+        self._ordered: Dict[Tuple[Optional[str], Optional[str]], SortedEntries] = defaultdict(SortedEntries)
+        self._queue: List[Tuple[float, int]] = []
+        self._claimed_at: Dict[int, float] = {}
+        self._leases: List[Tuple[float, int]] = []
+        self._next_id = 1
+        self._lock = threading.RLock()
+    
+    def _index_keys(self, status: str, platform: str):
+        return ((status, None), (status, platform), (None, None), (None, platform))
+    
+    def _index(self, post_id: int, status: str, platform: str):
+        entry = (self._time_keys[post_id], post_id)
+        for key in self._index_keys(status, platform):
+            self._ordered[key].add(entry)
+    
+    def _unindex(self, post_id: int, status: str, platform: str):
+        entry = (self._time_keys[post_id], post_id)
+        for key in self._index_keys(status, platform)[:2]:
+            self._ordered[key].discard(entry)
+    
+    def _lease(self, post_id: int, claimed_at: float):
+        self._claimed_at[post_id] = claimed_at
+        heapq.heappush(self._leases, (claimed_at, post_id))
+        # Rebuild once dead entries outnumber live ones, in case leases are
+        # never checked (claim_due without a lease_seconds)
+        if len(self._leases) > 2 * len(self._claimed_at) + 64:
+            self._leases = [(claimed, post) for post, claimed in self._claimed_at.items()]
+            heapq.heapify(self._leases)
+    
+    def _lease_is_live(self, entry: Tuple[float, int]) -> bool:
+        claimed_at, post_id = entry
+        post = self._posts.get(post_id)
+        return (post is not None and post['status'] == 'publishing'
+                and self._claimed_at.get(post_id) == claimed_at)
+    
+    def __len__(self) -> int:
+        return len(self._posts)
+    
+    @_locked
+    def add(self, title: str, content: str, platform: str, scheduled_time: str,
+            status: str = "queued") -> Dict:
+        """Store a new post and return it"""
+        scheduled_dt = parse_scheduled_time(scheduled_time)
+        
+        post = {
+            "id": self._next_id,
+            "title": title,
+            "content": content,
+            "platform": platform,
+            "scheduled_time": scheduled_time,
+            "status": status,
+            "created_at": datetime.now().isoformat()
+        }
+        self._next_id += 1
+        
+        self._posts[post['id']] = post
+        self._scheduled_at[post['id']] = scheduled_dt
+        self._time_keys[post['id']] = time_key(scheduled_dt)
+        self._by_status[status].add(post['id'])
+        self._index(post['id'], status, platform)
+        if status == 'queued':
+            heapq.heappush(self._queue, (self._time_keys[post['id']], post['id']))
+        elif status == 'publishing':
+            # Claims of unknown age are treated as long expired
+            self._lease(post['id'], 0.0)
+        
+        return post
+    
+    @_locked
+    def add_many(self, posts: Iterable[Dict]) -> List[Dict]:
+        """Store several posts and return them"""
+        return [
+            self.add(post['title'], post['content'], post['platform'],
+                     post['scheduled_time'], post.get('status', 'queued'))
+            for post in posts
+        ]
+    
+    def get(self, post_id: int) -> Optional[Dict]:
+        return self._posts.get(post_id)
+    
+    def scheduled_at(self, post: Dict) -> datetime:
+        """Parsed scheduled time of a stored post"""
+        return self._scheduled_at[post['id']]
+    
+    @_locked
+    def update_status(self, post_id: int, status: str) -> Optional[Dict]:
+        """Move a post to a new status (e.g. cancelled, published)"""
+        post = self._posts.get(post_id)
+        if post is None:
+            return None
+        
+        if self._move(post, status) and status == 'publishing':
+            self._lease(post_id, 0.0)
+        
+        return post
+    
+    def _move(self, post: Dict, status: str) -> bool:
+        """Re-index a post under a new status; False if it already had it"""
+        previous = post['status']
+        if previous == status:
+            return False
+        
+        post_id = post['id']
+        self._by_status[previous].discard(post_id)
+        self._by_status[status].add(post_id)
+        self._unindex(post_id, previous, post['platform'])
+        entry = (self._time_keys[post_id], post_id)
+        for key in self._index_keys(status, post['platform'])[:2]:
+            self._ordered[key].add(entry)
+        post['status'] = status
+        if status == 'queued':
+            heapq.heappush(self._queue, entry)
+        if previous == 'publishing':
+            # Its lease heap entry is dropped lazily
+            self._claimed_at.pop(post_id, None)
+        return True
+    
+    @_locked
+    def update_status_many(self, post_ids: Iterable[int], status: str) -> int:
+        """Move several posts to a new status"""
+        updated = 0
+        for post_id in post_ids:
+            if self.update_status(post_id, status) is not None:
+                updated += 1
+        return updated
+    
+    @_locked
+    def count(self, status: Optional[str] = None) -> int:
+        if status is None:
+            return len(self._posts)
+        return len(self._by_status.get(status, ()))
+    
+    def _is_live(self, entry: Tuple[float, int]) -> bool:
+        post = self._posts.get(entry[1])
+        return post is not None and post['status'] == 'queued'
+    
+    @_locked
+    def upcoming(self, limit: Optional[int] = None) -> List[Dict]:
+        """Queued posts ordered by scheduled time, soonest first"""
+        if limit is None:
+            queued = self._by_status.get('queued', ())
+            return [
+                self._posts[post_id]
+                for post_id in sorted(queued, key=lambda i: (self._time_keys[i], i))
+            ]
+        
+        live = []
+        seen = set()
+        while self._queue and len(live) < limit:
+            entry = heapq.heappop(self._queue)
+            # Drop stale entries and duplicates left by re-queued posts
+            if self._is_live(entry) and entry[1] not in seen:
+                seen.add(entry[1])
+                live.append(entry)
+        
+        for entry in live:
+            heapq.heappush(self._queue, entry)
+        
+        return [self._posts[post_id] for _, post_id in live]
+    
+    @_locked
+    def query(self, status: Optional[str] = 'queued', platform: Optional[str] = None,
+              start_key: Optional[float] = None, end_key: Optional[float] = None,
+              after: Optional[Tuple[float, int]] = None, limit: int = 50) -> List[Dict]:
+        """Keyset page of posts ordered by (scheduled time, id).
+        
+        `after` is the (time key, id) of the last post on the previous page;
+        `start_key`/`end_key` bound the scheduled time (end exclusive).
+        """
+        ordered = self._ordered.get((status, platform))
+        if ordered is None:
+            return []
+        
+        # Ids start at 1, so (start_key, -1) sorts before every post at start_key
+        lower = after
+        if start_key is not None and (lower is None or (start_key, -1) > lower):
+            lower = (start_key, -1)
+        
+        page = []
+        for key, post_id in itertools.islice(ordered.iter_after(lower), limit):
+            if end_key is not None and key >= end_key:
+                break
+            page.append(self._posts[post_id])
+        return page
+    
+    @_locked
+    def queued_time_keys(self, platform: str, start_key: Optional[float] = None) -> List[float]:
+        """Time keys of every queued post on `platform` (compared
+        case-insensitively) scheduled at or after `start_key`, in order"""
+        platform = platform.lower()
+        keys = []
+        for (status, name), ordered in self._ordered.items():
+            if status != 'queued' or name is None or name.lower() != platform:
+                continue
+            lower = None if start_key is None else (start_key, -1)
+            keys.extend(key for key, _ in ordered.iter_after(lower))
+        keys.sort()
+        return keys
+    
+    def time_key_of(self, post: Dict) -> float:
+        """Sort key of a stored post, used to build pagination cursors"""
+        return self._time_keys[post['id']]
+    
+    @_locked
+    def next_due_key(self) -> Optional[float]:
+        """Time key of the earliest queued post, or None if the queue is empty"""
+        while self._queue and not self._is_live(self._queue[0]):
+            heapq.heappop(self._queue)
+        return self._queue[0][0] if self._queue else None
+    
+    @_locked
+    def claim_due(self, now_key: float, limit: int,
+                  lease_seconds: Optional[float] = None) -> List[Dict]:
+        """Move up to `limit` queued posts due at or before `now_key` to
+        'publishing' and return them, soonest first.
+
+        With a `lease_seconds`, 'publishing' posts claimed longer ago than
+        that are claimed again, oldest claim first.
+        """
+        claimed = []
+        if lease_seconds is not None:
+            expired_key = now_key - lease_seconds
+            while self._leases and len(claimed) < limit and self._leases[0][0] <= expired_key:
+                entry = heapq.heappop(self._leases)
+                # Skip leases of posts that finished or were claimed again
+                if self._lease_is_live(entry):
+                    claimed.append(self._posts[entry[1]])
+
+        while self._queue and len(claimed) < limit and self._queue[0][0] <= now_key:
+            _, post_id = heapq.heappop(self._queue)
+            post = self._posts.get(post_id)
+            if post is not None and post['status'] == 'queued':
+                self._move(post, 'publishing')
+                claimed.append(post)
+
+        for post in claimed:
+            self._lease(post['id'], now_key)
+        claimed.sort(key=lambda post: (self._time_keys[post['id']], post['id']))
+        return claimed
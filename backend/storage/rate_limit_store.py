@@ -0,0 +1,127 @@
+import logging
+import sqlite3
+import threading
+import time
+from typing import Tuple
+
+from utils.helpers import RateLimiter
+
+logger = logging.getLogger(__name__)
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS rate_limits (
+    key TEXT NOT NULL,
+    window_seconds INTEGER NOT NULL,
+    window_index INTEGER NOT NULL,
+    current_count INTEGER NOT NULL,
+    previous_count INTEGER NOT NULL,
+    allowed INTEGER NOT NULL,
+    last_seen REAL NOT NULL,
+    PRIMARY KEY (key, window_seconds)
+) WITHOUT ROWID;
+"""
+
+# Rolls the counters forward to the request's window and counts the request
+# if the sliding estimate is under the limit. On the right-hand side of the
+# UPDATE every column still holds its old value, so the whole check is one
+# atomic statement and no explicit transaction is needed.
+ACQUIRE = """
+INSERT INTO rate_limits (key, window_seconds, window_index, current_count, previous_count, allowed, last_seen)
+VALUES (:key, :window_seconds, :window, :first, 0, :first, :now)
+ON CONFLICT (key, window_seconds) DO UPDATE SET
+    previous_count = {previous},
+    current_count = {current} + ({previous} * (1 - :elapsed) + {current} < :max_requests),
+    allowed = ({previous} * (1 - :elapsed) + {current} < :max_requests),
+    window_index = :window,
+    last_seen = :now
+RETURNING current_count, previous_count, allowed
+""".format(
+    previous="(CASE window_index WHEN :window THEN previous_count WHEN :window - 1 THEN current_count ELSE 0 END)",
+    current="(CASE window_index WHEN :window THEN current_count ELSE 0 END)"
+)
+
+
+class SQLiteRateLimiter(RateLimiter):
+    """RateLimiter whose counters live in a SQLite table shared by all workers.
+
+    Same sliding-window-counter semantics as RateLimiter, but every uvicorn
+    worker on the host reads and updates the same rows, so the quota is
+    enforced once rather than once per process. Each check is a single
+    UPSERT ... RETURNING statement. Counters are disposable, so the
+    connection runs with synchronous=OFF.
+
+    Checks block on the database, so callers on an event loop run them in
+    an executor (see `blocking`). The busy timeout is short and a check that
+    cannot get the write lock in time fails open: the request is allowed
+    rather than held up behind other writers.
+    """
+
+    blocking = True
+
+    def __init__(self, path: str = "trendwise.db", busy_timeout_ms: int = 250,
+                 evict_every: int = 1000, clock=time.time):
+        super().__init__(clock=clock)
+        self.path = path
+        self.busy_timeout_ms = busy_timeout_ms
+        self.evict_every = evict_every
+        self._local = threading.local()
+        self._calls = 0
+
+        self._connection().executescript(SCHEMA)
+
+    def _connection(self) -> sqlite3.Connection:
+        conn = getattr(self._local, 'conn', None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, isolation_level=None)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=OFF")
+            conn.execute(f"PRAGMA busy_timeout={int(self.busy_timeout_ms)}")
+            self._local.conn = conn
+        return conn
+
+    def close(self):
+        conn = getattr(self._local, 'conn', None)
+        if conn is not None:
+            conn.close()
+            self._local.conn = None
+
+    def acquire(self, key: str, max_requests: int = 100,
+                window_seconds: int = 3600) -> Tuple[bool, float]:
+        """Count a request if allowed; returns (allowed, seconds until retry)"""
+        now = self.clock()
+        window = int(now // window_seconds)
+        elapsed = (now - window * window_seconds) / window_seconds
+
+        conn = self._connection()
+        try:
+            current, previous, allowed = conn.execute(ACQUIRE, {
+                "key": key,
+                "window_seconds": window_seconds,
+                "window": window,
+                "first": int(max_requests > 0),
+                "now": now,
+                "elapsed": elapsed,
+                "max_requests": max_requests
+            }).fetchone()
+        except sqlite3.OperationalError as e:
+            logger.warning("Rate limit check for %s failed open: %s", key, e)
+            return True, 0.0
+
+        # Housekeeping never changes the verdict of the counted request
+        self._calls += 1
+        if self._calls % self.evict_every == 0:
+            try:
+                self.evict_idle(now)
+            except sqlite3.OperationalError as e:
+                logger.warning("Rate limit eviction failed: %s", e)
+
+        if allowed:
+            return True, 0.0
+        return False, self._retry_after(current, previous, elapsed, max_requests, window_seconds)
+
+    def evict_idle(self, now: float = None):
+        """Delete counters idle for two of their windows"""
+        now = self.clock() if now is None else now
+        self._connection().execute(
+            "DELETE FROM rate_limits WHERE last_seen < ? - 2 * window_seconds", (now,)
+        )
@@ -0,0 +1,284 @@
+import sqlite3
+import threading
+from datetime import datetime
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from .post_store import parse_scheduled_time, time_key
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS scheduled_posts (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    title TEXT NOT NULL,
+    content TEXT NOT NULL,
+    platform TEXT NOT NULL,
+    scheduled_time TEXT NOT NULL,
+    scheduled_ts REAL NOT NULL,
+    status TEXT NOT NULL,
+    created_at TEXT NOT NULL,
+    claimed_at REAL
+);
+CREATE INDEX IF NOT EXISTS idx_posts_status_time
+    ON scheduled_posts (status, scheduled_ts, id);
+CREATE INDEX IF NOT EXISTS idx_posts_platform
+    ON scheduled_posts (platform);
+CREATE INDEX IF NOT EXISTS idx_posts_status_platform_time
+    ON scheduled_posts (status, platform, scheduled_ts, id);
+CREATE INDEX IF NOT EXISTS idx_posts_status_lower_platform_time
+    ON scheduled_posts (status, lower(platform), scheduled_ts);
+"""
+
+COLUMNS = "id, title, content, platform, scheduled_time, status, created_at"
+
+
+class SQLitePostStore:
+    """Durable scheduled-post store backed by SQLite in WAL mode.
+
+    Same interface as PostStore. Each thread gets its own connection and every
+    uvicorn worker opens the same database file, so all workers share one
+    queue; ids come from AUTOINCREMENT and are allocated atomically by SQLite.
+    """
+
+    def __init__(self, path: str = "trendwise.db", busy_timeout_ms: int = 5000):
+        self.path = path
+        self.busy_timeout_ms = busy_timeout_ms
+        self._local = threading.local()
+
+        conn = self._connection()
+        conn.executescript(SCHEMA)
+        self._migrate(conn)
+
+    @staticmethod
+    def _migrate(conn: sqlite3.Connection):
+        """Add columns introduced after a database file was created"""
+        columns = {row['name'] for row in conn.execute("PRAGMA table_info(scheduled_posts)")}
+        if 'claimed_at' not in columns:
+            conn.execute("BEGIN IMMEDIATE")
+            try:
+                conn.execute("ALTER TABLE scheduled_posts ADD COLUMN claimed_at REAL")
+                # Claims of unknown age are treated as long expired
+                conn.execute("UPDATE scheduled_posts SET claimed_at = 0 WHERE status = 'publishing'")
+                conn.execute("COMMIT")
+            except Exception:
+                conn.execute("ROLLBACK")
+                raise
+
+    def _connection(self) -> sqlite3.Connection:
+        conn = getattr(self._local, 'conn', None)
+        if conn is None:
+            # Autocommit mode; write paths open explicit transactions
+            conn = sqlite3.connect(self.path, isolation_level=None)
+            conn.row_factory = sqlite3.Row
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            conn.execute(f"PRAGMA busy_timeout={int(self.busy_timeout_ms)}")
+            self._local.conn = conn
+        return conn
+
+    def close(self):
+        conn = getattr(self._local, 'conn', None)
+        if conn is not None:
+            conn.close()
+            self._local.conn = None
+
+    def __len__(self) -> int:
+        return self.count()
+
+    @staticmethod
+    def _row_to_post(row: sqlite3.Row) -> Dict:
+        return {key: row[key] for key in row.keys()}
+
+    def add(self, title: str, content: str, platform: str, scheduled_time: str,
+            status: str = "queued") -> Dict:
+        """Store a new post and return it"""
+        return self.add_many([{
+            "title": title,
+            "content": content,
+            "platform": platform,
+            "scheduled_time": scheduled_time,
+            "status": status
+        }])[0]
+
+    def add_many(self, posts: Iterable[Dict]) -> List[Dict]:
+        """Insert several posts in a single transaction"""
+        rows = []
+        created_at = datetime.now().isoformat()
+        for post in posts:
+            scheduled_dt = parse_scheduled_time(post['scheduled_time'])
+            rows.append((
+                post['title'], post['content'], post['platform'],
+                post['scheduled_time'], time_key(scheduled_dt),
+                post.get('status', 'queued'), created_at
+            ))
+
+        conn = self._connection()
+        stored = []
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            for row in rows:
+                cursor = conn.execute(
+                    "INSERT INTO scheduled_posts (title, content, platform, scheduled_time, "
+                    "scheduled_ts, status, created_at) VALUES (?, ?, ?, ?, ?, ?, ?)",
+                    row
+                )
+                stored.append({
+                    "id": cursor.lastrowid,
+                    "title": row[0],
+                    "content": row[1],
+                    "platform": row[2],
+                    "scheduled_time": row[3],
+                    "status": row[5],
+                    "created_at": row[6]
+                })
+            conn.execute("COMMIT")
+        except Exception:
+            conn.execute("ROLLBACK")
+            raise
+
+        return stored
+
+    def get(self, post_id: int) -> Optional[Dict]:
+        row = self._connection().execute(
+            f"SELECT {COLUMNS} FROM scheduled_posts WHERE id = ?", (post_id,)
+        ).fetchone()
+        return self._row_to_post(row) if row else None
+
+    def scheduled_at(self, post: Dict) -> datetime:
+        """Parsed scheduled time of a stored post"""
+        return parse_scheduled_time(post['scheduled_time'])
+
+    def update_status(self, post_id: int, status: str) -> Optional[Dict]:
+        """Move a post to a new status (e.g. cancelled, published)"""
+        self.update_status_many([post_id], status)
+        return self.get(post_id)
+
+    def update_status_many(self, post_ids: Iterable[int], status: str) -> int:
+        """Move several posts to a new status in one transaction"""
+        ids = [(status, post_id) for post_id in post_ids]
+        if not ids:
+            return 0
+
+        conn = self._connection()
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            cursor = conn.executemany(
+                "UPDATE scheduled_posts SET status = ? WHERE id = ?", ids
+            )
+            conn.execute("COMMIT")
+        except Exception:
+            conn.execute("ROLLBACK")
+            raise
+
+        return cursor.rowcount
+
+    def count(self, status: Optional[str] = None) -> int:
+        conn = self._connection()
+        if status is None:
+            row = conn.execute("SELECT COUNT(*) FROM scheduled_posts").fetchone()
+        else:
+            row = conn.execute(
+                "SELECT COUNT(*) FROM scheduled_posts WHERE status = ?", (status,)
+            ).fetchone()
+        return row[0]
+
+    def upcoming(self, limit: Optional[int] = None) -> List[Dict]:
+        """Queued posts ordered by scheduled time, soonest first"""
+        query = (
+            f"SELECT {COLUMNS} FROM scheduled_posts WHERE status = 'queued' "
+            "ORDER BY scheduled_ts, id"
+        )
+        params = ()
+        if limit is not None:
+            query += " LIMIT ?"
+            params = (limit,)
+
+        rows = self._connection().execute(query, params).fetchall()
+        return [self._row_to_post(row) for row in rows]
+
+    def query(self, status: Optional[str] = 'queued', platform: Optional[str] = None,
+              start_key: Optional[float] = None, end_key: Optional[float] = None,
+              after: Optional[Tuple[float, int]] = None, limit: int = 50) -> List[Dict]:
+        """Keyset page of posts ordered by (scheduled time, id).
+
+        `after` is the (time key, id) of the last post on the previous page;
+        `start_key`/`end_key` bound the scheduled time (end exclusive).
+        """
+        conditions = []
+        params = []
+        if status is not None:
+            conditions.append("status = ?")
+            params.append(status)
+        if platform is not None:
+            conditions.append("platform = ?")
+            params.append(platform)
+        if start_key is not None:
+            conditions.append("scheduled_ts >= ?")
+            params.append(start_key)
+        if end_key is not None:
+            conditions.append("scheduled_ts < ?")
+            params.append(end_key)
+        if after is not None:
+            conditions.append("(scheduled_ts, id) > (?, ?)")
+            params.extend(after)
+
+        where = f"WHERE {' AND '.join(conditions)} " if conditions else ""
+        rows = self._connection().execute(
+            f"SELECT {COLUMNS} FROM scheduled_posts {where}"
+            "ORDER BY scheduled_ts, id LIMIT ?",
+            (*params, limit)
+        ).fetchall()
+        return [self._row_to_post(row) for row in rows]
+
+    def queued_time_keys(self, platform: str, start_key: Optional[float] = None) -> List[float]:
+        """Time keys of every queued post on `platform` (compared
+        case-insensitively) scheduled at or after `start_key`, in order"""
+        rows = self._connection().execute(
+            "SELECT scheduled_ts FROM scheduled_posts "
+            "WHERE status = 'queued' AND lower(platform) = ? AND scheduled_ts >= ? "
+            "ORDER BY scheduled_ts",
+            (platform.lower(), float('-inf') if start_key is None else start_key)
+        ).fetchall()
+        return [row[0] for row in rows]
+
+    def time_key_of(self, post: Dict) -> float:
+        """Sort key of a stored post, used to build pagination cursors"""
+        return time_key(parse_scheduled_time(post['scheduled_time']))
+
+    def next_due_key(self) -> Optional[float]:
+        """Time key of the earliest queued post, or None if the queue is empty"""
+        row = self._connection().execute(
+            "SELECT MIN(scheduled_ts) FROM scheduled_posts WHERE status = 'queued'"
+        ).fetchone()
+        return row[0]
+
+    def claim_due(self, now_key: float, limit: int,
+                  lease_seconds: Optional[float] = None) -> List[Dict]:
+        """Move up to `limit` queued posts due at or before `now_key` to
+        'publishing' and return them, soonest first.
+
+        A single UPDATE ... RETURNING statement, so two workers can never
+        claim the same post. Each claim is stamped with `now_key`; with a
+        `lease_seconds`, 'publishing' posts claimed longer ago than that
+        (their worker died before recording the outcome) are claimed again.
+        """
+        expired_key = now_key - lease_seconds if lease_seconds is not None else None
+        conn = self._connection()
+        rows = conn.execute(
+            f"UPDATE scheduled_posts SET status = 'publishing', claimed_at = ? WHERE id IN ("
+            "SELECT id FROM ("
+            "SELECT id, scheduled_ts FROM scheduled_posts "
+            "WHERE status = 'queued' AND scheduled_ts <= ? "
+            "UNION ALL "
+            "SELECT id, scheduled_ts FROM scheduled_posts "
+            "WHERE status = 'publishing' AND claimed_at <= ?"
+            ") ORDER BY scheduled_ts, id LIMIT ?"
+            f") RETURNING {COLUMNS}, scheduled_ts",
+            (now_key, now_key, expired_key, limit)
+        ).fetchall()
+
+        rows.sort(key=lambda row: (row['scheduled_ts'], row['id']))
+        posts = []
+        for row in rows:
+            post = self._row_to_post(row)
+            del post['scheduled_ts']
+            posts.append(post)
+        return posts
@@ -0,0 +1,156 @@
+import os
+from datetime import datetime
+
+os.environ.setdefault("TRENDWISE_DB_PATH", ":memory:")
+os.environ.setdefault("TRENDWISE_DISPATCHER_ENABLED", "0")
+
+import pytest
+from fastapi.testclient import TestClient
+
+import main
+from utils.helpers import encode_cursor
+
+
+@pytest.fixture(scope="module")
+def client():
+    with TestClient(main.app) as test_client:
+        yield test_client
+
+
+def test_scheduled_posts_are_paginated(client):
+    for hour in range(5):
+        response = client.post("/api/schedule-post", json={
+            "title": f"post-{hour}",
+            "content": "",
+            "platform": "Twitter" if hour % 2 else "LinkedIn",
+            "scheduled_time": f"2031-03-01T1{hour}:00:00"
+        })
+        assert response.status_code == 200
+
+    first = client.get("/api/scheduled-posts", params={"limit": 2}).json()
+    second = client.get("/api/scheduled-posts", params={"limit": 2, "cursor": first["next_cursor"]}).json()
+    twitter = client.get("/api/scheduled-posts", params={"platform": "Twitter"}).json()
+
+    assert [p["title"] for p in first["posts"]] == ["post-0", "post-1"]
+    assert first["has_more"]
+    assert [p["title"] for p in second["posts"]] == ["post-2", "post-3"]
+    assert [p["title"] for p in twitter["posts"]] == ["post-1", "post-3"]
+    assert not twitter["has_more"]
+
+
+def test_invalid_cursor_is_rejected(client):
+    response = client.get("/api/scheduled-posts", params={"cursor": "not-a-cursor"})
+    wrong_types = client.get("/api/scheduled-posts", params={"cursor": encode_cursor("x", "y")})
+    bad_offset = client.get("/api/trending-topics", params={"cursor": encode_cursor("x")})
+
+    assert response.status_code == 400
+    assert wrong_types.status_code == 400
+    assert bad_offset.status_code == 400
+
+
+def test_trending_topics_pagination(client, monkeypatch):
+    topics = [
+        {"topic": f"topic-{i}", "trend_score": 100 - i, "growth": 10,
+         "category": "Trending" if i % 2 else "Hot", "source": "reddit"}
+        for i in range(5)
+    ]
+
+    async def fake_topics():
+        return topics
+
+    monkeypatch.setattr(main.keyword_predictor, "get_trending_topics_async", fake_topics)
+
+    first = client.get("/api/trending-topics", params={"limit": 2}).json()
+    second = client.get("/api/trending-topics", params={"limit": 2, "cursor": first["next_cursor"]}).json()
+    hot = client.get("/api/trending-topics", params={"category": "hot"}).json()
+
+    assert [t["topic"] for t in first["topics"]] == ["topic-0", "topic-1"]
+    assert [t["topic"] for t in second["topics"]] == ["topic-2", "topic-3"]
+    assert [t["topic"] for t in hot["topics"]] == ["topic-0", "topic-2", "topic-4"]
+
+
+def test_posting_insights_for_distributed_audience(client):
+    response = client.get("/api/posting-insights", params={
+        "target_audience": "business",
+        "timezone": "Europe/London",
+        "audience_timezones": "America/New_York:0.7,Europe/London:0.3"
+    })
+    invalid = client.get("/api/posting-insights", params={"audience_timezones": "Nowhere/City"})
+
+    assert response.status_code == 200
+    assert response.json()["best_days"]
+    assert invalid.status_code == 400
+
+
+def test_schedule_batch_places_posts_without_collisions(client):
+    posts = [{"title": f"batch-{i}", "content": "", "platform": "Instagram"} for i in range(6)]
+    response = client.post("/api/schedule-batch", json={
+        "posts": posts, "target_audience": "lifestyle", "min_spacing_hours": 3
+    })
+    body = response.json()
+
+    assert response.status_code == 200
+    assert len(body["scheduled"]) == 6 and not body["unscheduled"]
+    times = sorted(datetime.fromisoformat(p["scheduled_time"]) for p in body["scheduled"])
+    assert all((b - a).total_seconds() >= 3 * 3600 for a, b in zip(times, times[1:]))
+
+    bad_mode = client.post("/api/schedule-batch", json={"posts": posts, "mode": "random"})
+    null_spacing = client.post("/api/schedule-batch", json={"posts": posts, "min_spacing_hours": None})
+    too_many = client.post("/api/schedule-batch", json={
+        "posts": posts * 100, "mode": "exact", "dry_run": True
+    })
+    assert bad_mode.status_code == 422
+    assert null_spacing.status_code == 422
+    assert too_many.status_code == 400
+
+
+def test_engagement_outcomes_are_recorded(client):
+    before = main.schedule_optimizer.learner.observations("education")
+    response = client.post("/api/engagement-outcomes", json={"outcomes": [
+        {"target_audience": "education", "posted_at": "2031-03-04T09:00:00Z", "engagement_score": 72},
+        {"target_audience": "education", "posted_at": "2031-03-04T10:00:00Z", "engagement_score": 140},
+        {"target_audience": "education", "engagement_score": 50},
+        {"target_audience": None, "posted_at": "2031-03-04T11:00:00Z", "engagement_score": 60},
+        {"timezone": None, "posted_at": "2031-03-04T12:00:00Z", "engagement_score": 60}
+    ]})
+    body = response.json()
+
+    assert response.status_code == 200
+    assert body["recorded"] == 1
+    assert [r["index"] for r in body["rejected"]] == [1, 2, 3, 4]
+    assert main.schedule_optimizer.learner.observations("education") == before + 1
+
+
+def test_metrics_endpoint(client):
+    client.get("/api/scheduled-posts", params={"limit": 1})
+    client.put("/api/scheduled-posts/999999", params={"action": "cancel"})
+
+    response = client.get("/metrics")
+
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("text/plain; version=0.0.4")
+    text = response.text
+    assert 'route="/api/scheduled-posts",status="200"' in text
+    assert 'route="/api/scheduled-posts/{post_id}"' in text
+    assert "trendwise_cache_hit_ratio" in text
+    assert "trendwise_cpu_executor_queue_depth" in text
+
+
+def test_generate_content_reports_stage_timings(client, monkeypatch):
+    async def fake_keywords(topic, industry="general", num_keywords=20):
+        return [{"keyword": f"{topic} {i}", "opportunity_score": 90 - i} for i in range(num_keywords)]
+
+    monkeypatch.setattr(main.keyword_predictor, "predict_keywords_async", fake_keywords)
+    body = {"category": "Technology", "topic": "python"}
+
+    plain = client.post("/api/generate-content", json=body)
+    timed = client.post("/api/generate-content", json={**body, "include_timings": True})
+
+    assert plain.status_code == timed.status_code == 200
+    assert "timings" not in plain.json()
+    stages = [entry.split(";")[0] for entry in plain.headers["server-timing"].split(", ")]
+    assert stages == ["keywords", "content", "engagement", "schedule", "total"]
+    timings = timed.json()["timings"]
+    assert list(timings) == stages
+    assert timings["total"] >= sum(timings[stage] for stage in stages[:-1]) - 0.1
+    assert f"total;dur={timings['total']}" in timed.headers["server-timing"]
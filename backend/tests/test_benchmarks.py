@@ -0,0 +1,43 @@
+from benchmarks.cases import build_cases, make_document
+from benchmarks.fixtures import fixture_archive
+from benchmarks.harness import Case, measure, regressions
+
+
+def test_fixture_feeds_cover_every_source():
+    archive = fixture_archive([
+        "https://www.reddit.com/r/all/hot.json?limit=10",
+        "https://hnrss.org/newest?q=python",
+        "https://example.com/"
+    ])
+
+    assert archive.get("https://www.reddit.com/r/all/hot.json?limit=10").json()["data"]["children"]
+    assert b"<item>" in archive.get("https://hnrss.org/newest?q=python").content
+    assert "https://example.com/" not in archive
+
+
+def test_documents_are_deterministic_and_sized():
+    document = make_document(2000)
+
+    assert document == make_document(2000)
+    assert 2000 <= len(document.split()) < 2200
+
+
+def test_every_case_runs():
+    results = [measure(case, min_time=0, min_iterations=1, warmup=0) for case in build_cases()]
+
+    assert {result["name"].split(".")[0] for result in results} == {"keywords", "content", "engagement", "schedule"}
+    for result in results:
+        assert result["iterations"] == 1
+        assert result["ops_per_sec"] > 0
+        assert result["p99_ms"] >= result["p50_ms"] > 0
+        assert result["peak_kib"] > 0
+
+
+def test_regressions_compare_p50_and_memory():
+    result = measure(Case("noop", lambda: sum(range(1000))), min_time=0, min_iterations=3)
+    baseline = [dict(result, p50_ms=result["p50_ms"] / 2), dict(result, name="other")]
+
+    found = regressions([result], baseline, threshold=0.25)
+
+    assert len(found) == 1 and found[0].startswith("noop: p50")
+    assert regressions([result], [result]) == []
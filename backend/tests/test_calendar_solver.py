@@ -0,0 +1,97 @@
+import itertools
+import time
+
+import numpy as np
+import pytest
+
+from models.calendar_solver import CalendarSolver
+
+
+def _is_feasible(slots, spacing, daily_cap, occupied=()):
+    everything = list(slots) + list(occupied)
+    days = np.bincount([slot // 24 for slot in everything], minlength=100)
+    return (
+        all(abs(slot - other) >= spacing
+            for i, slot in enumerate(slots) for j, other in enumerate(everything) if i != j)
+        and all(days[slot // 24] <= daily_cap for slot in slots)
+    )
+
+
+def _brute_force(scores, count, spacing, daily_cap, occupied):
+    for k in range(count, -1, -1):
+        best = None
+        for combo in itertools.combinations(range(len(scores)), k):
+            if _is_feasible(combo, spacing, daily_cap, occupied):
+                total = sum(scores[slot] for slot in combo)
+                if best is None or total > best:
+                    best = total
+        if best is not None:
+            return k, best
+
+
+def test_greedy_respects_spacing_caps_and_queue():
+    scores = np.arange(48, dtype=float)[::-1]
+    solver = CalendarSolver(min_spacing_hours=3)
+
+    slots = solver.solve({"Twitter": 5}, {"Twitter": scores}, {"Twitter": 2}, {"Twitter": [0]})["Twitter"]
+
+    assert len(slots) == 3
+    assert _is_feasible(slots, 3, 2, occupied=[0])
+
+
+def test_exact_matches_brute_force():
+    rng = np.random.default_rng(7)
+    for _ in range(40):
+        hours = int(rng.integers(20, 40))
+        count, spacing, cap = int(rng.integers(1, 4)), int(rng.integers(1, 4)), int(rng.integers(1, 3))
+        scores = np.round(rng.random(hours) * 10)
+        occupied = rng.choice(hours, size=int(rng.integers(0, 3)), replace=False).tolist()
+
+        slots = CalendarSolver(spacing, mode="exact").solve(
+            {"x": count}, {"x": scores}, {"x": cap}, {"x": occupied}
+        )["x"]
+
+        assert _is_feasible(slots, spacing, cap, occupied)
+        assert (len(slots), sum(scores[s] for s in slots)) == _brute_force(scores, count, spacing, cap, occupied)
+
+
+def test_exact_beats_greedy_when_peak_blocks_neighbours():
+    scores = np.array([8.0, 10.0, 8.0] + [0.0] * 21)
+    greedy = CalendarSolver(2).solve({"x": 2}, {"x": scores}, {"x": 2})["x"]
+    exact = CalendarSolver(2, mode="exact").solve({"x": 2}, {"x": scores}, {"x": 2})["x"]
+
+    assert greedy == [1, 3]
+    assert exact == [0, 2]
+
+
+def test_greedy_handles_thousands_of_posts():
+    scores = np.random.default_rng(1).random(24 * 7 * 52)
+    counts = {"Twitter": 2000, "LinkedIn": 1500, "Instagram": 1000}
+
+    started = time.perf_counter()
+    result = CalendarSolver(2).solve(counts, {p: scores for p in counts}, {p: 8 for p in counts})
+    elapsed = time.perf_counter() - started
+
+    assert {p: len(slots) for p, slots in result.items()} == counts
+    assert all(_is_feasible(slots, 2, 8) for slots in result.values())
+    assert elapsed < 1.0
+
+
+def test_rejects_bad_configuration():
+    with pytest.raises(ValueError):
+        CalendarSolver(min_spacing_hours=0)
+    with pytest.raises(ValueError):
+        CalendarSolver(mode="random")
+    with pytest.raises(ValueError):
+        CalendarSolver(mode="exact").solve({"x": CalendarSolver.MAX_EXACT_POSTS + 1},
+                                           {"x": np.zeros(24)}, {"x": 1})
+
+
+def test_queued_posts_off_the_hour_block_both_neighbours():
+    scores = np.zeros(24)
+    scores[12] = 10.0
+    scores[8] = 5.0
+
+    for mode in CalendarSolver.MODES:
+        slots = CalendarSolver(2, mode=mode).solve({"x": 1}, {"x": scores}, {"x": 4}, {"x": [10.5]})["x"]
+        assert slots == [8]
@@ -0,0 +1,95 @@
+import asyncio
+import json
+
+import numpy as np
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from utils.middleware import CompressionMiddleware, negotiate_encoding
+from utils.responses import FastJSONResponse, dumps
+
+
+def _app():
+    app = FastAPI(default_response_class=FastJSONResponse)
+
+    @app.get("/big")
+    async def big():
+        return FastJSONResponse({"words": ["trend"] * 1000, "score": np.float64(0.5)},
+                                headers={"ETag": '"abc"'})
+
+    @app.get("/small")
+    async def small():
+        return {"ok": True}
+
+    app.add_middleware(CompressionMiddleware, minimum_size=500)
+    return app
+
+
+def test_dumps_handles_numpy_and_sets():
+    payload = json.loads(dumps({"a": np.int64(3), "b": np.array([1.5, 2.5]), "c": {1}, 2: np.bool_(True)}))
+
+    assert payload == {"a": 3, "b": [1.5, 2.5], "c": [1], "2": True}
+
+
+def test_negotiation_prefers_brotli_and_honours_q_values():
+    assert negotiate_encoding("gzip, deflate, br") == "br"
+    assert negotiate_encoding("br;q=0.5, gzip") == "gzip"
+    assert negotiate_encoding("identity") is None
+    assert negotiate_encoding("gzip;q=0, *") == "br"
+
+
+def test_large_bodies_are_compressed():
+    client = TestClient(_app())
+
+    br = client.get("/big", headers={"Accept-Encoding": "br"})
+    # httpx decodes the body; content-length is the size on the wire
+    assert br.headers["content-encoding"] == "br"
+    assert br.headers["vary"] == "Accept-Encoding"
+    assert br.headers["etag"] == 'W/"abc"'
+    assert int(br.headers["content-length"]) < len(br.content)
+    assert br.json()["score"] == 0.5
+
+    gz = client.get("/big", headers={"Accept-Encoding": "gzip"})
+    assert gz.headers["content-encoding"] == "gzip"
+    assert gz.json()["words"][0] == "trend"
+
+
+def test_small_or_unnegotiated_bodies_pass_through():
+    client = TestClient(_app())
+
+    assert "content-encoding" not in client.get("/small", headers={"Accept-Encoding": "br"}).headers
+    assert "content-encoding" not in client.get("/big", headers={"Accept-Encoding": "identity"}).headers
+
+
+
+def _stream(content_type):
+    """Raw ASGI app streaming two chunks; records what was sent before the second"""
+    chunk = b"x" * 2000
+    sent, sent_before_last = [], []
+
+    async def app(scope, receive, send):
+        await send({"type": "http.response.start", "status": 200,
+                    "headers": [(b"content-type", content_type)]})
+        await send({"type": "http.response.body", "body": chunk, "more_body": True})
+        sent_before_last.extend(sent)
+        await send({"type": "http.response.body", "body": chunk})
+
+    async def send(message):
+        sent.append(message)
+
+    async def receive():
+        return {"type": "http.request", "body": b""}
+
+    scope = {"type": "http", "path": "/", "headers": [(b"accept-encoding", b"gzip")]}
+    asyncio.run(CompressionMiddleware(app, minimum_size=500)(scope, receive, send))
+    return chunk, sent, sent_before_last
+
+
+def test_streamed_and_binary_responses_are_forwarded_as_produced():
+    for content_type in (b"text/plain", b"image/png"):
+        chunk, sent, sent_before_last = _stream(content_type)
+
+        assert [message.get("body") for message in sent[1:]] == [chunk, chunk]
+        assert b"content-encoding" not in dict(sent[0]["headers"])
+        # Nothing was held back waiting for the end of the stream
+        assert len(sent_before_last) == 2
@@ -0,0 +1,103 @@
+import asyncio
+import sqlite3
+import time
+from datetime import datetime, timedelta
+
+from services import LocalPublisher, PostDispatcher, Publisher
+from storage import PostStore, SQLitePostStore
+
+
+def iso_in(seconds):
+    return (datetime.now() + timedelta(seconds=seconds)).isoformat()
+
+
+def test_dispatch_due_publishes_in_batches():
+    store = PostStore()
+    for i in range(5):
+        store.add(f"due-{i}", "", "Twitter", iso_in(-60 - i))
+    store.add("future", "", "Twitter", iso_in(3600))
+    publisher = LocalPublisher()
+    dispatcher = PostDispatcher(store, publisher, batch_size=3)
+
+    assert asyncio.run(dispatcher.dispatch_due()) == 3
+    assert asyncio.run(dispatcher.dispatch_due()) == 2
+    assert asyncio.run(dispatcher.dispatch_due()) == 0
+
+    assert [p["title"] for p in publisher.published] == [f"due-{i}" for i in (4, 3, 2, 1, 0)]
+    assert store.count("published") == 5
+    assert store.count("queued") == 1
+
+
+def test_failed_posts_are_marked(tmp_path):
+    class FlakyPublisher(Publisher):
+        async def publish(self, posts):
+            return [posts[0]["id"]]
+
+    store = SQLitePostStore(str(tmp_path / "posts.db"))
+    store.add("a", "", "Twitter", iso_in(-10))
+    store.add("b", "", "Twitter", iso_in(-5))
+
+    asyncio.run(PostDispatcher(store, FlakyPublisher()).dispatch_due())
+
+    assert store.get(1)["status"] == "published"
+    assert store.get(2)["status"] == "failed"
+
+
+def test_loop_wakes_when_next_post_is_due():
+    store = PostStore()
+    publisher = LocalPublisher()
+
+    async def scenario():
+        dispatcher = PostDispatcher(store, publisher, max_idle=5.0)
+        dispatcher.start()
+        await asyncio.sleep(0.01)
+
+        store.add("soon", "", "Twitter", iso_in(0.2))
+        dispatcher.notify()
+        started = time.perf_counter()
+        while not publisher.published and time.perf_counter() - started < 2:
+            await asyncio.sleep(0.01)
+
+        await dispatcher.stop()
+        return time.perf_counter() - started
+
+    elapsed = asyncio.run(scenario())
+
+    assert [p["title"] for p in publisher.published] == ["soon"]
+    assert elapsed < 1.0
+
+
+def test_expired_claims_are_published_again(tmp_path):
+    for store in (PostStore(), SQLitePostStore(str(tmp_path / "posts.db"))):
+        store.add("stuck", "", "Twitter", iso_in(-60))
+        now = time.time()
+        # A worker claimed the post, then died before recording the outcome
+        assert [p["title"] for p in store.claim_due(now, 10)] == ["stuck"]
+
+        assert store.claim_due(now + 10, 10, lease_seconds=60) == []
+        publisher = LocalPublisher()
+        dispatcher = PostDispatcher(store, publisher, lease_seconds=60, clock=lambda: now + 120)
+        assert asyncio.run(dispatcher.dispatch_due()) == 1
+
+        assert [p["title"] for p in publisher.published] == ["stuck"]
+        assert store.count("published") == 1
+
+
+def test_old_database_gets_claim_column(tmp_path):
+    path = str(tmp_path / "old.db")
+    conn = sqlite3.connect(path)
+    conn.execute(
+        "CREATE TABLE scheduled_posts (id INTEGER PRIMARY KEY AUTOINCREMENT, title TEXT NOT NULL, "
+        "content TEXT NOT NULL, platform TEXT NOT NULL, scheduled_time TEXT NOT NULL, "
+        "scheduled_ts REAL NOT NULL, status TEXT NOT NULL, created_at TEXT NOT NULL)"
+    )
+    conn.execute(
+        "INSERT INTO scheduled_posts (title, content, platform, scheduled_time, scheduled_ts, "
+        "status, created_at) VALUES ('stuck', '', 'Twitter', '2020-01-01T00:00:00', 0, 'publishing', '')"
+    )
+    conn.commit()
+    conn.close()
+
+    store = SQLitePostStore(path)
+
+    assert [p["title"] for p in store.claim_due(time.time(), 10, lease_seconds=300)] == ["stuck"]
@@ -0,0 +1,47 @@
+from models.engagement_predictor import EngagementPredictor
+
+KEYWORDS = ["ai tools", "machine learning", "automation"]
+DOCUMENTS = [
+    "# AI Tools Guide\n\nAI tools and machine learning help teams automate work. " * 40,
+    "## Automation\n\nShort note about automation.",
+    "",
+]
+
+
+def test_predict_many_matches_predict():
+    predictor = EngagementPredictor()
+
+    batch = predictor.predict_many(DOCUMENTS, KEYWORDS, platform="social_media")
+
+    assert len(batch) == len(DOCUMENTS)
+    for content, result in zip(DOCUMENTS, batch):
+        single = predictor.predict(content, KEYWORDS, platform="social_media")
+        for field in ("seo_score", "readability_score", "keyword_metrics",
+                      "content_metrics", "improvement_suggestions"):
+            assert result[field] == single[field]
+        assert result["engagement_metrics"]["engagement_rate"] == single["engagement_metrics"]["engagement_rate"]
+        assert result["engagement_metrics"]["bounce_rate"] == single["engagement_metrics"]["bounce_rate"]
+
+
+def test_predict_many_ranking_bands():
+    predictor = EngagementPredictor()
+
+    for result in predictor.predict_many(DOCUMENTS, KEYWORDS):
+        assert 1 <= result["predicted_ranking"] < 100
+        assert isinstance(result["predicted_ranking"], int)
+        assert result["estimated_traffic"] >= 100
+
+
+def test_predict_many_empty_batch():
+    assert EngagementPredictor().predict_many([], KEYWORDS) == []
+
+
+def test_placement_bounds_follow_lowercased_offsets():
+    predictor = EngagementPredictor()
+    # 'İ' lowercases to two characters, shifting every later match position
+    title = "İİİİ python"
+    intro = "İ" * 190 + " python guide"
+
+    assert predictor._calculate_placement_score(title + "\nbody", ["python"]) == 70
+    assert predictor._calculate_placement_score("intro\n" + intro, ["python"]) == 0
+    assert predictor._calculate_placement_score("intro\n" + "İ" * 180 + " python", ["python"]) == 30
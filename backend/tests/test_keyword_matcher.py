@@ -0,0 +1,39 @@
+from utils.helpers import ContentValidator
+from utils.keyword_matcher import KeywordMatcher, get_keyword_matcher
+
+
+def test_counts_match_str_count():
+    text = "AI tools and ai-tools: aaaa, ai Tools everywhere"
+    keywords = ["ai tools", "ai", "tools", "aa", "missing"]
+    matches = KeywordMatcher(keywords).scan(text)
+
+    for keyword in keywords:
+        assert matches.count(keyword) == text.lower().count(keyword)
+
+
+def test_positions_include_overlaps():
+    matches = KeywordMatcher(["aa"]).scan("aaaa")
+
+    assert matches.positions("aa") == [(0, 2), (1, 3), (2, 4)]
+    assert matches.count("aa") == 2
+
+
+def test_contains_respects_bounds():
+    matches = KeywordMatcher(["guide"]).scan("# Guide\nthe full guide")
+
+    assert matches.contains("guide", 0, 7)
+    assert not matches.contains("guide", 3, 7)
+    assert matches.contains("guide", 8)
+
+
+def test_shared_matcher_is_reused():
+    assert get_keyword_matcher(["B", "a"]) is get_keyword_matcher(["a", "b"])
+
+
+def test_validator_keyword_presence():
+    ok, _ = ContentValidator.validate_keyword_presence("Python tips", ["python", "tips"])
+    missing, message = ContentValidator.validate_keyword_presence("Python", ["go", "rust"])
+
+    assert ok
+    assert not missing
+    assert "go" in message
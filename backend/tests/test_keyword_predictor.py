@@ -0,0 +1,133 @@
+import asyncio
+import time
+
+import pytest
+
+from models.keyword_predictor import KeywordPredictor
+
+
+class FakeResponse:
+    def __init__(self, status_code=200, content=b"", payload=None):
+        self.status_code = status_code
+        self.content = content
+        self._payload = payload or {}
+
+    def json(self):
+        return self._payload
+
+
+REDDIT_PAYLOAD = {
+    "data": {"children": [
+        {"data": {"title": "Python tooling keeps getting faster", "score": 1200}},
+        {"data": {"title": "Unrelated cooking thread", "score": 50}},
+    ]}
+}
+
+
+@pytest.fixture(scope="module")
+def predictor():
+    return KeywordPredictor()
+
+
+def test_async_sources_are_fetched_concurrently(predictor, monkeypatch):
+    delay = 0.2
+
+    async def slow_get(client, url, headers):
+        await asyncio.sleep(delay)
+        if "reddit" in url:
+            return FakeResponse(payload=REDDIT_PAYLOAD)
+        return FakeResponse(status_code=503)
+
+    monkeypatch.setattr(predictor, "_http_get_async", slow_get)
+    predictor.cache.clear()
+
+    async def scenario():
+        ticks = 0
+
+        async def heartbeat():
+            nonlocal ticks
+            while True:
+                await asyncio.sleep(0.01)
+                ticks += 1
+
+        beat = asyncio.create_task(heartbeat())
+        started = time.perf_counter()
+        keywords = await predictor.predict_keywords_async("python", num_keywords=50)
+        elapsed = time.perf_counter() - started
+        beat.cancel()
+        return keywords, elapsed, ticks
+
+    keywords, elapsed, ticks = asyncio.run(scenario())
+
+    # Five source requests overlap instead of running back to back
+    assert elapsed < delay * 3
+    # The event loop kept running other work while sources were in flight
+    assert ticks >= 5
+    assert any(k["keyword"] == "python" for k in keywords)
+    assert any("reddit" in k["sources"] for k in keywords)
+
+
+def test_async_trending_topics(predictor, monkeypatch):
+    async def fake_get(client, url, headers):
+        if "reddit" in url:
+            return FakeResponse(payload=REDDIT_PAYLOAD)
+        return None
+
+    monkeypatch.setattr(predictor, "_http_get_async", fake_get)
+
+    topics = asyncio.run(predictor.get_trending_topics_async())
+
+    assert [t["source"] for t in topics] == ["reddit", "reddit"]
+    assert topics[0]["trend_score"] == 12
+
+
+def test_source_fetches_are_counted(predictor, monkeypatch):
+    from utils.metrics import SOURCE_FAILURES, SOURCE_FETCH_SECONDS
+
+    async def fake_get(client, url, headers):
+        return FakeResponse(payload=REDDIT_PAYLOAD) if "reddit" in url else None
+
+    monkeypatch.setattr(predictor, "_http_get_async", fake_get)
+    predictor.trending_cache = None
+    fetches = SOURCE_FETCH_SECONDS.count("reddit")
+    failures = SOURCE_FAILURES.value("google_trends")
+    reddit_failures = SOURCE_FAILURES.value("reddit")
+
+    asyncio.run(predictor.get_trending_topics_async())
+
+    assert SOURCE_FETCH_SECONDS.count("reddit") == fetches + 1
+    assert SOURCE_FAILURES.value("google_trends") == failures + 1
+    assert SOURCE_FAILURES.value("reddit") == reddit_failures
+
+
+def test_trending_topics_survive_a_failing_source(monkeypatch):
+    predictor = KeywordPredictor()
+
+    def flaky_get(url, headers):
+        if "reddit" in url:
+            return FakeResponse(payload=REDDIT_PAYLOAD)
+        raise ConnectionError("Google Trends is down")
+
+    monkeypatch.setattr(predictor, "_http_get", flaky_get)
+
+    topics = predictor.get_trending_topics()
+
+    assert [t["source"] for t in topics] == ["reddit", "reddit"]
+
+
+def test_empty_trending_result_expires_quickly(monkeypatch):
+    predictor = KeywordPredictor()
+    calls = []
+
+    def down(url, headers):
+        calls.append(url)
+        raise ConnectionError("offline")
+
+    monkeypatch.setattr(predictor, "_http_get", down)
+    assert predictor.get_trending_topics() == []
+    assert predictor.get_trending_topics() == []
+    assert len(calls) == 2
+
+    predictor.trending_empty_cache_duration = 0
+    predictor.get_trending_topics()
+    assert len(calls) == 4
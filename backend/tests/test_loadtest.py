@@ -0,0 +1,61 @@
+import asyncio
+
+import pytest
+
+from benchmarks.fake_sources import FakeSources, SourceBehaviour, parse_behaviour
+from benchmarks.loadtest import Endpoint, run_load
+from models.keyword_predictor import KeywordPredictor
+
+
+@pytest.fixture(scope="module")
+def sources():
+    with FakeSources({"reddit": SourceBehaviour(latency=0.01)}, seed=1) as server:
+        yield server
+
+
+def test_predictor_reads_from_fake_sources(sources):
+    predictor = KeywordPredictor(source_urls=sources.source_urls)
+    sources.hits.clear()
+
+    keywords = asyncio.run(predictor.predict_keywords_async("python", num_keywords=50))
+
+    assert predictor.source_urls["reddit_hot"].startswith(sources.base_url)
+    assert KeywordPredictor.source_urls["reddit_hot"].startswith("https://www.reddit.com")
+    assert sources.hits == {"google_trends": 1, "reddit": 2, "google_news": 1, "hnrss": 1}
+    assert any("reddit" in keyword["sources"] for keyword in keywords)
+
+
+def test_failure_injection(sources):
+    sources.behaviours["reddit"] = SourceBehaviour(failure_rate=1.0)
+    try:
+        predictor = KeywordPredictor(source_urls=sources.source_urls)
+        keywords = asyncio.run(predictor.predict_keywords_async("python", num_keywords=50))
+    finally:
+        sources.behaviours["reddit"] = SourceBehaviour()
+
+    assert sources.hits["reddit_failed"] >= 2
+    assert not any("reddit" in keyword["sources"] for keyword in keywords)
+
+
+def test_run_load_reports_per_endpoint(sources):
+    endpoints = [
+        Endpoint("reddit", "GET", "/r/all/hot.json"),
+        Endpoint("missing", "GET", "/nowhere", weight=0.5)
+    ]
+
+    report = asyncio.run(run_load(sources.base_url, endpoints, concurrency=4, duration=None, requests=40))
+
+    assert report["total"]["requests"] == 40
+    assert set(report["endpoints"]) == {"reddit", "missing"}
+    assert report["endpoints"]["reddit"]["errors"] == 0
+    assert report["endpoints"]["reddit"]["p50_ms"] >= 10
+    missing = report["endpoints"]["missing"]
+    assert missing["errors"] == missing["requests"] == missing["statuses"]["404"]
+
+
+def test_parse_behaviour():
+    default = SourceBehaviour(latency=0.05)
+
+    assert parse_behaviour("failure_rate=0.2", default) == SourceBehaviour(0.05, 0.0, 0.2)
+    with pytest.raises(ValueError):
+        parse_behaviour("timeout=1")
@@ -0,0 +1,25 @@
+from utils.memo import LRUCache
+
+
+def test_lru_evicts_least_recently_used():
+    cache = LRUCache(max_size=2)
+    cache.put("a", 1)
+    cache.put("b", 2)
+    cache.get("a")
+    cache.put("c", 3)
+
+    assert cache.get("b") is None
+    assert cache.get("a") == 1 and cache.get("c") == 3
+    assert len(cache) == 2
+
+
+def test_get_or_compute_counts_hits():
+    cache = LRUCache()
+    calls = []
+
+    for _ in range(3):
+        cache.get_or_compute("key", lambda: calls.append(1) or "value")
+
+    assert calls == [1]
+    assert (cache.hits, cache.misses) == (2, 1)
+    assert cache.hit_ratio == 2 / 3
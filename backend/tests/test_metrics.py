@@ -0,0 +1,97 @@
+import asyncio
+import threading
+
+import pytest
+
+from utils.concurrency import CPU_WORKERS, cpu_queue_depth, run_cpu
+from utils.memo import LRUCache
+from utils.metrics import CallbackMetric, Counter, Histogram, MetricsRegistry, StageTimer, watch_caches
+
+
+def test_counter_merges_thread_shards():
+    counter = Counter("jobs_total", "Jobs", ("kind",))
+
+    def work():
+        for _ in range(1000):
+            counter.inc("a")
+        counter.inc("b", amount=2)
+
+    threads = [threading.Thread(target=work) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert counter.value("a") == 8000
+    assert counter.collect() == {("a",): 8000, ("b",): 16}
+
+
+def test_histogram_renders_cumulative_buckets():
+    histogram = Histogram("latency_seconds", "Latency", ("route",), buckets=(0.1, 1.0))
+    for value in (0.05, 0.5, 0.5, 3.0):
+        histogram.observe(value, "/x")
+    with histogram.time("/y") as timer:
+        pass
+
+    lines = histogram.render()
+
+    assert 'latency_seconds_bucket{route="/x",le="0.1"} 1' in lines
+    assert 'latency_seconds_bucket{route="/x",le="1"} 3' in lines
+    assert 'latency_seconds_bucket{route="/x",le="+Inf"} 4' in lines
+    assert 'latency_seconds_sum{route="/x"} 4.05' in lines
+    assert 'latency_seconds_count{route="/x"} 4' in lines
+    assert histogram.count("/y") == 1
+    assert timer.elapsed >= 0
+
+    with pytest.raises(ValueError):
+        histogram.observe(0.1)
+
+
+def test_registry_exposition_format():
+    registry = MetricsRegistry()
+    registry.register(CallbackMetric("queue_depth", "Queued jobs", lambda: 3))
+    registry.register(CallbackMetric("skipped", "Unavailable", lambda: None))
+    cache = LRUCache(4)
+    cache.put("k", 1)
+    cache.get("k")
+    cache.get("missing")
+    watch_caches({"lru": cache}, registry=registry)
+
+    text = registry.render()
+
+    assert "# TYPE queue_depth gauge\nqueue_depth 3\n" in text
+    assert "# TYPE skipped gauge\n# HELP" in text
+    assert 'trendwise_cache_hits_total{cache="lru"} 1' in text
+    assert 'trendwise_cache_hit_ratio{cache="lru"} 0.5' in text
+    with pytest.raises(ValueError):
+        registry.register(Counter("queue_depth", "Duplicate"))
+
+
+def test_stage_timer_feeds_histogram_and_header():
+    histogram = Histogram("stage_seconds", "Stages", ("stage",))
+    timer = StageTimer(histogram)
+    with timer.stage("fetch"):
+        pass
+    with timer.stage("render"):
+        pass
+
+    timings = timer.as_dict()
+
+    assert list(timings) == ["fetch", "render", "total"]
+    assert histogram.count("fetch") == histogram.count("render") == 1
+    assert timer.server_timing(timings) == ", ".join(f"{name};dur={ms}" for name, ms in timings.items())
+
+
+def test_cpu_queue_depth_counts_waiting_jobs():
+    release = threading.Event()
+
+    async def scenario():
+        jobs = [asyncio.ensure_future(run_cpu(release.wait)) for _ in range(CPU_WORKERS + 3)]
+        await asyncio.sleep(0.1)
+        depth = cpu_queue_depth()
+        release.set()
+        await asyncio.gather(*jobs)
+        return depth
+
+    assert asyncio.run(scenario()) == 3
+    assert cpu_queue_depth() == 0
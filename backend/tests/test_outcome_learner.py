@@ -0,0 +1,54 @@
+import numpy as np
+
+from models.outcome_learner import OutcomeLearner
+from storage import SQLiteOutcomeStore
+
+
+def test_running_mean_matches_batch_mean():
+    learner = OutcomeLearner(["tech"])
+    scores = np.random.default_rng(3).random(50) * 100
+
+    for score in scores:
+        learner.record("tech", 2, 14, score)
+
+    assert np.isclose(learner.means["tech"][2, 14], scores.mean())
+    assert learner.counts["tech"][2, 14] == 50
+    assert learner.observations("tech") == 50
+
+
+def test_blend_moves_from_prior_to_observations():
+    learner = OutcomeLearner(["tech"], prior_strength=4)
+    prior = np.full((7, 24), 80.0)
+
+    learner.record("tech", 0, 9, 20.0)
+    one = learner.blend("tech", prior)[0, 9]
+    for _ in range(99):
+        learner.record("tech", 0, 9, 20.0)
+    many = learner.blend("tech", prior)[0, 9]
+
+    assert np.isclose(one, (80 * 4 + 20) / 5)
+    assert abs(many - 20) < 3
+    assert learner.blend("tech", prior)[1, 9] == 80.0
+
+
+def test_store_shares_cells_between_learners(tmp_path):
+    path = str(tmp_path / "outcomes.db")
+    writer = OutcomeLearner(["tech"], store=SQLiteOutcomeStore(path))
+    reader = OutcomeLearner(["tech"], store=SQLiteOutcomeStore(path))
+
+    for score in (10.0, 20.0, 60.0):
+        writer.record("tech", 2, 14, score)
+
+    assert writer.sync() == []
+    assert reader.sync() == ["tech"]
+    assert reader.sync() == []
+    assert np.isclose(reader.means["tech"][2, 14], 30.0)
+    assert reader.counts["tech"][2, 14] == 3
+
+    reader.record("tech", 2, 14, 70.0)
+    assert writer.sync() == ["tech"]
+    assert np.isclose(writer.means["tech"][2, 14], 40.0)
+
+    restarted = OutcomeLearner(["tech"], store=SQLiteOutcomeStore(path))
+    restarted.sync()
+    assert restarted.observations("tech") == 4
@@ -0,0 +1,158 @@
+import random
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from storage import SQLitePostStore
+from storage.post_store import PostStore, SortedEntries, parse_scheduled_time, time_key
+
+
+def make_store():
+    store = PostStore()
+    store.add("Third", "c", "Twitter", "2030-01-03T09:00:00")
+    store.add("First", "a", "LinkedIn", "2030-01-01T09:00:00Z")
+    store.add("Second", "b", "Twitter", "2030-01-02T09:00:00")
+    return store
+
+
+def test_ids_and_lookup():
+    store = make_store()
+
+    assert [store.get(i)["title"] for i in (1, 2, 3)] == ["Third", "First", "Second"]
+    assert store.get(99) is None
+    assert store.scheduled_at(store.get(1)).year == 2030
+
+
+def test_upcoming_is_ordered_by_time():
+    store = make_store()
+
+    assert [p["title"] for p in store.upcoming(2)] == ["First", "Second"]
+    assert [p["title"] for p in store.upcoming()] == ["First", "Second", "Third"]
+    # Peeking must not consume the queue
+    assert [p["title"] for p in store.upcoming(3)] == ["First", "Second", "Third"]
+
+
+def test_cancel_updates_indexes():
+    store = make_store()
+
+    store.update_status(2, "cancelled")
+
+    assert store.count("queued") == 2
+    assert store.count("cancelled") == 1
+    assert [p["id"] for p in store.upcoming(5)] == [3, 1]
+
+    store.update_status(2, "queued")
+
+    assert [p["id"] for p in store.upcoming(5)] == [2, 3, 1]
+
+
+@pytest.fixture(params=["memory", "sqlite"])
+def any_store(request, tmp_path):
+    if request.param == "memory":
+        return PostStore()
+    return SQLitePostStore(str(tmp_path / "posts.db"))
+
+
+def test_keyset_pagination_with_filters(any_store):
+    for day in range(1, 11):
+        platform = "Twitter" if day % 2 else "LinkedIn"
+        any_store.add(f"post-{day}", "", platform, f"2030-01-{day:02d}T09:00:00")
+    any_store.update_status(3, "cancelled")
+
+    pages = []
+    after = None
+    while True:
+        page = any_store.query(platform="Twitter", after=after, limit=2)
+        if not page:
+            break
+        pages.append([p["title"] for p in page])
+        after = (any_store.time_key_of(page[-1]), page[-1]["id"])
+
+    assert pages == [["post-1", "post-5"], ["post-7", "post-9"]]
+
+    start = time_key(parse_scheduled_time("2030-01-04T00:00:00"))
+    end = time_key(parse_scheduled_time("2030-01-07T00:00:00"))
+    window = any_store.query(start_key=start, end_key=end, limit=10)
+    assert [p["title"] for p in window] == ["post-4", "post-5", "post-6"]
+
+    everything = any_store.query(status=None, limit=100)
+    assert len(everything) == 10
+    assert [p["title"] for p in any_store.query(status="cancelled")] == ["post-3"]
+
+
+def test_queued_time_keys_ignore_platform_case(any_store):
+    any_store.add("a", "", "Twitter", "2030-01-02T09:00:00")
+    any_store.add("b", "", "twitter", "2030-01-01T09:30:00")
+    any_store.add("c", "", "TWITTER", "2029-12-31T09:00:00")
+    any_store.add("d", "", "LinkedIn", "2030-01-01T12:00:00")
+    any_store.update_status(any_store.add("e", "", "Twitter", "2030-01-03T09:00:00")["id"], "cancelled")
+
+    start = time_key(parse_scheduled_time("2030-01-01T00:00:00"))
+    keys = any_store.queued_time_keys("twitter", start_key=start)
+
+    assert keys == [time_key(parse_scheduled_time(value))
+                    for value in ("2030-01-01T09:30:00", "2030-01-02T09:00:00")]
+    assert len(any_store.queued_time_keys("TWITTER")) == 3
+
+
+def test_concurrent_writers_get_distinct_ids():
+    store = PostStore()
+
+    def add_batch(worker):
+        for i in range(200):
+            store.add(f"{worker}-{i}", "", "Twitter", f"2030-01-01T{i % 24:02d}:00:00")
+
+    with ThreadPoolExecutor(max_workers=8) as pool:
+        list(pool.map(add_batch, range(8)))
+
+    assert len(store) == 1600
+    assert len(store.upcoming()) == 1600
+    assert len({post["id"] for post in store.upcoming()}) == 1600
+
+
+def test_sorted_entries_match_a_sorted_list():
+    rng = random.Random(5)
+    entries = SortedEntries(load=4)
+    expected = []
+
+    for post_id in range(1, 400):
+        entry = (float(rng.randrange(50)), post_id)
+        entries.add(entry)
+        expected.append(entry)
+        if rng.random() < 0.4:
+            gone = expected.pop(rng.randrange(len(expected)))
+            entries.discard(gone)
+            entries.discard(gone)
+    expected.sort()
+
+    assert len(entries) == len(expected)
+    assert list(entries.iter_after()) == expected
+    for probe in [(-1.0, 0), (20.0, -1), expected[57], (99.0, 0)]:
+        assert list(entries.iter_after(probe)) == [entry for entry in expected if entry > probe]
+
+
+def test_finished_claims_release_their_lease():
+    store = PostStore()
+    for hour in range(3):
+        store.add(f"post-{hour}", "", "Twitter", f"2030-01-01T0{hour}:00:00")
+    now = time_key(parse_scheduled_time("2030-01-02T00:00:00"))
+
+    claimed = store.claim_due(now, 10, lease_seconds=60)
+    store.update_status(claimed[0]["id"], "published")
+    store.update_status(claimed[1]["id"], "failed")
+
+    assert list(store._claimed_at) == [claimed[2]["id"]]
+    assert store.claim_due(now + 30, 10, lease_seconds=60) == []
+    assert [p["id"] for p in store.claim_due(now + 61, 10, lease_seconds=60)] == [claimed[2]["id"]]
+    assert len(store._leases) == 1
+
+
+def test_lease_heap_stays_bounded_without_lease_checks():
+    store = PostStore()
+    for i in range(1000):
+        store.add(f"post-{i}", "", "Twitter", "2030-01-01T00:00:00")
+        post = store.claim_due(time_key(parse_scheduled_time("2030-01-02T00:00:00")), 1)[0]
+        store.update_status(post["id"], "published")
+
+    assert not store._claimed_at
+    assert len(store._leases) <= 64
@@ -0,0 +1,84 @@
+import os
+
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from utils.concurrency import run_cpu
+from utils.middleware import ProfilingMiddleware
+from utils.profiling import parse_profile_flag
+
+
+def crunch_numbers():
+    total = 0
+    for i in range(300000):
+        total += i * i
+    return total
+
+
+def _client(tmp_path, max_files=50):
+    app = FastAPI()
+
+    @app.get("/work")
+    async def work():
+        return {"total": await run_cpu(crunch_numbers)}
+
+    app.add_middleware(ProfilingMiddleware, token="secret", output_dir=str(tmp_path),
+                       max_files=max_files, sample_interval=0.0005)
+    return TestClient(app, headers={"X-Profile-Token": "secret"})
+
+
+def test_profile_flag_parsing():
+    assert parse_profile_flag("") is None
+    assert parse_profile_flag("0") is None
+    assert parse_profile_flag("1") == "cprofile"
+    assert parse_profile_flag(" Sample ") == "sample"
+
+
+def test_unflagged_requests_are_not_profiled(tmp_path):
+    response = _client(tmp_path).get("/work")
+
+    assert response.status_code == 200
+    assert "x-profile-file" not in response.headers
+    assert os.listdir(tmp_path) == []
+
+
+def test_inline_cprofile_covers_cpu_jobs(tmp_path):
+    response = _client(tmp_path).get("/work", params={"profile": "1", "profile_output": "inline"})
+
+    assert response.status_code == 200
+    assert response.headers["x-profile-status"] == "200"
+    assert "crunch_numbers" in response.text
+    assert os.listdir(tmp_path) == []
+
+
+def test_sampled_profile_is_saved_as_collapsed_stacks(tmp_path):
+    response = _client(tmp_path).get("/work", headers={"X-Profile": "sample"})
+
+    assert response.json()["total"] == crunch_numbers()
+    name = response.headers["x-profile-file"]
+    assert name.endswith(".collapsed")
+    with open(tmp_path / name) as f:
+        lines = f.read().splitlines()
+    assert any("crunch_numbers" in line for line in lines)
+    assert all(line.rsplit(" ", 1)[1].isdigit() for line in lines)
+
+
+def test_unknown_mode_is_rejected(tmp_path):
+    assert _client(tmp_path).get("/work", params={"profile": "perf"}).status_code == 400
+
+
+def test_profiling_requires_the_token(tmp_path):
+    client = _client(tmp_path)
+    missing = client.get("/work", params={"profile": "1"}, headers={"X-Profile-Token": ""})
+    wrong = client.get("/work", params={"profile": "1"}, headers={"X-Profile-Token": "guess"})
+
+    assert missing.status_code == 403
+    assert wrong.status_code == 403
+    assert os.listdir(tmp_path) == []
+
+
+def test_saved_profiles_are_capped(tmp_path):
+    client = _client(tmp_path, max_files=2)
+    names = [client.get("/work", params={"profile": "1"}).headers["x-profile-file"] for _ in range(4)]
+
+    assert sorted(os.listdir(tmp_path)) == sorted(names[-2:])
@@ -0,0 +1,71 @@
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from utils.helpers import RateLimiter
+from utils.middleware import RateLimitMiddleware
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+def test_sliding_window_weights_previous_window():
+    clock = FakeClock()
+    limiter = RateLimiter(clock=clock)
+
+    assert [limiter.is_allowed("ip", 4, 10) for _ in range(5)] == [True] * 4 + [False]
+
+    # Halfway through the next window, half of the previous 4 still count
+    clock.now = 15
+    assert [limiter.is_allowed("ip", 4, 10) for _ in range(3)] == [True, True, False]
+
+    clock.now = 40
+    assert limiter.is_allowed("ip", 4, 10)
+
+
+def test_retry_after_points_to_next_allowed_request():
+    clock = FakeClock()
+    limiter = RateLimiter(clock=clock)
+    for _ in range(3):
+        limiter.acquire("ip", 3, 10)
+
+    allowed, retry_after = limiter.acquire("ip", 3, 10)
+    assert not allowed
+    clock.now += retry_after + 0.01
+    assert limiter.is_allowed("ip", 3, 10)
+
+
+def test_idle_and_excess_keys_are_evicted():
+    clock = FakeClock()
+    limiter = RateLimiter(max_keys=3, clock=clock)
+    for i in range(5):
+        limiter.is_allowed(f"key-{i}", 10, 60)
+    assert len(limiter.requests) == 3
+
+    clock.now = 1000
+    limiter.is_allowed("fresh", 10, 60)
+    assert list(limiter.requests) == [("fresh", 60)]
+
+
+def test_middleware_limits_only_configured_paths():
+    app = FastAPI()
+
+    @app.get("/limited")
+    async def limited():
+        return {"ok": True}
+
+    @app.get("/open")
+    async def open_route():
+        return {"ok": True}
+
+    app.add_middleware(RateLimitMiddleware, rules={"/limited": (2, 60)})
+    client = TestClient(app)
+
+    codes = [client.get("/limited").status_code for _ in range(3)]
+    assert codes == [200, 200, 429]
+    assert int(client.get("/limited").headers["retry-after"]) >= 1
+    assert all(client.get("/open").status_code == 200 for _ in range(5))
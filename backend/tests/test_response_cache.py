@@ -0,0 +1,80 @@
+from fastapi import FastAPI, HTTPException
+from fastapi.testclient import TestClient
+
+from utils.middleware import ResponseCache, ResponseCacheMiddleware, canonical_query, etag_matches
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+def _app(cache):
+    app = FastAPI()
+    calls = {"stats": 0}
+
+    @app.get("/stats")
+    async def stats(region: str = "all", page: int = 1):
+        calls["stats"] += 1
+        return {"region": region, "page": page, "calls": calls["stats"]}
+
+    @app.get("/broken")
+    async def broken():
+        raise HTTPException(status_code=503, detail="down")
+
+    app.add_middleware(ResponseCacheMiddleware, cache=cache)
+    return app, calls
+
+
+def test_hits_share_canonical_key_until_ttl():
+    clock = FakeClock()
+    cache = ResponseCache({"/stats": 30, "/broken": 30}, clock=clock)
+    app, calls = _app(cache)
+    client = TestClient(app)
+
+    first = client.get("/stats?region=eu&page=2")
+    second = client.get("/stats?page=2&region=eu")
+    assert first.headers["x-cache"] == "MISS"
+    assert second.headers["x-cache"] == "HIT"
+    assert second.json() == first.json()
+    assert calls["stats"] == 1
+
+    clock.now = 31
+    assert client.get("/stats?region=eu&page=2").json()["calls"] == 2
+
+
+def test_if_none_match_returns_304():
+    cache = ResponseCache({"/stats": 30}, clock=FakeClock())
+    app, calls = _app(cache)
+    client = TestClient(app)
+
+    etag = client.get("/stats").headers["etag"]
+    revalidated = client.get("/stats", headers={"If-None-Match": f'"other", W/{etag}'})
+
+    assert revalidated.status_code == 304
+    assert revalidated.content == b""
+    assert revalidated.headers["etag"] == etag
+    assert calls["stats"] == 1
+
+
+def test_errors_are_not_cached_and_invalidate_drops_entries():
+    cache = ResponseCache({"/stats": 30, "/broken": 30}, clock=FakeClock())
+    app, calls = _app(cache)
+    client = TestClient(app)
+
+    assert client.get("/broken").status_code == 503
+    assert len(cache.entries) == 0
+
+    client.get("/stats")
+    cache.invalidate("/stats")
+    client.get("/stats")
+    assert calls["stats"] == 2
+
+
+def test_helpers():
+    assert canonical_query(b"b=2&a=1&a=0") == "a=0&a=1&b=2"
+    assert etag_matches("*", '"x"')
+    assert not etag_matches('"y"', '"x"')
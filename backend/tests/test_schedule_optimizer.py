@@ -0,0 +1,299 @@
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta, timezone
+
+import numpy as np
+import pytest
+
+from models.schedule_optimizer import ScheduleOptimizer
+from storage import SQLiteOutcomeStore
+
+optimizer = ScheduleOptimizer()
+
+
+def test_matrix_per_audience_and_platform():
+    assert len(optimizer.score_matrices) == len(optimizer.engagement_patterns) * len(optimizer.platform_data)
+
+    matrix = optimizer.score_matrices[('business', 'blog')]
+    assert matrix.shape == (7, 24)
+    # Tuesday 09:00 is a business peak and a blog best time; Sunday 03:00 is neither
+    assert matrix[1, 9] > matrix[1, 12] > matrix[6, 3]
+
+
+def test_optimize_returns_top_slots():
+    suggestions = optimizer.optimize("website", "business", num_suggestions=4)
+    matrix = optimizer.score_matrices[('business', 'website')]
+
+    assert len(suggestions) == 4
+    assert len({s['datetime'] for s in suggestions}) == 4
+    assert len({s['day_of_week'] for s in suggestions}) == 4
+    for suggestion in suggestions:
+        scheduled = datetime.fromisoformat(suggestion['datetime'])
+        assert scheduled > datetime.now(timezone.utc)
+        assert suggestion['engagement_score'] == min(100, matrix[scheduled.weekday(), scheduled.hour])
+    assert all(s['engagement_score'] == 100 for s in suggestions)
+
+
+def test_optimize_is_capped_and_falls_back():
+    assert len(optimizer.optimize("email", "general", num_suggestions=5)) == 1
+
+    unknown = optimizer.optimize("social_post", "Unknown", num_suggestions=3)
+    website = optimizer.optimize("website", "general", num_suggestions=3)
+    assert [s['datetime'] for s in unknown] == [s['datetime'] for s in website]
+
+
+def test_audience_timezones_shift_suggestions():
+    local = optimizer.optimize("website", "business", timezone="America/New_York", num_suggestions=1)
+    remote = optimizer.optimize(
+        "website", "business", timezone="UTC",
+        audience_timezones={"America/New_York": 1.0}, num_suggestions=1
+    )
+
+    assert local[0]["time"] == "09:00"
+    assert local[0]["datetime"].endswith(("-04:00", "-05:00"))
+    assert datetime.fromisoformat(local[0]["datetime"]) == datetime.fromisoformat(remote[0]["datetime"])
+    assert remote[0]["timezone"] == "UTC"
+
+
+def test_fold_scores_weights_zones():
+    matrix = optimizer.score_matrices[("general", "website")]
+    start_ts = 1_700_000_000.0 - 1_700_000_000.0 % 3600
+    utc = optimizer.fold_scores(matrix, (("UTC", 1.0),), start_ts)
+    tokyo = optimizer.fold_scores(matrix, (("Asia/Tokyo", 1.0),), start_ts)
+    mixed = optimizer.fold_scores(matrix, (("Asia/Tokyo", 0.25), ("UTC", 0.75)), start_ts)
+
+    assert utc.shape == (168,)
+    assert np.allclose(mixed, 0.25 * tokyo + 0.75 * utc)
+    assert np.array_equal(np.roll(tokyo, 9), utc)
+
+
+def test_generate_schedule_builds_only_requested_fields(monkeypatch):
+    def fail(*args, **kwargs):
+        raise AssertionError("section should not be built")
+
+    monkeypatch.setattr(optimizer, "_generate_monthly_calendar", fail)
+    monkeypatch.setattr(optimizer, "_generate_schedule_recommendations", fail)
+
+    result = optimizer.generate_schedule("blog", "tech", fields=["weekly_schedule", "expected_impact"])
+
+    assert list(result) == ["weekly_schedule", "expected_impact"]
+    assert "monthly_overview" not in result
+    assert len(result["weekly_schedule"]) == 7
+    assert result["expected_impact"]["average_engagement_score"] > 0
+    assert type(result) is dict
+
+
+def test_lazy_sections_are_built_on_access(monkeypatch):
+    fresh = ScheduleOptimizer()
+    built = []
+    original = fresh._generate_monthly_calendar
+
+    def monthly(*args):
+        built.append("monthly_overview")
+        return original(*args)
+
+    monkeypatch.setattr(fresh, "_generate_monthly_calendar", monthly)
+    sections = fresh.schedule_sections("blog", "tech")
+
+    assert "monthly_overview" in sections and built == []
+    assert sections["monthly_overview"] and built == ["monthly_overview"]
+
+
+def test_generate_schedule_defaults_to_all_fields():
+    result = optimizer.generate_schedule("blog", "business", platform="blog")
+
+    assert set(result) == {
+        "weekly_schedule", "monthly_overview", "optimal_times",
+        "recommendations", "expected_impact", "platform_insights"
+    }
+    assert result["weekly_schedule"] is result["weekly_schedule"]
+    assert result["platform_insights"]["posts_per_week"] == 3
+
+
+def test_weekly_schedule_uses_distinct_hours():
+    patterns = optimizer.engagement_patterns["business"]
+    schedule = optimizer._generate_weekly_schedule(patterns, optimizer.platform_data["social_media"])
+
+    for day in schedule:
+        times = [post["time"] for post in day["posts"]]
+        assert len(times) == len(set(times))
+
+
+def test_plan_calendar_avoids_queued_slots():
+    first = optimizer.plan_calendar(["Twitter", "Twitter", "LinkedIn"], target_audience="tech")
+    existing = [{"platform": "Twitter", "scheduled_at": dt} for dt in first[:2]]
+    second = optimizer.plan_calendar(["Twitter", "Twitter"], target_audience="tech", existing=existing)
+
+    assert all(second)
+    taken = {dt.timestamp() for dt in first[:2]}
+    for dt in second:
+        assert all(abs(dt.timestamp() - ts) >= 2 * 3600 for ts in taken)
+
+
+def test_plan_calendar_matches_platforms_case_insensitively():
+    best = optimizer.plan_calendar(["twitter"], target_audience="tech")[0]
+    existing = [{"platform": "Twitter", "scheduled_at": best}]
+
+    planned = optimizer.plan_calendar(["twitter", "TWITTER"], target_audience="tech", existing=existing)
+
+    assert all(planned)
+    assert all(abs(dt.timestamp() - best.timestamp()) >= 2 * 3600 for dt in planned)
+
+
+def test_plan_calendar_spaces_posts_queued_off_the_hour():
+    best = optimizer.plan_calendar(["Twitter"], target_audience="tech")[0]
+    queued = best - timedelta(minutes=90)
+
+    planned = optimizer.plan_calendar(
+        ["Twitter"], target_audience="tech", min_spacing_hours=2,
+        existing=[{"platform": "Twitter", "scheduled_at": queued}]
+    )[0]
+
+    assert abs(planned.timestamp() - queued.timestamp()) >= 2 * 3600
+
+
+def test_schedules_are_memoized_per_week():
+    fresh = ScheduleOptimizer(cache_size=4)
+    first = fresh.generate_schedule("blog", "lifestyle", platform="social_media")
+    second = fresh.generate_schedule("Blog", "LIFESTYLE", platform="social_media", fields=["weekly_schedule"])
+
+    third = fresh.generate_schedule("blog", "lifestyle", platform="social_media")
+
+    assert second["weekly_schedule"] == first["weekly_schedule"]
+    assert third == first
+    assert fresh.schedule_cache.hits == 1
+
+    fresh.generate_schedule("blog", "lifestyle", platform="social_media", seed=1)
+    assert fresh.schedule_cache.hits == 1
+
+
+def test_returned_schedules_are_copies():
+    fresh = ScheduleOptimizer()
+    first = fresh.generate_schedule("blog", "tech")
+    first["weekly_schedule"][0]["posts"] = "changed"
+    first["platform_insights"]["posts_per_week"] = -1
+
+    second = fresh.generate_schedule("blog", "tech")
+
+    assert second["weekly_schedule"][0]["posts"] != "changed"
+    assert second["platform_insights"]["posts_per_week"] > 0
+
+
+def test_monthly_overview_follows_the_month_within_a_week(monkeypatch):
+    fresh = ScheduleOptimizer()
+    monkeypatch.setattr(ScheduleOptimizer, "current_week", staticmethod(lambda: (2031, 5)))
+    monkeypatch.setattr(ScheduleOptimizer, "current_month", staticmethod(lambda: (2031, 1)))
+    january = fresh.generate_schedule("blog", "tech")
+    monkeypatch.setattr(ScheduleOptimizer, "current_month", staticmethod(lambda: (2031, 2)))
+    february = fresh.generate_schedule("blog", "tech")
+
+    assert fresh.schedule_cache.misses == 2
+    assert february["weekly_schedule"] == january["weekly_schedule"]
+
+
+def test_schedule_is_stable_across_instances_and_access_order():
+    a = ScheduleOptimizer().generate_schedule("blog", "general", platform="blog")
+    b = ScheduleOptimizer().generate_schedule("blog", "general", platform="blog")
+
+    impact_first = b["expected_impact"]
+    assert a["weekly_schedule"] == b["weekly_schedule"]
+    assert a["optimal_times"] == b["optimal_times"]
+    assert a["expected_impact"] == impact_first
+
+
+def test_schedule_cache_is_bounded_and_keyed_by_week(monkeypatch):
+    fresh = ScheduleOptimizer(cache_size=2)
+    for audience in ["tech", "business", "education"]:
+        fresh.generate_schedule("blog", audience)
+    assert len(fresh.schedule_cache) == 2
+
+    fresh.generate_schedule("blog", "tech")
+    misses = fresh.schedule_cache.misses
+    monkeypatch.setattr(ScheduleOptimizer, "current_week", staticmethod(lambda: (2099, 1)))
+    fresh.generate_schedule("blog", "tech")
+    assert fresh.schedule_cache.misses == misses + 1
+
+
+def test_optimize_hits_suggestion_cache():
+    fresh = ScheduleOptimizer()
+    first = fresh.optimize("blog", "tech", num_suggestions=3)
+    first[0]["time"] = "changed"
+    second = fresh.optimize("blog", "tech", num_suggestions=3)
+
+    assert fresh.suggestion_cache.hits == 1
+    assert second[0]["time"] != "changed"
+
+
+def test_recorded_outcomes_reshape_suggestions():
+    fresh = ScheduleOptimizer()
+    best = fresh.optimize("email", "general", timezone="UTC", num_suggestions=1)[0]
+    slot = datetime.fromisoformat(best["datetime"])
+
+    # The recommended hour turns out to perform badly, every week
+    fresh.record_outcomes(
+        {"target_audience": "general", "posted_at": slot, "engagement_score": 5.0}
+        for _ in range(50)
+    )
+    matrix = fresh.score_matrices[("general", "email")]
+    prior = fresh.prior_matrices[("general", "email")]
+    after = fresh.optimize("email", "general", timezone="UTC", num_suggestions=1)[0]
+
+    assert matrix[slot.weekday(), slot.hour] < prior[slot.weekday(), slot.hour] / 2
+    assert after["datetime"] != best["datetime"]
+
+
+def test_outcomes_blend_on_the_prior_scale():
+    fresh = ScheduleOptimizer()
+    prior = fresh.prior_matrices[("business", "blog")]
+    weekday, hour = np.unravel_index(prior.argmax(), prior.shape)
+    assert prior[weekday, hour] > 100
+
+    # Reporting the slot's own score (on the 0-100 scale) confirms the prior
+    fresh.record_outcomes(
+        {"target_audience": "business", "posted_at": datetime(2024, 7, 1 + int(weekday), int(hour)),
+         "engagement_score": prior[weekday, hour] / 1.3}
+        for _ in range(20)
+    )
+
+    assert fresh.score_matrices[("business", "blog")][weekday, hour] == pytest.approx(prior[weekday, hour], abs=0.1)
+
+
+def test_outcomes_are_read_in_audience_timezone():
+    fresh = ScheduleOptimizer()
+    fresh.record_outcome("tech", datetime(2024, 7, 1, 13, tzinfo=timezone.utc), 90.0,
+                         timezone="America/New_York")
+
+    assert fresh.learner.counts["tech"][0, 9] == 1
+
+
+def test_outcomes_are_shared_through_the_store(tmp_path):
+    path = str(tmp_path / "outcomes.db")
+    first = ScheduleOptimizer(outcome_store=SQLiteOutcomeStore(path))
+    second = ScheduleOptimizer(outcome_store=SQLiteOutcomeStore(path))
+    best = second.optimize("email", "general", timezone="UTC", num_suggestions=1)[0]
+    slot = datetime.fromisoformat(best["datetime"])
+
+    first.record_outcomes(
+        {"target_audience": "general", "posted_at": slot, "engagement_score": 5.0}
+        for _ in range(50)
+    )
+    after = second.optimize("email", "general", timezone="UTC", num_suggestions=1)[0]
+    restarted = ScheduleOptimizer(outcome_store=SQLiteOutcomeStore(path))
+
+    assert after["datetime"] != best["datetime"]
+    for other in (second, restarted):
+        assert np.array_equal(other.score_matrices[("general", "email")],
+                              first.score_matrices[("general", "email")])
+        assert other.learner.observations("general") == 50
+
+
+def test_concurrent_outcomes_update_cells_consistently():
+    fresh = ScheduleOptimizer()
+    posted_at = datetime(2024, 7, 2, 9)
+
+    with ThreadPoolExecutor(max_workers=8) as pool:
+        list(pool.map(lambda score: fresh.record_outcome("tech", posted_at, score), [20.0, 60.0] * 200))
+
+    mean, count = fresh.learner.means["tech"][1, 9], fresh.learner.counts["tech"][1, 9]
+    prior = fresh.prior_matrices[("tech", "blog")][1, 9] / 1.2
+    assert count == 400 and np.isclose(mean, 40.0)
+    assert fresh.score_matrices[("tech", "blog")][1, 9] == round(1.2 * fresh.learner.blend_cell(prior, mean, count), 1)
@@ -0,0 +1,45 @@
+from concurrent.futures import ThreadPoolExecutor
+
+from models.engagement_predictor import EngagementPredictor
+from utils.sentiment import SentimentScorer
+
+
+def test_polarity_follows_lexicon():
+    scorer = SentimentScorer(lexicon={'great': 0.8, 'bad': -0.7})
+
+    assert scorer.polarity("A great guide") > 0
+    assert scorer.polarity("A bad guide") < 0
+    assert scorer.polarity("A plain guide") == 0.0
+    assert scorer.polarity("This is not great") < 0
+
+
+def test_polarity_is_cached_by_content():
+    scorer = SentimentScorer(lexicon={'great': 0.8}, cache_size=2)
+
+    scorer.polarity("great")
+    scorer.polarity("great")
+    scorer.polarity("other")
+    scorer.polarity("third")
+
+    assert len(scorer.cache) == 2
+    assert scorer.cache.hits == 1
+
+
+def test_polarity_cache_is_shared_across_threads():
+    scorer = SentimentScorer(lexicon={'great': 0.8}, cache_size=8)
+    contents = [f"great post {i % 16}" for i in range(2000)]
+
+    with ThreadPoolExecutor(max_workers=8) as pool:
+        scores = list(pool.map(scorer.polarity, contents))
+
+    assert scores == [0.8] * len(contents)
+    assert len(scorer.cache) == 8
+    assert scorer.cache.hits + scorer.cache.misses == len(contents)
+
+
+def test_sentiment_is_opt_in():
+    predictor = EngagementPredictor()
+    content = "# Great tools\n\nThese excellent tools are great."
+
+    assert 'sentiment' not in predictor.predict(content, ["tools"])
+    assert predictor.predict(content, ["tools"], include_sentiment=True)['sentiment']['label'] == 'positive'
@@ -0,0 +1,80 @@
+import multiprocessing
+import sqlite3
+
+from storage import SQLiteRateLimiter, create_rate_limiter
+from utils.helpers import RateLimiter
+
+
+def _hammer(path, attempts, limit, results):
+    limiter = SQLiteRateLimiter(path)
+    allowed = sum(limiter.is_allowed("shared-key", limit, 10 ** 9) for _ in range(attempts))
+    results.put(allowed)
+
+
+def test_workers_share_one_quota(tmp_path):
+    path = str(tmp_path / "limits.db")
+    SQLiteRateLimiter(path)
+    results = multiprocessing.Queue()
+    workers = [
+        multiprocessing.Process(target=_hammer, args=(path, 50, 60, results))
+        for _ in range(4)
+    ]
+    for worker in workers:
+        worker.start()
+    for worker in workers:
+        worker.join()
+
+    assert sum(results.get() for _ in workers) == 60
+
+
+def test_sqlite_limiter_slides_like_memory_limiter(tmp_path):
+    now = [0.0]
+    shared = SQLiteRateLimiter(str(tmp_path / "limits.db"), clock=lambda: now[0])
+    local = RateLimiter(clock=lambda: now[0])
+
+    for moment in [0, 1, 2, 3, 4, 12, 13, 14, 15, 16, 35]:
+        now[0] = moment
+        assert shared.acquire("ip", 4, 10) == local.acquire("ip", 4, 10)
+
+
+def test_idle_counters_are_evicted(tmp_path):
+    now = [0.0]
+    limiter = SQLiteRateLimiter(str(tmp_path / "limits.db"), clock=lambda: now[0])
+    limiter.is_allowed("old", 5, 10)
+    now[0] = 100
+    limiter.is_allowed("new", 5, 10)
+    limiter.evict_idle()
+
+    keys = [row[0] for row in limiter._connection().execute("SELECT key FROM rate_limits")]
+    assert keys == ["new"]
+
+
+def test_memory_factory():
+    assert type(create_rate_limiter(":memory:")) is RateLimiter
+
+
+def test_locked_database_fails_open(tmp_path):
+    path = str(tmp_path / "limits.db")
+    limiter = SQLiteRateLimiter(path, busy_timeout_ms=10)
+    assert not limiter.acquire("ip", 0, 10)[0]
+
+    writer = sqlite3.connect(path, isolation_level=None)
+    writer.execute("BEGIN EXCLUSIVE")
+    try:
+        assert limiter.acquire("ip", 0, 10) == (True, 0.0)
+    finally:
+        writer.execute("ROLLBACK")
+        writer.close()
+
+
+def test_failed_eviction_keeps_the_verdict(tmp_path):
+    limiter = SQLiteRateLimiter(str(tmp_path / "limits.db"), evict_every=1)
+
+    def locked(now=None):
+        raise sqlite3.OperationalError("database is locked")
+
+    limiter.evict_idle = locked
+
+    assert limiter.acquire("ip", 1, 10) == (True, 0.0)
+    allowed, retry_after = limiter.acquire("ip", 1, 10)
+    assert not allowed and retry_after > 0
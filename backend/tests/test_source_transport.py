@@ -0,0 +1,78 @@
+import asyncio
+import zipfile
+
+import numpy as np
+import pytest
+
+from benchmarks.fake_sources import FakeSources
+from models.keyword_predictor import KeywordPredictor
+from utils.source_transport import (
+    LiveTransport, RecordingTransport, ReplayTransport, SourceArchive, create_source_transport
+)
+
+
+def _predict(predictor, topic):
+    np.random.seed(0)
+    predictor.cache.clear()
+    return asyncio.run(predictor.predict_keywords_async(topic, num_keywords=50))
+
+
+def test_record_then_replay_is_byte_for_byte(tmp_path):
+    path = str(tmp_path / "sources.zip")
+
+    with FakeSources() as sources:
+        recorder = KeywordPredictor(source_urls=sources.source_urls,
+                                    transport=RecordingTransport(SourceArchive.load(path)))
+        recorded = _predict(recorder, "python")
+        live_body = recorder.transport.get(sources.source_urls["google_trends"], {}).content
+        live_hits = sum(sources.hits.values())
+
+    with zipfile.ZipFile(path) as zf:
+        assert "index.json" in zf.namelist()
+
+    replay = ReplayTransport(SourceArchive.load(path))
+    replayer = KeywordPredictor(source_urls=sources.source_urls, transport=replay)
+
+    assert len(replay.archive) == 5
+    assert replay.get(sources.source_urls["google_trends"], {}).content == live_body
+    assert _predict(replayer, "python") == recorded
+    assert replay.misses == 0
+    assert live_hits == 6
+
+
+def test_replay_misses_are_404s():
+    replay = ReplayTransport(SourceArchive())
+    predictor = KeywordPredictor(transport=replay)
+
+    topics = asyncio.run(predictor.get_trending_topics_async())
+
+    assert topics == []
+    assert replay.misses == 2
+
+
+def test_create_source_transport(tmp_path, monkeypatch):
+    monkeypatch.delenv("TRENDWISE_SOURCE_MODE", raising=False)
+
+    assert isinstance(create_source_transport(), LiveTransport)
+    assert isinstance(create_source_transport("record", str(tmp_path / "new.zip")), RecordingTransport)
+    with pytest.raises(ValueError):
+        create_source_transport("replay", str(tmp_path / "missing.zip"))
+    with pytest.raises(ValueError):
+        create_source_transport("offline")
+
+
+def test_recording_saves_once_per_fetch_batch(tmp_path, monkeypatch):
+    archive = SourceArchive(str(tmp_path / "sources.zip"))
+    saves = []
+    monkeypatch.setattr(archive, "save", lambda: saves.append(len(archive)))
+
+    with FakeSources() as sources:
+        transport = RecordingTransport(archive, save_interval=3600)
+        recorder = KeywordPredictor(source_urls=sources.source_urls, transport=transport)
+        _predict(recorder, "python")
+        transport.get(sources.source_urls["google_trends"], {})
+
+    assert saves == [5]
+    transport.flush()
+    transport.flush()
+    assert saves == [5, 5]
@@ -0,0 +1,59 @@
+import multiprocessing
+
+from storage import SQLitePostStore, create_post_store, PostStore
+
+
+def _insert_posts(path, worker, count):
+    store = SQLitePostStore(path)
+    store.add_many([
+        {
+            "title": f"w{worker}-{i}",
+            "content": "",
+            "platform": "Twitter",
+            "scheduled_time": f"2030-01-01T{i % 24:02d}:00:00"
+        }
+        for i in range(count)
+    ])
+    for i in range(count):
+        store.add(f"w{worker}-single-{i}", "", "LinkedIn", "2030-01-02T09:00:00")
+
+
+def test_posts_survive_reopen(tmp_path):
+    path = str(tmp_path / "posts.db")
+    store = SQLitePostStore(path)
+    store.add("Later", "b", "Twitter", "2030-01-02T09:00:00")
+    store.add("Sooner", "a", "LinkedIn", "2030-01-01T09:00:00Z")
+    store.update_status(1, "cancelled")
+    store.close()
+
+    reopened = SQLitePostStore(path)
+
+    assert reopened.get(1)["status"] == "cancelled"
+    assert [p["title"] for p in reopened.upcoming()] == ["Sooner"]
+    assert reopened.count("queued") == 1
+    assert reopened.scheduled_at(reopened.get(2)).year == 2030
+
+
+def test_ids_are_unique_across_processes(tmp_path):
+    path = str(tmp_path / "posts.db")
+    SQLitePostStore(path)
+
+    workers = [
+        multiprocessing.Process(target=_insert_posts, args=(path, worker, 25))
+        for worker in range(4)
+    ]
+    for process in workers:
+        process.start()
+    for process in workers:
+        process.join(timeout=30)
+        assert process.exitcode == 0
+
+    store = SQLitePostStore(path)
+    ids = [post["id"] for post in store.upcoming()]
+
+    assert len(ids) == 200
+    assert len(set(ids)) == 200
+
+
+def test_memory_store_factory():
+    assert isinstance(create_post_store(":memory:"), PostStore)
@@ -0,0 +1,24 @@
+from utils.syllables import SyllableCounter, count_syllables
+
+
+def test_count_syllables():
+    assert count_syllables("strategy") == 3
+    assert count_syllables("Guide") == 1
+    assert count_syllables("the") == 1
+    assert count_syllables("rhythm") == 1
+
+
+def test_count_words_matches_per_word_sum():
+    words = "the ultimate guide to the best ai tools in the market".split()
+    counter = SyllableCounter()
+
+    assert counter.count_words(words) == sum(count_syllables(w) for w in words)
+    assert len(counter.memo) == len(set(words))
+
+
+def test_memo_is_bounded():
+    counter = SyllableCounter(max_words=3)
+
+    counter.count_words(["one", "two", "three", "four", "five"])
+
+    assert len(counter.memo) <= 3
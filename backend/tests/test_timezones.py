@@ -0,0 +1,52 @@
+from datetime import datetime
+
+import numpy as np
+import pytest
+import pytz
+
+from utils.timezones import local_slots, parse_zone_weights, utc_offsets, window_start, zone_weights
+
+
+def test_offsets_follow_dst_transitions():
+    tz = pytz.timezone("America/New_York")
+    instants = [datetime(2024, month, 15, 12, tzinfo=pytz.utc) for month in range(1, 13)]
+    expected = [tz.utcoffset(instant.replace(tzinfo=None)).total_seconds() for instant in instants]
+
+    offsets = utc_offsets("America/New_York", np.array([i.timestamp() for i in instants]))
+
+    assert offsets.tolist() == expected
+
+
+def test_local_slots_across_spring_forward():
+    tz = pytz.timezone("Europe/Berlin")
+    start = tz.localize(datetime(2024, 3, 31)).timestamp()
+
+    slots = local_slots("Europe/Berlin", start, hours=4)
+
+    # Sunday (6): 00:00, 01:00, then 02:00 is skipped
+    assert slots.tolist() == [6 * 24, 6 * 24 + 1, 6 * 24 + 3, 6 * 24 + 4]
+
+
+def test_fractional_offsets_floor_the_hour():
+    start = datetime(2024, 1, 1, tzinfo=pytz.utc).timestamp()
+
+    # 00:00 UTC is 05:30 in India on Monday
+    assert local_slots("Asia/Kolkata", start, hours=1).tolist() == [5]
+
+
+def test_window_starts_at_local_midnight_tomorrow():
+    now = datetime(2024, 6, 1, 23, 30, tzinfo=pytz.utc)
+    start = datetime.fromtimestamp(window_start("Asia/Tokyo", now), pytz.timezone("Asia/Tokyo"))
+
+    assert (start.year, start.month, start.day, start.hour) == (2024, 6, 3, 0)
+
+
+def test_zone_weights_normalize_and_validate():
+    assert zone_weights(None, default="UTC") == (("UTC", 1.0),)
+    assert zone_weights(["Asia/Tokyo", "UTC"]) == (("Asia/Tokyo", 0.5), ("UTC", 0.5))
+    assert zone_weights(parse_zone_weights("UTC:3, Asia/Tokyo:1")) == (("Asia/Tokyo", 0.25), ("UTC", 0.75))
+
+    with pytest.raises(ValueError):
+        zone_weights({"Mars/Olympus_Mons": 1.0})
+    with pytest.raises(ValueError):
+        parse_zone_weights("UTC:lots")
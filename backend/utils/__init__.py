@@ -1 +1,2 @@
-from .helpers import *
\ No newline at end of file
+from .helpers import *
+from .keyword_matcher import KeywordMatcher, KeywordMatches, get_keyword_matcher
@@ -0,0 +1,111 @@
+# utils/concurrency.py
+import asyncio
+import functools
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from contextvars import ContextVar
+from typing import Any, Callable, Optional
+
+# NumPy, scikit-learn and regex work release the GIL for much of their time,
+# so a small thread pool keeps CPU stages off the event loop without the
+# cost of pickling models into worker processes.
+CPU_WORKERS = int(os.getenv('TRENDWISE_CPU_WORKERS', str(min(4, os.cpu_count() or 1))))
+
+# Blocking I/O (SQLite, archive and profile files) mostly waits, on locks or
+# the disk, so it gets its own pool and never holds up CPU jobs.
+IO_WORKERS = int(os.getenv('TRENDWISE_IO_WORKERS', '8'))
+
+_executor: Optional[ThreadPoolExecutor] = None
+_io_executor: Optional[ThreadPoolExecutor] = None
+_executor_lock = threading.Lock()
+
+# CPU jobs submitted by run_cpu that no worker has started yet
+_waiting = 0
+_waiting_lock = threading.Lock()
+
+# Wrapper applied to CPU jobs submitted from the current context, set by the
+# request profiler so jobs of a profiled request are profiled in their worker
+cpu_job_wrapper: ContextVar[Optional[Callable[[Callable], Callable]]] = ContextVar(
+    'cpu_job_wrapper', default=None
+)
+
+
+def get_cpu_executor() -> ThreadPoolExecutor:
+    """Return the shared, bounded executor for CPU-bound model work"""
+    global _executor
+    if _executor is None:
+        with _executor_lock:
+            if _executor is None:
+                _executor = ThreadPoolExecutor(
+                    max_workers=CPU_WORKERS, thread_name_prefix='trendwise-cpu'
+                )
+    return _executor
+
+
+async def run_cpu(func: Callable, *args, **kwargs) -> Any:
+    """Run a blocking callable on the CPU executor and await its result"""
+    global _waiting
+    loop = asyncio.get_running_loop()
+    job = functools.partial(func, *args, **kwargs)
+    wrapper = cpu_job_wrapper.get()
+    if wrapper is not None:
+        job = wrapper(job)
+
+    pending = [True]
+
+    def settle():
+        # Called when a worker starts the job, and again once it is awaited
+        # (which only counts if the job was cancelled before it started)
+        global _waiting
+        with _waiting_lock:
+            if pending[0]:
+                pending[0] = False
+                _waiting -= 1
+
+    def tracked():
+        settle()
+        return job()
+
+    with _waiting_lock:
+        _waiting += 1
+    try:
+        return await loop.run_in_executor(get_cpu_executor(), tracked)
+    finally:
+        settle()
+
+
+def get_io_executor() -> ThreadPoolExecutor:
+    """Return the shared executor for blocking database and file I/O"""
+    global _io_executor
+    if _io_executor is None:
+        with _executor_lock:
+            if _io_executor is None:
+                _io_executor = ThreadPoolExecutor(
+                    max_workers=IO_WORKERS, thread_name_prefix='trendwise-io'
+                )
+    return _io_executor
+
+
+async def run_io(func: Callable, *args, **kwargs) -> Any:
+    """Run a blocking I/O call on the I/O executor and await its result"""
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(get_io_executor(), functools.partial(func, *args, **kwargs))
+
+
+def cpu_queue_depth() -> int:
+    """Jobs submitted through run_cpu that no worker has picked up yet"""
+    return _waiting
+
+
+def shutdown_executors():
+    """Stop the shared executors (called on application shutdown)"""
+    global _executor, _io_executor
+    with _executor_lock:
+        if _executor is not None:
+            _executor.shutdown(wait=False, cancel_futures=True)
+            _executor = None
+        if _io_executor is not None:
+            # Pending writes still finish
+            _io_executor.shutdown(wait=True)
+            _io_executor = None
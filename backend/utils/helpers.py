@@ -1,8 +1,13 @@
 # utils/helpers.py
 import re
-from typing import List, Dict
+from typing import List, Dict, Tuple
 import json
+import base64
+import threading
+import time
+from collections import OrderedDict
 from datetime import datetime
+from .keyword_matcher import get_keyword_matcher
 
 def clean_text(text: str) -> str:
     """Clean and normalize text"""
@@ -132,6 +137,29 @@ def format_api_response(success: bool, data: any = None,
     
     return response
 
+def encode_cursor(*parts) -> str:
+    """Encode values into an opaque, URL-safe pagination cursor"""
+    raw = json.dumps(parts, separators=(',', ':')).encode('utf-8')
+    return base64.urlsafe_b64encode(raw).decode('ascii').rstrip('=')
+
+def decode_cursor(cursor: str, *types) -> List:
+    """Decode a cursor made by encode_cursor (raises ValueError if malformed).
+
+    With `types`, the cursor must hold exactly one value per type, each an
+    instance of it (booleans never pass for numbers).
+    """
+    padded = cursor + '=' * (-len(cursor) % 4)
+    parts = json.loads(base64.urlsafe_b64decode(padded.encode('ascii')))
+    if not isinstance(parts, list):
+        raise ValueError("Malformed cursor")
+    if types:
+        if len(parts) != len(types) or any(
+            isinstance(part, bool) or not isinstance(part, expected)
+            for part, expected in zip(parts, types)
+        ):
+            raise ValueError("Malformed cursor")
+    return parts
+
 def parse_content_type_from_url(url: str) -> str:
     """Determine content type from URL pattern"""
     url_lower = url.lower()
@@ -160,8 +188,8 @@ class ContentValidator:
     @staticmethod
     def validate_keyword_presence(content: str, keywords: List[str]) -> tuple[bool, str]:
         """Check if keywords are present"""
-        content_lower = content.lower()
-        missing_keywords = [kw for kw in keywords if kw.lower() not in content_lower]
+        matches = get_keyword_matcher(keywords).scan(content)
+        missing_keywords = [kw for kw in keywords if not matches.contains(kw)]
         
         if len(missing_keywords) > len(keywords) / 2:
             return False, f"Many keywords missing: {', '.join(missing_keywords[:3])}"
@@ -199,27 +227,77 @@ def import_from_json(filename: str) -> Dict:
 
 # Rate limiting helper
 class RateLimiter:
-    def __init__(self):
-        self.requests = {}
-    
-    def is_allowed(self, key: str, max_requests: int = 100, 
+    """Sliding-window-counter rate limiter.
+
+    Each key keeps only the request counts of the current and previous fixed
+    windows; the previous count is weighted by how much of it still overlaps
+    the sliding window. Memory per key is constant, checks are O(1), and keys
+    idle for two windows (or the least recently used ones beyond `max_keys`)
+    are evicted.
+    """
+
+    # Checks are in-memory and cheap enough to run on the event loop
+    blocking = False
+
+    def __init__(self, max_keys: int = 100000, clock=time.monotonic):
+        self.max_keys = max_keys
+        self.clock = clock
+        # (key, window_seconds) -> [window index, current count, previous count, last seen]
+        self.requests = OrderedDict()
+        self._lock = threading.Lock()
+
+    def acquire(self, key: str, max_requests: int = 100,
+                window_seconds: int = 3600) -> Tuple[bool, float]:
+        """Count a request if allowed; returns (allowed, seconds until retry)"""
+        now = self.clock()
+        window = int(now // window_seconds)
+        elapsed = (now - window * window_seconds) / window_seconds
+
+        with self._lock:
+            state_key = (key, window_seconds)
+            state = self.requests.get(state_key)
+            if state is None:
+                state = [window, 0, 0, now]
+                self.requests[state_key] = state
+            else:
+                self.requests.move_to_end(state_key)
+                if state[0] != window:
+                    # Roll forward; counts older than one window no longer matter
+                    state[2] = state[1] if window - state[0] == 1 else 0
+                    state[0], state[1] = window, 0
+                state[3] = now
+
+            current, previous = state[1], state[2]
+            allowed = previous * (1 - elapsed) + current < max_requests
+            if allowed:
+                state[1] += 1
+
+            self._evict(now)
+
+        if allowed:
+            return True, 0.0
+        return False, self._retry_after(current, previous, elapsed, max_requests, window_seconds)
+
+    def is_allowed(self, key: str, max_requests: int = 100,
                    window_seconds: int = 3600) -> bool:
         """Check if request is allowed based on rate limit"""
-        now = datetime.now()
-        
-        if key not in self.requests:
-            self.requests[key] = []
-        
-        # Remove old requests outside the window
-        self.requests[key] = [
-            req_time for req_time in self.requests[key]
-            if (now - req_time).total_seconds() < window_seconds
-        ]
-        
-        # Check if limit exceeded
-        if len(self.requests[key]) >= max_requests:
-            return False
-        
-        # Add current request
-        self.requests[key].append(now)
-        return True
\ No newline at end of file
+        return self.acquire(key, max_requests, window_seconds)[0]
+
+    @staticmethod
+    def _retry_after(current: int, previous: int, elapsed: float,
+                     max_requests: int, window_seconds: int) -> float:
+        if current < max_requests:
+            # Wait for enough of the previous window to slide out
+            needed = 1 - (max_requests - current) / previous
+            return max(0.0, (needed - elapsed) * window_seconds)
+        # Wait for the next window, then for this one to slide out far enough
+        needed = max(0.0, 1 - max_requests / current) if current else 0.0
+        return (1 - elapsed + needed) * window_seconds
+
+    def _evict(self, now: float):
+        requests = self.requests
+        while requests:
+            (_, window_seconds), state = next(iter(requests.items()))
+            if len(requests) <= self.max_keys and now - state[3] < 2 * window_seconds:
+                break
+            requests.popitem(last=False)
@@ -0,0 +1,154 @@
+# utils/keyword_matcher.py
+from collections import deque
+from functools import lru_cache
+from typing import Dict, Iterable, List, Tuple
+
+
+class KeywordMatcher:
+    """Aho-Corasick automaton matching a fixed keyword set in a single scan.
+
+    Matching is case-insensitive: keywords are lowercased when the automaton is
+    built and text is lowercased before scanning. Positions are offsets into
+    the lowercased text, which can be longer than the original.
+    """
+
+    def __init__(self, keywords: Iterable[str]):
+        self.patterns: List[str] = []
+        self._pattern_ids: Dict[str, int] = {}
+
+        for keyword in keywords:
+            pattern = keyword.lower()
+            if pattern and pattern not in self._pattern_ids:
+                self._pattern_ids[pattern] = len(self.patterns)
+                self.patterns.append(pattern)
+
+        self._build()
+
+    def _build(self):
+        """Build the trie, failure links and the full transition table"""
+        goto: List[Dict[str, int]] = [{}]
+        outputs: List[List[int]] = [[]]
+
+        for pattern_id, pattern in enumerate(self.patterns):
+            state = 0
+            for char in pattern:
+                next_state = goto[state].get(char)
+                if next_state is None:
+                    next_state = len(goto)
+                    goto[state][char] = next_state
+                    goto.append({})
+                    outputs.append([])
+                state = next_state
+            outputs[state].append(pattern_id)
+
+        # Breadth-first pass: compute failure links and turn the trie into a
+        # DFA so scanning never has to follow failure links at match time.
+        fail = [0] * len(goto)
+        delta: List[Dict[str, int]] = [dict(goto[0])]
+        delta.extend({} for _ in range(len(goto) - 1))
+        queue = deque(goto[0].values())
+
+        while queue:
+            state = queue.popleft()
+            fallback = fail[state]
+            outputs[state] = outputs[state] + outputs[fallback]
+            transitions = dict(delta[fallback])
+            for char, next_state in goto[state].items():
+                fail[next_state] = delta[fallback].get(char, 0) if state else 0
+                transitions[char] = next_state
+                queue.append(next_state)
+            delta[state] = transitions
+
+        self._delta = delta
+        self._outputs = [tuple(out) for out in outputs]
+        self._lengths = [len(pattern) for pattern in self.patterns]
+
+    def scan(self, text: str) -> "KeywordMatches":
+        """Scan text once and collect the end positions of every keyword"""
+        ends: List[List[int]] = [[] for _ in self.patterns]
+        delta = self._delta
+        outputs = self._outputs
+        lowered = text.lower()
+        state = 0
+
+        for index, char in enumerate(lowered):
+            state = delta[state].get(char, 0)
+            if outputs[state]:
+                end = index + 1
+                for pattern_id in outputs[state]:
+                    ends[pattern_id].append(end)
+
+        return KeywordMatches(self, ends, len(lowered))
+
+
+class KeywordMatches:
+    """Result of a single KeywordMatcher scan"""
+
+    def __init__(self, matcher: KeywordMatcher, ends: List[List[int]], text_length: int):
+        self._matcher = matcher
+        self._ends = ends
+        self._text_length = text_length
+        self._counts: Dict[int, int] = {}
+
+    def _pattern_id(self, keyword: str) -> int:
+        pattern_id = self._matcher._pattern_ids.get(keyword.lower())
+        if pattern_id is None:
+            raise KeyError(f"Keyword not in matcher: {keyword!r}")
+        return pattern_id
+
+    def positions(self, keyword: str) -> List[Tuple[int, int]]:
+        """All (start, end) spans of a keyword, including overlapping ones"""
+        if not keyword:
+            return []
+        pattern_id = self._pattern_id(keyword)
+        length = self._matcher._lengths[pattern_id]
+        return [(end - length, end) for end in self._ends[pattern_id]]
+
+    def count(self, keyword: str) -> int:
+        """Count non-overlapping occurrences (same semantics as str.count)"""
+        if not keyword:
+            return self._text_length + 1
+
+        pattern_id = self._pattern_id(keyword)
+        if pattern_id not in self._counts:
+            length = self._matcher._lengths[pattern_id]
+            count = 0
+            last_end = 0
+            for end in self._ends[pattern_id]:
+                if end - length >= last_end:
+                    count += 1
+                    last_end = end
+            self._counts[pattern_id] = count
+
+        return self._counts[pattern_id]
+
+    def contains(self, keyword: str, start: int = 0, end: int = None) -> bool:
+        """Check if a keyword occurs entirely within text[start:end]"""
+        if not keyword:
+            return True
+
+        pattern_id = self._pattern_id(keyword)
+        length = self._matcher._lengths[pattern_id]
+        limit = self._text_length if end is None else end
+
+        for match_end in self._ends[pattern_id]:
+            if match_end > limit:
+                break
+            if match_end - length >= start:
+                return True
+        return False
+
+    def counts(self) -> Dict[str, int]:
+        """Non-overlapping counts for every keyword in the matcher"""
+        return {pattern: self.count(pattern) for pattern in self._matcher.patterns}
+
+
+@lru_cache(maxsize=256)
+def _cached_matcher(keywords: Tuple[str, ...]) -> KeywordMatcher:
+    return KeywordMatcher(keywords)
+
+
+def get_keyword_matcher(keywords: Iterable[str]) -> KeywordMatcher:
+    """Return a shared matcher for a keyword set, building it only once"""
+    normalized = tuple(sorted({kw.lower() for kw in keywords if kw}))
+    return _cached_matcher(normalized)
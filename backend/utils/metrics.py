@@ -0,0 +1,343 @@
+# utils/metrics.py
+import asyncio
+import math
+import threading
+import time
+from bisect import bisect_left
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple
+
+# Prometheus text exposition format (Starlette appends the utf-8 charset)
+CONTENT_TYPE = 'text/plain; version=0.0.4'
+
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+Labels = Tuple[str, ...]
+
+
+def _format_value(value: float) -> str:
+    if value == math.inf:
+        return '+Inf'
+    if float(value).is_integer():
+        return str(int(value))
+    return repr(float(value))
+
+
+def _escape(value: str) -> str:
+    return str(value).replace('\\', r'\\').replace('\n', r'\n').replace('"', r'\"')
+
+
+def _label_text(names: Sequence[str], values: Sequence[str]) -> str:
+    if not names:
+        return ''
+    pairs = ','.join(f'{name}="{_escape(value)}"' for name, value in zip(names, values))
+    return '{' + pairs + '}'
+
+
+class _ShardedMetric:
+    """Metric whose values live in one dict per writing thread.
+
+    A thread only ever writes to its own shard, so recording takes no lock
+    (the GIL makes each dict update atomic); the lock is taken once per
+    thread, when its shard is created. Values are immutable and replaced
+    whole on every update, so scrapes can copy and merge the shards.
+    """
+
+    kind = 'untyped'
+
+    def __init__(self, name: str, help_text: str, labelnames: Sequence[str] = ()):
+        self.name = name
+        self.help_text = help_text
+        self.labelnames = tuple(labelnames)
+        self._local = threading.local()
+        self._shards: List[Dict[Labels, Any]] = []
+        self._shards_lock = threading.Lock()
+
+    def _shard(self) -> Dict[Labels, Any]:
+        shard = getattr(self._local, 'values', None)
+        if shard is None:
+            shard = {}
+            with self._shards_lock:
+                self._shards.append(shard)
+            self._local.values = shard
+        return shard
+
+    def _check(self, labels: Labels):
+        if len(labels) != len(self.labelnames):
+            raise ValueError(f"{self.name} expects labels {self.labelnames}, got {labels}")
+
+    def _snapshots(self) -> List[Dict[Labels, Any]]:
+        with self._shards_lock:
+            shards = list(self._shards)
+        # dict.copy() runs without releasing the GIL and values are never
+        # mutated in place, so a copy never sees a half-applied update
+        return [shard.copy() for shard in shards]
+
+
+class Counter(_ShardedMetric):
+    """Monotonic counter, e.g. failures per source"""
+
+    kind = 'counter'
+
+    def inc(self, *labels: str, amount: float = 1.0):
+        self._check(labels)
+        shard = self._shard()
+        shard[labels] = shard.get(labels, 0.0) + amount
+
+    def value(self, *labels: str) -> float:
+        return sum(shard.get(labels, 0.0) for shard in self._snapshots())
+
+    def collect(self) -> Dict[Labels, float]:
+        totals: Dict[Labels, float] = {}
+        for shard in self._snapshots():
+            for labels, value in shard.items():
+                totals[labels] = totals.get(labels, 0.0) + value
+        return totals
+
+    def render(self) -> List[str]:
+        return [
+            f"{self.name}{_label_text(self.labelnames, labels)} {_format_value(value)}"
+            for labels, value in sorted(self.collect().items())
+        ]
+
+
+class _Timer:
+    """Context manager observing its elapsed wall time on exit"""
+
+    __slots__ = ('histogram', 'labels', 'started', 'elapsed')
+
+    def __init__(self, histogram: 'Histogram', labels: Labels):
+        self.histogram = histogram
+        self.labels = labels
+        self.elapsed = 0.0
+
+    def __enter__(self) -> '_Timer':
+        self.started = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc_info):
+        self.elapsed = time.perf_counter() - self.started
+        self.histogram.observe(self.elapsed, *self.labels)
+        return False
+
+
+class Histogram(_ShardedMetric):
+    """Latency histogram with fixed buckets, in seconds.
+
+    Each label set maps to a tuple of per-bucket counts followed by the sum
+    and the count of observations, rebuilt on every observation so bucket,
+    sum and count always change together; buckets are made cumulative on
+    render.
+    """
+
+    kind = 'histogram'
+
+    def __init__(self, name: str, help_text: str, labelnames: Sequence[str] = (),
+                 buckets: Sequence[float] = DEFAULT_BUCKETS):
+        super().__init__(name, help_text, labelnames)
+        self.buckets = tuple(sorted(buckets)) + (math.inf,)
+        self._empty = (0,) * len(self.buckets) + (0.0, 0)
+
+    def observe(self, value: float, *labels: str):
+        self._check(labels)
+        shard = self._shard()
+        cells = list(shard.get(labels, self._empty))
+        cells[bisect_left(self.buckets, value)] += 1
+        cells[-2] += value
+        cells[-1] += 1
+        shard[labels] = tuple(cells)
+
+    def time(self, *labels: str) -> _Timer:
+        """Time a block: `with histogram.time('stage') as timer: ...`"""
+        return _Timer(self, labels)
+
+    def collect(self) -> Dict[Labels, List[float]]:
+        totals: Dict[Labels, List[float]] = {}
+        for shard in self._snapshots():
+            for labels, cells in shard.items():
+                cells = list(cells)
+                merged = totals.get(labels)
+                if merged is None:
+                    totals[labels] = cells
+                else:
+                    totals[labels] = [a + b for a, b in zip(merged, cells)]
+        return totals
+
+    def count(self, *labels: str) -> int:
+        cells = self.collect().get(labels)
+        return int(cells[-1]) if cells else 0
+
+    def render(self) -> List[str]:
+        lines = []
+        bucket_names = self.labelnames + ('le',)
+        for labels, cells in sorted(self.collect().items()):
+            cumulative = 0
+            for bound, count in zip(self.buckets, cells):
+                cumulative += count
+                lines.append(
+                    f"{self.name}_bucket{_label_text(bucket_names, labels + (_format_value(bound),))} {cumulative}"
+                )
+            label_text = _label_text(self.labelnames, labels)
+            lines.append(f"{self.name}_sum{label_text} {_format_value(cells[-2])}")
+            lines.append(f"{self.name}_count{label_text} {int(cells[-1])}")
+        return lines
+
+
+class StageTimer:
+    """Stage timings of one request, recorded into a histogram as they run.
+
+    Keeps each stage's duration so the same numbers can be returned to the
+    caller, as a Server-Timing header or in the response body.
+    """
+
+    def __init__(self, histogram: Histogram):
+        self.histogram = histogram
+        self.started = time.perf_counter()
+        self._timers: List[Tuple[str, _Timer]] = []
+
+    def stage(self, name: str) -> _Timer:
+        timer = self.histogram.time(name)
+        self._timers.append((name, timer))
+        return timer
+
+    def as_dict(self) -> Dict[str, float]:
+        """Milliseconds per stage, plus the total since the timer was created"""
+        timings = {name: round(timer.elapsed * 1000, 2) for name, timer in self._timers}
+        timings['total'] = round((time.perf_counter() - self.started) * 1000, 2)
+        return timings
+
+    def server_timing(self, timings: Optional[Dict[str, float]] = None) -> str:
+        """Server-Timing header value, e.g. 'keywords;dur=41.2, total;dur=52.9'"""
+        timings = self.as_dict() if timings is None else timings
+        return ', '.join(f"{name};dur={duration}" for name, duration in timings.items())
+
+
+class CallbackMetric:
+    """Metric read from live objects at scrape time (queue depths, cache stats).
+
+    `func` returns either a number or a dict mapping label tuples to numbers;
+    returning None skips the metric for this scrape.
+    """
+
+    def __init__(self, name: str, help_text: str, func: Callable[[], Any],
+                 labelnames: Sequence[str] = (), kind: str = 'gauge'):
+        self.name = name
+        self.help_text = help_text
+        self.func = func
+        self.labelnames = tuple(labelnames)
+        self.kind = kind
+
+    def render(self) -> List[str]:
+        values = self.func()
+        if values is None:
+            return []
+        if not isinstance(values, dict):
+            values = {(): values}
+        return [
+            f"{self.name}{_label_text(self.labelnames, labels)} {_format_value(value)}"
+            for labels, value in sorted(values.items())
+        ]
+
+
+class MetricsRegistry:
+    """Named metrics rendered together in the Prometheus text format"""
+
+    def __init__(self):
+        self._metrics: Dict[str, Any] = {}
+        self._lock = threading.Lock()
+
+    def register(self, metric):
+        with self._lock:
+            if metric.name in self._metrics:
+                raise ValueError(f"Metric already registered: {metric.name}")
+            self._metrics[metric.name] = metric
+        return metric
+
+    def render(self) -> str:
+        with self._lock:
+            metrics = list(self._metrics.values())
+
+        lines = []
+        for metric in metrics:
+            lines.append(f"# HELP {metric.name} {metric.help_text}")
+            lines.append(f"# TYPE {metric.name} {metric.kind}")
+            lines.extend(metric.render())
+        return '\n'.join(lines) + '\n'
+
+
+REGISTRY = MetricsRegistry()
+
+REQUEST_SECONDS = REGISTRY.register(Histogram(
+    'trendwise_http_request_duration_seconds', 'HTTP request latency by route',
+    ('method', 'route', 'status')
+))
+SOURCE_FETCH_SECONDS = REGISTRY.register(Histogram(
+    'trendwise_source_fetch_duration_seconds', 'Latency of trend source requests',
+    ('source',)
+))
+SOURCE_FAILURES = REGISTRY.register(Counter(
+    'trendwise_source_fetch_failures_total', 'Trend source requests that failed or returned non-200',
+    ('source',)
+))
+PIPELINE_STAGE_SECONDS = REGISTRY.register(Histogram(
+    'trendwise_pipeline_stage_duration_seconds', 'Content pipeline stage latency',
+    ('stage',)
+))
+
+
+def watch_caches(caches: Dict[str, Any], registry: MetricsRegistry = REGISTRY):
+    """Export hit/miss counts and hit ratio of objects with `hits` and `misses`"""
+
+    def counts(attribute: str) -> Callable[[], Dict[Labels, float]]:
+        return lambda: {(name,): getattr(cache, attribute) for name, cache in caches.items()}
+
+    def ratios() -> Dict[Labels, float]:
+        result = {}
+        for name, cache in caches.items():
+            total = cache.hits + cache.misses
+            result[(name,)] = cache.hits / total if total else 0.0
+        return result
+
+    registry.register(CallbackMetric(
+        'trendwise_cache_hits_total', 'Cache lookups served from cache', counts('hits'), ('cache',), 'counter'
+    ))
+    registry.register(CallbackMetric(
+        'trendwise_cache_misses_total', 'Cache lookups that missed', counts('misses'), ('cache',), 'counter'
+    ))
+    registry.register(CallbackMetric(
+        'trendwise_cache_hit_ratio', 'Fraction of cache lookups served from cache', ratios, ('cache',)
+    ))
+
+
+def _running_loop() -> Optional[asyncio.AbstractEventLoop]:
+    try:
+        return asyncio.get_running_loop()
+    except RuntimeError:
+        return None
+
+
+def watch_event_loop(executor_queue: Callable[[], int] = None,
+                     registry: MetricsRegistry = REGISTRY):
+    """Export event-loop queue depth, read on the loop serving the scrape.
+
+    Ready callbacks are only visible on the stdlib loop (uvloop keeps its
+    queue private), so task count and executor backlog are exported too.
+    """
+
+    def ready_callbacks() -> Optional[int]:
+        ready = getattr(_running_loop(), '_ready', None)
+        return len(ready) if ready is not None else None
+
+    def tasks() -> Optional[int]:
+        loop = _running_loop()
+        return len(asyncio.all_tasks(loop)) if loop is not None else None
+
+    registry.register(CallbackMetric(
+        'trendwise_event_loop_ready_callbacks', 'Callbacks waiting to run on the event loop', ready_callbacks
+    ))
+    registry.register(CallbackMetric(
+        'trendwise_event_loop_tasks', 'Pending asyncio tasks', tasks
+    ))
+    if executor_queue is not None:
+        registry.register(CallbackMetric(
+            'trendwise_cpu_executor_queue_depth', 'Jobs waiting for a CPU worker thread', executor_queue
+        ))
@@ -0,0 +1,499 @@
+# utils/middleware.py
+import gzip
+import hashlib
+import hmac
+import json
+import math
+import os
+import time
+from typing import Callable, Dict, List, NamedTuple, Optional, Tuple
+from urllib.parse import parse_qsl, urlencode
+
+from .concurrency import cpu_job_wrapper, run_cpu, run_io
+from .helpers import RateLimiter
+from .memo import LRUCache
+from .metrics import REQUEST_SECONDS, Histogram
+from .profiling import MODES, RequestProfile, profile_request, prune_profiles
+
+try:
+    import brotli
+except ImportError:  # brotli is optional; gzip is always available
+    brotli = None
+
+# path -> (max requests, window seconds)
+RateLimitRules = Dict[str, Tuple[int, int]]
+
+
+def client_address(scope: Dict) -> str:
+    """Client IP of an ASGI request (the proxy's address when behind one)"""
+    client = scope.get('client')
+    return client[0] if client else 'unknown'
+
+
+class RateLimitMiddleware:
+    """ASGI middleware applying per-client rate limits to selected paths.
+
+    Written against raw ASGI rather than BaseHTTPMiddleware so requests to
+    other paths pass straight through, and limited paths cost one dict
+    lookup plus an O(1) limiter check. Limiters that touch the database
+    (`blocking`) are checked on the I/O executor. Rejected requests get a
+    429 with a Retry-After header.
+    """
+
+    def __init__(self, app, rules: RateLimitRules,
+                 limiter: Optional[RateLimiter] = None,
+                 key_func: Callable[[Dict], str] = client_address):
+        self.app = app
+        self.rules = rules
+        self.limiter = limiter or RateLimiter()
+        self.key_func = key_func
+
+    async def __call__(self, scope, receive, send):
+        if scope['type'] != 'http':
+            await self.app(scope, receive, send)
+            return
+
+        rule = self.rules.get(scope['path'])
+        if rule is None:
+            await self.app(scope, receive, send)
+            return
+
+        max_requests, window_seconds = rule
+        key = f"{scope['path']}:{self.key_func(scope)}"
+        if getattr(self.limiter, 'blocking', False):
+            allowed, retry_after = await run_io(self.limiter.acquire, key, max_requests, window_seconds)
+        else:
+            allowed, retry_after = self.limiter.acquire(key, max_requests, window_seconds)
+        if allowed:
+            await self.app(scope, receive, send)
+            return
+
+        body = json.dumps({"detail": "Rate limit exceeded"}).encode()
+        await send({
+            'type': 'http.response.start',
+            'status': 429,
+            'headers': [
+                (b'content-type', b'application/json'),
+                (b'content-length', str(len(body)).encode()),
+                (b'retry-after', str(max(1, math.ceil(retry_after))).encode())
+            ]
+        })
+        await send({'type': 'http.response.body', 'body': body})
+
+
+class MetricsMiddleware:
+    """ASGI middleware recording request latency per route template.
+
+    Routes are labelled by their template (/api/scheduled-posts/{post_id}),
+    read from the scope after routing, so path parameters do not create new
+    series. Requests answered before routing (cache hits, rate-limit
+    rejections) are labelled by path when it is a parameterless route;
+    anything else shares the 'unmatched' label.
+    """
+
+    def __init__(self, app, histogram: Histogram = REQUEST_SECONDS):
+        self.app = app
+        self.histogram = histogram
+        self._static_paths = None
+
+    def _route_label(self, scope) -> str:
+        route = scope.get('route')
+        if route is not None:
+            return route.path
+        if self._static_paths is None:
+            routes = getattr(scope.get('app'), 'routes', [])
+            self._static_paths = frozenset(
+                route.path for route in routes if '{' not in getattr(route, 'path', '{')
+            )
+        return scope['path'] if scope['path'] in self._static_paths else 'unmatched'
+
+    async def __call__(self, scope, receive, send):
+        if scope['type'] != 'http':
+            await self.app(scope, receive, send)
+            return
+
+        status = 500
+
+        async def recording_send(message):
+            nonlocal status
+            if message['type'] == 'http.response.start':
+                status = message['status']
+            await send(message)
+
+        started = time.perf_counter()
+        try:
+            await self.app(scope, receive, recording_send)
+        finally:
+            self.histogram.observe(
+                time.perf_counter() - started, scope['method'], self._route_label(scope), str(status)
+            )
+
+
+def canonical_query(query_string: bytes) -> str:
+    """Query string with parameters sorted, so equivalent URLs share a key"""
+    pairs = parse_qsl(query_string.decode('latin-1'), keep_blank_values=True)
+    return urlencode(sorted(pairs))
+
+
+def etag_matches(if_none_match: str, etag: str) -> bool:
+    """Weak comparison of an If-None-Match header against an ETag"""
+    if if_none_match.strip() == '*':
+        return True
+    candidates = (tag.strip() for tag in if_none_match.split(','))
+    return any(tag[2:] == etag if tag.startswith('W/') else tag == etag for tag in candidates)
+
+
+class CachedResponse(NamedTuple):
+    expires_at: float
+    etag: str
+    status: int
+    headers: List[Tuple[bytes, bytes]]
+    body: bytes
+
+
+class ResponseCache:
+    """Bounded store of rendered GET responses with per-path TTLs"""
+
+    def __init__(self, ttls: Dict[str, float], max_entries: int = 1024,
+                 clock: Callable[[], float] = time.monotonic):
+        self.ttls = ttls
+        self.clock = clock
+        self.entries = LRUCache(max_entries)
+        # Expired entries count as misses, unlike in `entries`
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key: Tuple[str, str]) -> Optional[CachedResponse]:
+        entry = self.entries.get(key)
+        if entry is not None and entry.expires_at > self.clock():
+            self.hits += 1
+            return entry
+        self.misses += 1
+        return None
+
+    def put(self, key: Tuple[str, str], status: int,
+            headers: List[Tuple[bytes, bytes]], body: bytes) -> CachedResponse:
+        etag = '"' + hashlib.blake2b(body, digest_size=16).hexdigest() + '"'
+        entry = CachedResponse(self.clock() + self.ttls[key[0]], etag, status, headers, body)
+        self.entries.put(key, entry)
+        return entry
+
+    def invalidate(self, *paths: str):
+        """Drop cached responses, for the given paths or all of them"""
+        if not paths:
+            self.entries.clear()
+            return
+        self.entries.discard(lambda key: key[0] in paths)
+
+
+class ResponseCacheMiddleware:
+    """ASGI middleware serving cached GET responses with ETag / 304 support.
+
+    Responses of the configured paths are stored for their TTL under
+    (path, canonical query). Fresh hits replay the stored bytes, or send a
+    bare 304 when the client's If-None-Match already has the ETag.
+    """
+
+    def __init__(self, app, cache: ResponseCache):
+        self.app = app
+        self.cache = cache
+
+    async def __call__(self, scope, receive, send):
+        if (scope['type'] != 'http' or scope['method'] != 'GET'
+                or scope['path'] not in self.cache.ttls):
+            await self.app(scope, receive, send)
+            return
+
+        key = (scope['path'], canonical_query(scope.get('query_string', b'')))
+        if_none_match = None
+        for name, value in scope['headers']:
+            if name == b'if-none-match':
+                if_none_match = value.decode('latin-1')
+                break
+
+        entry = self.cache.get(key)
+        if entry is None:
+            entry = await self._render(scope, receive, send, key)
+            if entry is None:
+                return
+            hit = b'MISS'
+        else:
+            hit = b'HIT'
+
+        headers = entry.headers + [
+            (b'etag', entry.etag.encode()),
+            (b'cache-control', f"max-age={int(self.cache.ttls[key[0]])}".encode()),
+            (b'x-cache', hit)
+        ]
+        if if_none_match is not None and etag_matches(if_none_match, entry.etag):
+            not_modified = [(name, value) for name, value in headers
+                            if name not in (b'content-length', b'content-type')]
+            await send({'type': 'http.response.start', 'status': 304, 'headers': not_modified})
+            await send({'type': 'http.response.body', 'body': b''})
+            return
+
+        await send({'type': 'http.response.start', 'status': entry.status, 'headers': headers})
+        await send({'type': 'http.response.body', 'body': entry.body})
+
+    async def _render(self, scope, receive, send, key) -> Optional[CachedResponse]:
+        """Run the route and capture its response; non-200 responses pass through"""
+        start = {}
+        chunks = []
+        passthrough = False
+
+        async def capture(message):
+            nonlocal passthrough
+            if message['type'] == 'http.response.start':
+                start.update(message)
+                if message['status'] != 200:
+                    passthrough = True
+                    await send(message)
+            elif passthrough:
+                await send(message)
+            else:
+                chunks.append(message.get('body', b''))
+
+        await self.app(scope, receive, capture)
+        if passthrough or not start:
+            return None
+
+        headers = [(name, value) for name, value in start.get('headers', [])
+                   if name not in (b'etag', b'cache-control')]
+        return self.cache.put(key, start['status'], headers, b''.join(chunks))
+
+
+COMPRESSIBLE_TYPES = (b'application/json', b'text/', b'application/javascript')
+
+
+def negotiate_encoding(accept_encoding: str) -> Optional[str]:
+    """Pick 'br' or 'gzip' from an Accept-Encoding header by q-value"""
+    supported = ('br', 'gzip') if brotli is not None else ('gzip',)
+    best, best_q = None, 0.0
+
+    for part in accept_encoding.split(','):
+        coding, _, params = part.strip().partition(';')
+        coding = coding.strip().lower()
+        q = 1.0
+        params = params.strip()
+        if params.startswith('q='):
+            try:
+                q = float(params[2:])
+            except ValueError:
+                q = 0.0
+
+        candidates = supported if coding == '*' else (coding,)
+        for candidate in candidates:
+            if candidate in supported and q > 0:
+                # Equal q-values prefer brotli, which is listed first
+                if q > best_q or (q == best_q and supported.index(candidate) < supported.index(best)):
+                    best, best_q = candidate, q
+
+    return best
+
+
+class CompressionMiddleware:
+    """ASGI middleware compressing responses with brotli or gzip.
+
+    The encoding is negotiated from Accept-Encoding, and whether to compress
+    is decided from the response headers: non-text content, already encoded
+    responses and bodies whose Content-Length is under `minimum_size` are
+    passed through untouched. Only single-message bodies are compressed;
+    streamed responses (more_body) are forwarded as they are produced, so at
+    most one body message is ever held. Strong ETags become weak once the
+    bytes are re-encoded.
+    """
+
+    def __init__(self, app, minimum_size: int = 1024, gzip_level: int = 6,
+                 brotli_quality: int = 4):
+        self.app = app
+        self.minimum_size = minimum_size
+        self.gzip_level = gzip_level
+        self.brotli_quality = brotli_quality
+
+    async def __call__(self, scope, receive, send):
+        if scope['type'] != 'http':
+            await self.app(scope, receive, send)
+            return
+
+        accept_encoding = ''
+        for name, value in scope['headers']:
+            if name == b'accept-encoding':
+                accept_encoding = value.decode('latin-1')
+                break
+        encoding = negotiate_encoding(accept_encoding) if accept_encoding else None
+        if encoding is None:
+            await self.app(scope, receive, send)
+            return
+
+        start = None
+        passthrough = False
+
+        async def compressing_send(message):
+            nonlocal start, passthrough
+            if message['type'] == 'http.response.start':
+                if self._compressible(message):
+                    start = message
+                else:
+                    passthrough = True
+                    await send(message)
+                return
+            if passthrough or message['type'] != 'http.response.body':
+                await send(message)
+                return
+
+            pending, start = start, None
+            if message.get('more_body', False):
+                # Streaming response: forward as produced, uncompressed
+                passthrough = True
+                await send(pending)
+                await send(message)
+                return
+            await self._send_response(send, pending, message.get('body', b''), encoding)
+
+        await self.app(scope, receive, compressing_send)
+
+    def _compressible(self, start) -> bool:
+        """Whether a response may be compressed, judged from its start message"""
+        if start['status'] in (204, 304):
+            return False
+        content_type = b''
+        for name, value in start.get('headers', []):
+            if name == b'content-encoding':
+                return False
+            if name == b'content-length' and int(value) < self.minimum_size:
+                return False
+            if name == b'content-type':
+                content_type = value
+        return content_type.startswith(COMPRESSIBLE_TYPES)
+
+    async def _send_response(self, send, start, body: bytes, encoding: str):
+        if len(body) < self.minimum_size:
+            await send(start)
+            await send({'type': 'http.response.body', 'body': body})
+            return
+
+        headers = start.get('headers', [])
+        if encoding == 'br':
+            body = brotli.compress(body, quality=self.brotli_quality)
+        else:
+            body = gzip.compress(body, compresslevel=self.gzip_level, mtime=0)
+
+        rewritten = []
+        for name, value in headers:
+            if name == b'content-length':
+                continue
+            if name == b'etag' and not value.startswith(b'W/'):
+                value = b'W/' + value
+            rewritten.append((name, value))
+        rewritten += [
+            (b'content-encoding', encoding.encode()),
+            (b'content-length', str(len(body)).encode()),
+            (b'vary', b'Accept-Encoding')
+        ]
+
+        await send({**start, 'headers': rewritten})
+        await send({'type': 'http.response.body', 'body': body})
+
+
+class ProfilingMiddleware:
+    """ASGI middleware profiling single requests on demand.
+
+    A request opts in with an X-Profile header or ?profile= query flag
+    ('cprofile' or '1' for cProfile, 'sample' for collapsed stacks) and must
+    carry the configured `token` in X-Profile-Token, or it gets a 403. The
+    profile is written to `output_dir` (keeping the newest `max_files`) and
+    named in an X-Profile-File header, or with X-Profile-Output: inline
+    (?profile_output=inline) replaces the response body. Only one request
+    is profiled at a time; others pass through untouched. The app only
+    installs this middleware when profiling is enabled in its config.
+    """
+
+    def __init__(self, app, token: str, output_dir: str = 'profiles',
+                 max_files: int = 50, sample_interval: float = 0.001):
+        if not token:
+            raise ValueError("ProfilingMiddleware requires a token")
+        self.app = app
+        self.token = token.encode()
+        self.output_dir = output_dir
+        self.max_files = max_files
+        self.sample_interval = sample_interval
+        self._active = False
+
+    async def __call__(self, scope, receive, send):
+        if scope['type'] != 'http':
+            await self.app(scope, receive, send)
+            return
+
+        query = dict(parse_qsl(scope.get('query_string', b'').decode('latin-1')))
+        mode, inline, token = profile_request(scope['headers'], query)
+        if mode is None:
+            await self.app(scope, receive, send)
+            return
+        if not hmac.compare_digest(token.encode(), self.token):
+            await self._reject(send, 403, "Invalid profile token")
+            return
+        if mode not in MODES:
+            await self._reject(send, 400, f"Unknown profile mode '{mode}', expected one of {list(MODES)}")
+            return
+        if self._active:
+            await self.app(scope, receive, send)
+            return
+
+        profile = RequestProfile(mode, self.sample_interval)
+        path = profile.output_path(self.output_dir, f"{scope['method']} {scope['path']}")
+        status = 500
+
+        async def profiled_send(message):
+            nonlocal status
+            if message['type'] == 'http.response.start':
+                status = message['status']
+                if inline:
+                    return
+                message = {**message, 'headers': list(message.get('headers', [])) + [
+                    (b'x-profile-file', os.path.basename(path).encode())
+                ]}
+            elif inline and message['type'] == 'http.response.body':
+                return
+            await send(message)
+
+        self._active = True
+        token = cpu_job_wrapper.set(profile.wrap)
+        profile.start()
+        try:
+            await self.app(scope, receive, profiled_send)
+        finally:
+            profile.stop()
+            cpu_job_wrapper.reset(token)
+            self._active = False
+
+        if not inline:
+            await run_io(self._save, profile, path)
+            return
+
+        body = (await run_cpu(profile.report)).encode()
+        await send({
+            'type': 'http.response.start',
+            'status': 200,
+            'headers': [
+                (b'content-type', b'text/plain; charset=utf-8'),
+                (b'content-length', str(len(body)).encode()),
+                (b'x-profile-status', str(status).encode()),
+                (b'x-profile-elapsed', f"{profile.elapsed:.6f}".encode())
+            ]
+        })
+        await send({'type': 'http.response.body', 'body': body})
+
+    def _save(self, profile: RequestProfile, path: str):
+        profile.save(path)
+        prune_profiles(self.output_dir, self.max_files)
+
+    @staticmethod
+    async def _reject(send, status: int, detail: str):
+        body = json.dumps({"detail": detail}).encode()
+        await send({
+            'type': 'http.response.start',
+            'status': status,
+            'headers': [(b'content-type', b'application/json'),
+                        (b'content-length', str(len(body)).encode())]
+        })
+        await send({'type': 'http.response.body', 'body': body})
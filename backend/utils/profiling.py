@@ -0,0 +1,232 @@
+# utils/profiling.py
+import cProfile
+import io
+import itertools
+import os
+import pstats
+import re
+import sys
+import threading
+import time
+from collections import Counter
+from typing import Callable, Dict, List, Optional, Tuple
+
+MODES = ('cprofile', 'sample')
+PROFILE_EXTENSIONS = ('.prof', '.collapsed')
+
+# Numbers profile files so names stay unique within a second
+_sequence = itertools.count(1)
+
+
+class Sampler:
+    """Background thread recording collapsed stacks of selected threads.
+
+    Every `interval` seconds the current frame of each watched thread is
+    walked and counted as one 'thread;outer;...;inner' line, the input
+    format of flamegraph.pl and speedscope.
+    """
+
+    def __init__(self, interval: float = 0.001):
+        self.interval = interval
+        self.samples: Counter = Counter()
+        self._threads: Dict[int, int] = {}  # ident -> number of active jobs
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def watch(self, ident: int):
+        with self._lock:
+            self._threads[ident] = self._threads.get(ident, 0) + 1
+
+    def unwatch(self, ident: int):
+        with self._lock:
+            remaining = self._threads.get(ident, 0) - 1
+            if remaining > 0:
+                self._threads[ident] = remaining
+            else:
+                self._threads.pop(ident, None)
+
+    def start(self):
+        self._thread = threading.Thread(target=self._run, name='trendwise-sampler', daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+
+    def _run(self):
+        while not self._stop.wait(self.interval):
+            with self._lock:
+                watched = list(self._threads)
+            frames = sys._current_frames()
+            names = {thread.ident: thread.name for thread in threading.enumerate()}
+            for ident in watched:
+                frame = frames.get(ident)
+                if frame is not None:
+                    self.samples[self._collapse(names.get(ident, str(ident)), frame)] += 1
+
+    @staticmethod
+    def _collapse(thread_name: str, frame) -> str:
+        stack = []
+        while frame is not None:
+            code = frame.f_code
+            stack.append(f"{code.co_name} ({os.path.basename(code.co_filename)}:{code.co_firstlineno})")
+            frame = frame.f_back
+        stack.append(thread_name)
+        return ';'.join(reversed(stack))
+
+    def collapsed(self) -> str:
+        return ''.join(f"{stack} {count}\n" for stack, count in self.samples.most_common())
+
+
+class RequestProfile:
+    """Profile of one request, covering the event loop and its CPU jobs.
+
+    'cprofile' runs a deterministic profiler on the event-loop thread and
+    one per CPU job (see wrap()), merged into a single pstats report.
+    'sample' samples the same threads' stacks into collapsed-stack text.
+    Work from other requests interleaved on the event loop while this one
+    is in flight shows up too, so profile on a quiet instance.
+    """
+
+    def __init__(self, mode: str = 'cprofile', sample_interval: float = 0.001):
+        if mode not in MODES:
+            raise ValueError(f"Unknown profile mode '{mode}', expected one of {MODES}")
+        self.mode = mode
+        self.elapsed = 0.0
+        self._profiles: List[cProfile.Profile] = []
+        self._lock = threading.Lock()
+        self._sampler = Sampler(sample_interval) if mode == 'sample' else None
+        self._loop_profile: Optional[cProfile.Profile] = None
+        self._started = 0.0
+
+    def start(self):
+        self._started = time.perf_counter()
+        if self._sampler is not None:
+            self._sampler.watch(threading.get_ident())
+            self._sampler.start()
+        else:
+            self._loop_profile = cProfile.Profile()
+            self._loop_profile.enable()
+
+    def stop(self):
+        if self._sampler is not None:
+            self._sampler.stop()
+        else:
+            self._loop_profile.disable()
+            self._profiles.append(self._loop_profile)
+        self.elapsed = time.perf_counter() - self._started
+
+    def wrap(self, func: Callable) -> Callable:
+        """Wrap a CPU job so the thread running it is profiled too"""
+
+        def profiled(*args, **kwargs):
+            if self._sampler is not None:
+                ident = threading.get_ident()
+                self._sampler.watch(ident)
+                try:
+                    return func(*args, **kwargs)
+                finally:
+                    self._sampler.unwatch(ident)
+
+            profile = cProfile.Profile()
+            profile.enable()
+            try:
+                return func(*args, **kwargs)
+            finally:
+                profile.disable()
+                with self._lock:
+                    self._profiles.append(profile)
+
+        return profiled
+
+    @property
+    def extension(self) -> str:
+        return 'collapsed' if self._sampler is not None else 'prof'
+
+    def stats(self) -> Optional[pstats.Stats]:
+        stats = None
+        for profile in self._profiles:
+            profile.create_stats()
+            if not profile.stats:
+                continue
+            if stats is None:
+                stats = pstats.Stats(profile)
+            else:
+                stats.add(profile)
+        return stats
+
+    def report(self, limit: int = 60) -> str:
+        """Human-readable profile: top functions by cumulative time, or collapsed stacks"""
+        if self._sampler is not None:
+            return self._sampler.collapsed()
+
+        stats = self.stats()
+        if stats is None:
+            return ''
+        stream = io.StringIO()
+        stats.stream = stream
+        stats.sort_stats('cumulative').print_stats(limit)
+        return stream.getvalue()
+
+    def output_path(self, directory: str, label: str) -> str:
+        """Unique file name for this profile under `directory`"""
+        slug = re.sub(r'[^A-Za-z0-9]+', '-', label).strip('-') or 'root'
+        stamp = time.strftime('%Y%m%d-%H%M%S')
+        return os.path.join(directory, f"{stamp}-{os.getpid()}-{next(_sequence)}-{slug}.{self.extension}")
+
+    def save(self, path: str):
+        """Write the profile: a pstats dump or collapsed stacks"""
+        os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+        if self._sampler is not None:
+            with open(path, 'w') as f:
+                f.write(self._sampler.collapsed())
+            return
+
+        stats = self.stats()
+        if stats is None:
+            open(path, 'wb').close()
+        else:
+            stats.dump_stats(path)
+
+
+def parse_profile_flag(value: str) -> Optional[str]:
+    """Profile mode requested by a header or query value, None when not requested"""
+    value = value.strip().lower()
+    if value in ('', '0', 'false', 'off'):
+        return None
+    if value in ('1', 'true', 'on'):
+        return 'cprofile'
+    return value
+
+
+def profile_request(headers: List[Tuple[bytes, bytes]],
+                    query: Dict[str, str]) -> Tuple[Optional[str], bool, str]:
+    """(mode, inline, token) requested via X-Profile / X-Profile-Output or
+    ?profile= / ?profile_output=, and the X-Profile-Token header"""
+    mode = query.get('profile', '')
+    output = query.get('profile_output', '')
+    token = ''
+    for name, value in headers:
+        if name == b'x-profile':
+            mode = value.decode('latin-1')
+        elif name == b'x-profile-output':
+            output = value.decode('latin-1')
+        elif name == b'x-profile-token':
+            token = value.decode('latin-1')
+    return parse_profile_flag(mode), output.strip().lower() == 'inline', token
+
+
+def prune_profiles(directory: str, keep: int):
+    """Delete all but the `keep` newest saved profiles in `directory`"""
+    try:
+        names = [name for name in os.listdir(directory) if name.endswith(PROFILE_EXTENSIONS)]
+    except FileNotFoundError:
+        return
+    paths = sorted((os.path.join(directory, name) for name in names), key=os.path.getmtime)
+    for path in paths[:max(0, len(paths) - keep)]:
+        try:
+            os.unlink(path)
+        except FileNotFoundError:
+            pass
@@ -0,0 +1,37 @@
+# utils/responses.py
+from typing import Any
+
+import orjson
+from fastapi.responses import JSONResponse
+
+ORJSON_OPTIONS = orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_NON_STR_KEYS
+
+
+def _default(value: Any) -> Any:
+    """Fallback for types orjson does not handle natively"""
+    if hasattr(value, 'model_dump'):
+        return value.model_dump()
+    if isinstance(value, (set, frozenset)):
+        return list(value)
+    if hasattr(value, 'item'):
+        # NumPy scalars orjson does not cover (e.g. numpy.bool_ in older releases)
+        return value.item()
+    raise TypeError(f"Type is not JSON serializable: {type(value).__name__}")
+
+
+def dumps(content: Any) -> bytes:
+    """Serialize to JSON bytes, handling NumPy values and datetimes natively"""
+    return orjson.dumps(content, default=_default, option=ORJSON_OPTIONS)
+
+
+class FastJSONResponse(JSONResponse):
+    """JSON response rendered with orjson.
+
+    Routes that build their payload from trusted internal dicts return this
+    directly, which skips FastAPI's jsonable_encoder walk and response_model
+    re-validation; used as the default class it also speeds up routes that
+    return plain dicts.
+    """
+
+    def render(self, content: Any) -> bytes:
+        return dumps(content)
@@ -0,0 +1,104 @@
+# utils/sentiment.py
+import hashlib
+import importlib.util
+import logging
+import os
+import re
+import xml.etree.ElementTree as ET
+from functools import lru_cache
+from typing import Dict, Optional
+
+from .memo import LRUCache
+
+logger = logging.getLogger(__name__)
+
+TOKEN_PATTERN = re.compile(r"[a-z][a-z'-]*")
+NEGATIONS = {'not', 'never', 'no', "isn't", "aren't", "don't", "doesn't", "can't", "won't"}
+
+# Used when the TextBlob lexicon file is not available
+FALLBACK_LEXICON = {
+    'good': 0.7, 'great': 0.8, 'excellent': 1.0, 'best': 1.0, 'better': 0.5,
+    'amazing': 0.6, 'powerful': 0.3, 'easy': 0.43, 'successful': 0.75,
+    'effective': 0.6, 'innovative': 0.5, 'improved': 0.5, 'love': 0.5,
+    'bad': -0.7, 'poor': -0.4, 'worst': -1.0, 'worse': -0.4, 'difficult': -0.5,
+    'hard': -0.29, 'slow': -0.3, 'broken': -0.4, 'wrong': -0.5, 'fail': -0.5,
+    'terrible': -1.0, 'hate': -0.8, 'risky': -0.5, 'expensive': -0.5
+}
+
+
+def _textblob_lexicon_path() -> Optional[str]:
+    """Locate TextBlob's bundled sentiment lexicon without importing TextBlob"""
+    spec = importlib.util.find_spec('textblob')
+    if spec is None or spec.origin is None:
+        return None
+
+    path = os.path.join(os.path.dirname(spec.origin), 'en', 'en-sentiment.xml')
+    return path if os.path.exists(path) else None
+
+
+@lru_cache(maxsize=1)
+def load_lexicon() -> Dict[str, float]:
+    """Load per-word polarity weights, averaging over word senses"""
+    path = _textblob_lexicon_path()
+    if path is None:
+        return dict(FALLBACK_LEXICON)
+
+    try:
+        totals = {}
+        for word in ET.parse(path).getroot().iter('word'):
+            form = word.get('form', '').lower()
+            if not form or ' ' in form:
+                continue
+            polarity = float(word.get('polarity', 0.0))
+            total, count = totals.get(form, (0.0, 0))
+            totals[form] = (total + polarity, count + 1)
+
+        return {form: total / count for form, (total, count) in totals.items()}
+    except Exception as e:
+        logger.error("Sentiment lexicon error: %s", e)
+        return dict(FALLBACK_LEXICON)
+
+
+class SentimentScorer:
+    """Fast lexicon-based sentiment polarity with an LRU keyed by content hash"""
+
+    def __init__(self, lexicon: Optional[Dict[str, float]] = None, cache_size: int = 1024):
+        self.weights = lexicon if lexicon is not None else load_lexicon()
+        self.cache = LRUCache(cache_size)
+
+    def polarity(self, content: str) -> float:
+        """Return polarity in [-1.0, 1.0] for the given content"""
+        key = hashlib.blake2b(content.encode('utf-8', 'replace'), digest_size=16).digest()
+        return self.cache.get_or_compute(key, lambda: self._score(content))
+
+    def _score(self, content: str) -> float:
+        """Average the weights of lexicon words, flipping negated ones"""
+        weights = self.weights
+        total = 0.0
+        hits = 0
+        negate = False
+
+        for token in TOKEN_PATTERN.findall(content.lower()):
+            weight = weights.get(token)
+            if weight is not None:
+                total += -0.5 * weight if negate else weight
+                hits += 1
+            negate = token in NEGATIONS
+
+        if hits == 0:
+            return 0.0
+
+        return max(-1.0, min(1.0, total / hits))
+
+    def analyze(self, content: str) -> Dict:
+        """Return polarity together with a coarse label"""
+        polarity = self.polarity(content)
+
+        if polarity > 0.1:
+            label = 'positive'
+        elif polarity < -0.1:
+            label = 'negative'
+        else:
+            label = 'neutral'
+
+        return {'polarity': round(polarity, 3), 'label': label}
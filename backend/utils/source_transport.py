@@ -0,0 +1,231 @@
+# utils/source_transport.py
+import atexit
+import contextlib
+import json
+import logging
+import os
+import tempfile
+import threading
+import time
+import zipfile
+from typing import Dict, NamedTuple, Optional
+
+import httpx
+import requests
+
+from .concurrency import run_io
+
+logger = logging.getLogger(__name__)
+
+SOURCE_MODES = ('live', 'record', 'replay')
+
+
+class SourceResponse:
+    """Archived response with the attributes the source parsers read"""
+
+    def __init__(self, status_code: int, content: bytes, content_type: str = ''):
+        self.status_code = status_code
+        self.content = content
+        self.headers = {'content-type': content_type} if content_type else {}
+
+    @property
+    def text(self) -> str:
+        return self.content.decode('utf-8', errors='replace')
+
+    def json(self):
+        return json.loads(self.content)
+
+
+class ArchivedResponse(NamedTuple):
+    status_code: int
+    content_type: str
+    body: bytes
+
+
+class SourceArchive:
+    """Raw source responses keyed by exact URL, stored as one zip file.
+
+    The zip holds an index.json mapping each URL to its status, content
+    type and body entry; bodies are deflated and kept byte for byte.
+    """
+
+    INDEX = 'index.json'
+
+    def __init__(self, path: Optional[str] = None):
+        self.path = path
+        self.entries: Dict[str, ArchivedResponse] = {}
+        self._lock = threading.Lock()
+
+    @classmethod
+    def load(cls, path: str) -> 'SourceArchive':
+        archive = cls(path)
+        if os.path.exists(path):
+            with zipfile.ZipFile(path) as zf:
+                index = json.loads(zf.read(cls.INDEX))
+                for url, entry in index.items():
+                    archive.entries[url] = ArchivedResponse(
+                        entry['status'], entry['content_type'], zf.read(entry['file'])
+                    )
+        return archive
+
+    def __len__(self) -> int:
+        return len(self.entries)
+
+    def __contains__(self, url: str) -> bool:
+        return url in self.entries
+
+    def get(self, url: str) -> Optional[SourceResponse]:
+        entry = self.entries.get(url)
+        if entry is None:
+            return None
+        return SourceResponse(entry.status_code, entry.body, entry.content_type)
+
+    def put(self, url: str, status_code: int, body: bytes, content_type: str = ''):
+        with self._lock:
+            self.entries[url] = ArchivedResponse(status_code, content_type, body)
+
+    def save(self, path: Optional[str] = None):
+        """Write the archive atomically (to a temporary file, then renamed)"""
+        path = path or self.path
+        with self._lock:
+            entries = dict(self.entries)
+
+        directory = os.path.dirname(os.path.abspath(path))
+        os.makedirs(directory, exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=directory, suffix='.tmp')
+        try:
+            with os.fdopen(fd, 'wb') as f, zipfile.ZipFile(f, 'w', zipfile.ZIP_DEFLATED) as zf:
+                index = {}
+                for number, (url, entry) in enumerate(sorted(entries.items())):
+                    name = f"{number:05d}.body"
+                    index[url] = {'file': name, 'status': entry.status_code,
+                                  'content_type': entry.content_type}
+                    zf.writestr(name, entry.body)
+                zf.writestr(self.INDEX, json.dumps(index, indent=1, sort_keys=True))
+            os.replace(tmp_path, path)
+        except BaseException:
+            os.unlink(tmp_path)
+            raise
+
+
+class LiveTransport:
+    """Fetches trend sources over the network"""
+
+    def __init__(self, timeout: float = 10):
+        self.timeout = timeout
+
+    def get(self, url: str, headers: Dict):
+        return requests.get(url, headers=headers, timeout=self.timeout)
+
+    def client(self):
+        """Async context manager passed back to get_async"""
+        return httpx.AsyncClient(timeout=self.timeout, follow_redirects=True)
+
+    async def get_async(self, client, url: str, headers: Dict):
+        return await client.get(url, headers=headers)
+
+
+class RecordingTransport(LiveTransport):
+    """Live transport that saves every response it receives to an archive.
+
+    Responses are added in memory and the zip is rewritten once per async
+    fetch batch (when the client from client() closes, on the I/O executor),
+    at most every `save_interval` seconds for synchronous fetches, and at
+    interpreter exit. Intended for development, not production traffic.
+    """
+
+    def __init__(self, archive: SourceArchive, timeout: float = 10,
+                 save_interval: float = 5.0):
+        super().__init__(timeout)
+        self.archive = archive
+        self.save_interval = save_interval
+        self._dirty = False
+        self._last_save = time.monotonic()
+        self._save_lock = threading.Lock()
+        atexit.register(self.flush)
+
+    def get(self, url: str, headers: Dict):
+        response = super().get(url, headers)
+        self._record(url, response)
+        if time.monotonic() - self._last_save >= self.save_interval:
+            self.flush()
+        return response
+
+    @contextlib.asynccontextmanager
+    async def client(self):
+        async with super().client() as client:
+            try:
+                yield client
+            finally:
+                await run_io(self.flush)
+
+    async def get_async(self, client, url: str, headers: Dict):
+        response = await super().get_async(client, url, headers)
+        self._record(url, response)
+        return response
+
+    def _record(self, url: str, response):
+        self.archive.put(url, response.status_code, response.content,
+                         response.headers.get('content-type', ''))
+        self._dirty = True
+
+    def flush(self):
+        """Write the archive if responses were recorded since the last save"""
+        with self._save_lock:
+            if not self._dirty:
+                return
+            # Cleared before the snapshot, so responses recorded meanwhile
+            # are picked up by the next flush
+            self._dirty = False
+            self._last_save = time.monotonic()
+            self.archive.save()
+
+
+class ReplayTransport:
+    """Serves archived responses without touching the network.
+
+    URLs missing from the archive get an empty 404, which the parsers
+    treat like a failed source, and are counted in `misses`.
+    """
+
+    def __init__(self, archive: SourceArchive):
+        self.archive = archive
+        self.misses = 0
+
+    def get(self, url: str, headers: Dict) -> SourceResponse:
+        response = self.archive.get(url)
+        if response is None:
+            self.misses += 1
+            logger.debug("No archived response for %s", url)
+            return SourceResponse(404, b'')
+        return response
+
+    def client(self):
+        return contextlib.nullcontext()
+
+    async def get_async(self, client, url: str, headers: Dict) -> SourceResponse:
+        return self.get(url, headers)
+
+
+def create_source_transport(mode: Optional[str] = None, path: Optional[str] = None,
+                            timeout: float = 10):
+    """Build the trend-source transport configured by TRENDWISE_SOURCE_MODE.
+
+    'live' (default) fetches from the network, 'record' also saves every
+    response to the TRENDWISE_SOURCE_ARCHIVE zip and 'replay' serves
+    responses from that archive only.
+    """
+    if mode is None:
+        mode = os.getenv('TRENDWISE_SOURCE_MODE', 'live')
+    if path is None:
+        path = os.getenv('TRENDWISE_SOURCE_ARCHIVE', 'sources.zip')
+
+    if mode == 'live':
+        return LiveTransport(timeout)
+    if mode == 'record':
+        return RecordingTransport(SourceArchive.load(path), timeout)
+    if mode == 'replay':
+        if not os.path.exists(path):
+            raise ValueError(f"Source archive not found: {path}")
+        return ReplayTransport(SourceArchive.load(path))
+    raise ValueError(f"Unknown source mode '{mode}', expected one of {SOURCE_MODES}")
@@ -0,0 +1,56 @@
+# utils/syllables.py
+import re
+from collections import Counter
+from typing import Dict, Iterable
+
+VOWEL_GROUPS = re.compile(r'[aeiouy]+')
+
+
+def count_syllables(word: str) -> int:
+    """Count syllables in a word (approximation: one per vowel group)"""
+    word = word.lower()
+    syllable_count = len(VOWEL_GROUPS.findall(word))
+
+    # Adjust for silent 'e'
+    if word.endswith('e'):
+        syllable_count -= 1
+
+    # Minimum one syllable
+    return max(1, syllable_count)
+
+
+class SyllableCounter:
+    """Syllable counting with a bounded per-word memo table"""
+
+    def __init__(self, max_words: int = 50000):
+        self.max_words = max_words
+        self.memo: Dict[str, int] = {}
+
+    def count(self, word: str) -> int:
+        """Count syllables in a single word, memoized"""
+        syllables = self.memo.get(word)
+        if syllables is None:
+            syllables = count_syllables(word)
+            self._remember(word, syllables)
+        return syllables
+
+    def count_words(self, words: Iterable[str]) -> int:
+        """Total syllables for a sequence of words, counting each unique word once"""
+        memo = self.memo
+        total = 0
+
+        for word, frequency in Counter(words).items():
+            syllables = memo.get(word)
+            if syllables is None:
+                syllables = count_syllables(word)
+                self._remember(word, syllables)
+            total += syllables * frequency
+
+        return total
+
+    def _remember(self, word: str, syllables: int):
+        # Articles reuse a small vocabulary, so a full reset on overflow is
+        # cheaper than tracking recency for every lookup.
+        if len(self.memo) >= self.max_words:
+            self.memo.clear()
+        self.memo[word] = syllables
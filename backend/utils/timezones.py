@@ -0,0 +1,115 @@
+# utils/timezones.py
+import calendar
+from datetime import datetime, timedelta
+from functools import lru_cache
+from typing import Dict, Iterable, Optional, Tuple, Union
+
+import numpy as np
+import pytz
+
+HOURS_PER_WEEK = 168
+
+ZoneWeights = Tuple[Tuple[str, float], ...]
+
+
+@lru_cache(maxsize=512)
+def offset_table(zone: str) -> Tuple[np.ndarray, np.ndarray]:
+    """UTC instants (epoch seconds) at which a zone's offset changes, and the
+    offset in seconds in effect from each one.
+
+    Built once per zone from pytz's transition list; static zones get a
+    single entry.
+    """
+    tz = pytz.timezone(zone)
+    transitions = getattr(tz, '_utc_transition_times', None)
+
+    if not transitions:
+        offset = tz.utcoffset(datetime(2000, 1, 1)).total_seconds()
+        return np.array([-np.inf]), np.array([offset])
+
+    starts = np.array([calendar.timegm(t.timetuple()) for t in transitions], dtype=float)
+    starts[0] = -np.inf
+    offsets = np.array([info[0].total_seconds() for info in tz._transition_info])
+    starts.flags.writeable = False
+    offsets.flags.writeable = False
+    return starts, offsets
+
+
+def utc_offsets(zone: str, timestamps: np.ndarray) -> np.ndarray:
+    """UTC offset in seconds of `zone` at each epoch timestamp"""
+    starts, offsets = offset_table(zone)
+    return offsets[np.searchsorted(starts, timestamps, side='right') - 1]
+
+
+@lru_cache(maxsize=1024)
+def local_slots(zone: str, start_ts: float, hours: int = HOURS_PER_WEEK) -> np.ndarray:
+    """Local weekday*24 + hour slot for each hour from `start_ts` in `zone`.
+
+    Hours are floored for zones with fractional offsets; DST transitions
+    inside the window are handled per hour.
+    """
+    timestamps = start_ts + 3600.0 * np.arange(hours)
+    local = timestamps + utc_offsets(zone, timestamps)
+
+    local_hours = np.floor(local / 3600).astype(np.int64)
+    # 1970-01-01 was a Thursday (weekday 3)
+    weekdays = (local_hours // 24 + 3) % 7
+    slots = weekdays * 24 + local_hours % 24
+    slots.flags.writeable = False
+    return slots
+
+
+def window_start(zone: str, now: Optional[datetime] = None) -> float:
+    """Epoch timestamp of midnight tomorrow in `zone`"""
+    tz = pytz.timezone(zone)
+    now = now or datetime.now(pytz.utc)
+    if now.tzinfo is None:
+        now = pytz.utc.localize(now)
+
+    tomorrow = now.astimezone(tz).date() + timedelta(days=1)
+    midnight = tz.localize(datetime(tomorrow.year, tomorrow.month, tomorrow.day))
+    return midnight.timestamp()
+
+
+def zone_weights(audience_timezones: Union[None, Dict[str, float], Iterable[str]],
+                 default: str = "UTC") -> ZoneWeights:
+    """Normalize an audience distribution to a sorted ((zone, weight), ...) tuple.
+
+    Accepts a zone -> weight mapping or a list of zones (equal weights).
+    Raises ValueError for unknown zones or non-positive totals.
+    """
+    if not audience_timezones:
+        audience_timezones = {default: 1.0}
+    elif not isinstance(audience_timezones, dict):
+        audience_timezones = {zone: 1.0 for zone in audience_timezones}
+
+    weights: Dict[str, float] = {}
+    for zone, weight in audience_timezones.items():
+        try:
+            name = pytz.timezone(zone).zone
+        except pytz.UnknownTimeZoneError:
+            raise ValueError(f"Unknown timezone: {zone}")
+        if weight < 0:
+            raise ValueError(f"Negative weight for timezone: {zone}")
+        weights[name] = weights.get(name, 0.0) + float(weight)
+
+    total = sum(weights.values())
+    if total <= 0:
+        raise ValueError("Audience timezone weights must add up to more than zero")
+
+    return tuple(sorted((zone, weight / total) for zone, weight in weights.items() if weight > 0))
+
+
+def parse_zone_weights(value: str) -> Dict[str, float]:
+    """Parse 'Zone[:weight],Zone[:weight]' (weights default to 1)"""
+    weights = {}
+    for part in value.split(','):
+        part = part.strip()
+        if not part:
+            continue
+        zone, _, weight = part.partition(':')
+        try:
+            weights[zone.strip()] = float(weight) if weight else 1.0
+        except ValueError:
+            raise ValueError(f"Invalid weight for timezone: {zone}")
+    return weights